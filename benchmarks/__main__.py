@@ -0,0 +1,62 @@
+"""
+Measures how the cost of a tick and of a frame grows with the length of the snake, and how long the game takes to start.
+
+Run it from the root of the repository:
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --compare baseline.json
+
+The results are printed as JSON. With --compare, the change from the baseline is printed to stderr
+and the exit status is 1 if anything got slower than --threshold allows.
+"""
+import os
+import sys
+import json
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from .suite import LENGTHS, run, compare
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the game against the length of the snake.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(LENGTHS), help="The body lengths to benchmark.")
+    parser.add_argument("--repeat", type=int, default=7, help="The number of timed rounds per benchmark.")
+    parser.add_argument("--output", help="Write the results to this file instead of stdout.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare the results against a baseline file.")
+    parser.add_argument("--skip-startup", action="store_true", help="Don't time how long the game takes to show its first frame.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="The slowdown counted as a regression. (default: 0.15)")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = run(args.lengths, args.repeat, startup=not args.skip_startup)
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('board_size') != results['meta']['board_size']:
+            print("warning: the baseline was run on a different board size", file=sys.stderr)
+        lines, regressions = compare(results, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:", file=sys.stderr)
+            print("\n".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import os
+import sys
+import pygame
+import math
+import time
+import platform
+import statistics
+import tempfile
+import subprocess
+from typing import Callable, Dict, List, Tuple
+
+from game import Game, Simulation
+
+LENGTHS = (10, 100, 1_000, 10_000)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = ("snake_move", "check_game_over", "point", "snake_render", "game_render")
+
+
+class Serpentine:
+    """
+    Steers a snake back and forth across the board in lanes as tall as its head, moving down
+    to the next lane at each side wall, so that it can grow very long without running into itself.
+    """
+
+    def __init__(self, simulation: Simulation) -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation whose snake to steer. It should be heading left or right.
+        """
+        self.simulation = simulation
+        head = simulation.snake.head
+        self.lane_rows: int = head.rect.height // head.velocity
+        self.lane_direction: str = simulation.snake.direction
+        self.down_moves: int = 0
+
+    def next_action(self) -> str:
+        """Get the action for the next tick, or None to keep going."""
+        snake = self.simulation.snake
+        if snake.direction == 'd':
+            if self.down_moves < self.lane_rows:
+                self.down_moves += 1
+                return None
+            return self.lane_direction
+        if self.moves_left_in_lane() == 0:
+            self.lane_direction = 'l' if snake.direction == 'r' else 'r'
+            self.down_moves = 1
+            return 'd'
+        return None
+
+    def moves_left_in_lane(self) -> int:
+        """Get the number of moves the head can still make in its lane before it reaches a side wall."""
+        head = self.simulation.snake.head
+        step = head.velocity if head.direction == 'r' else -head.velocity
+        moves, rect = 0, head.rect.move(step, 0)
+        while not self.simulation.collision_grid.hits_wall(rect):
+            moves += 1
+            rect.move_ip(step, 0)
+        return moves
+
+    def step(self) -> None:
+        """Advance the simulation by one tick, steering the snake."""
+        self.simulation.step(self.next_action())
+
+
+def board_size(length: int, width: int = 2400) -> Tuple[int, int]:
+    """Get the size of a board with room for a snake of the given length, plus a few spare lanes to move it in."""
+    lane_pieces = (width - 120) // 16
+    lanes = math.ceil(length / lane_pieces) + 4
+    return (width, 60 + lanes * 32 + 140)
+
+
+def build_game(display: pygame.Surface, length: int) -> Tuple[Game, Serpentine]:
+    """
+    Set up a game whose snake has exactly length body pieces, laid out in lanes across the board.
+
+    The snake is grown for real, one piece per tick, so the body and the collision grid are in the same state as in a long game.
+    """
+    game = Game(display)
+    simulation = game.simulation
+    simulation.rng.seed(0)
+    simulation.turn('r')
+    driver = Serpentine(simulation)
+
+    # The fruit is kept off the board while growing, so that eating it can't grow the snake past length.
+    fruit = simulation.fruit
+    fruit.set_pos_to((-fruit.width, -fruit.height))
+    simulation.collision_grid.set_fruit(fruit.rect)
+
+    simulation.snake.body.no_pieces = length
+    while len(simulation.snake.body) < length:
+        driver.step()
+        if simulation.game_over:
+            raise RuntimeError(f"The snake ran into something while growing to {length} pieces")
+    simulation.change_fruit_pos()
+    return (game, driver)
+
+
+def _summary(per_call: List[float]) -> Dict[str, float]:
+    """Summarize per-call times, given in seconds, in microseconds."""
+    return {
+        'best_us': min(per_call) * 1e6,
+        'median_us': statistics.median(per_call) * 1e6,
+    }
+
+
+def _autorange(func: Callable[[], None], min_time: float) -> int:
+    """Get a number of calls to func that takes at least min_time seconds, like timeit's autorange()."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2
+
+
+def time_calls(func: Callable[[], None], repeat: int = 7, min_time: float = 0.02) -> Dict[str, float]:
+    """Time repeated calls to a function that doesn't change the state of the game."""
+    number = _autorange(func, min_time)
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+    return _summary(per_call)
+
+
+def time_moves(game: Game, driver: Serpentine, repeat: int = 7, number: int = 32) -> Dict[str, float]:
+    """
+    Time Snake.move() (the head and SnakeBody.move()) over straight runs of number ticks.
+
+    The snake is steered into a new lane between runs when there isn't enough room left, outside of the timing.
+    The fruit is kept off the board, so the length doesn't change.
+    """
+    simulation = game.simulation
+    snake, fruit = simulation.snake, simulation.fruit
+    fruit_pos = fruit.rect.topleft
+    fruit.set_pos_to((-fruit.width, -fruit.height))
+    simulation.collision_grid.set_fruit(fruit.rect)
+
+    per_call = []
+    for _ in range(repeat):
+        while snake.direction == 'd' or driver.moves_left_in_lane() < number:
+            driver.step()
+        start = time.perf_counter()
+        for _ in range(number):
+            snake.move()
+        per_call.append((time.perf_counter() - start) / number)
+        if simulation.gameover_handler.check_game_over()[0]:
+            raise RuntimeError("The snake ran into something while being timed")
+
+    fruit.set_pos_to(fruit_pos)
+    simulation.collision_grid.set_fruit(fruit.rect)
+    return _summary(per_call)
+
+
+def time_to_first_frame(repeat: int = 7) -> Dict[str, float]:
+    """
+    Time how long snake_game.py takes from being launched to showing its first frame, including starting Python and importing pygame.
+
+    The game is started in an empty directory, so the leaderboard and replays it creates don't end up in the repository.
+    """
+    per_call = []
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, os.path.join(ROOT, "snake_game.py"), "--first-frame"],
+                           cwd=directory, env=env, check=True, stdout=subprocess.DEVNULL)
+            per_call.append(time.perf_counter() - start)
+    return _summary(per_call)
+
+
+def run(lengths: List[int] = LENGTHS, repeat: int = 7, startup: bool = True) -> Dict:
+    """
+    Run every benchmark for every snake length, and time the startup of the game unless startup is False.
+
+    pygame.init() must have been called. A display is opened, so set SDL_VIDEODRIVER to "dummy" to run without a window.
+
+    Returns:
+        Dict: 'meta' describes the run and 'results' maps every benchmark to the results for each length,
+              keyed by the length as a string, in microseconds per call.
+    """
+    size = board_size(max(max(lengths), max(LENGTHS)))
+    display = pygame.display.set_mode(size)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {name: {} for name in BENCHMARKS}
+    for length in lengths:
+        game, driver = build_game(display, length)
+        key = str(length)
+        results['snake_move'][key] = time_moves(game, driver, repeat)
+        results['check_game_over'][key] = time_calls(game.gameover_handler.check_game_over, repeat)
+        results['point'][key] = time_calls(game.simulation.point, repeat)
+        results['snake_render'][key] = time_calls(game.snake.render, repeat)
+        results['game_render'][key] = time_calls(game.render, repeat)
+    if startup:
+        results['time_to_first_frame'] = {'startup': time_to_first_frame(repeat)}
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': ".".join(map(str, pygame.get_sdl_version())),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'video_driver': pygame.display.get_driver(),
+            'board_size': list(size),
+            'repeat': repeat,
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.15) -> Tuple[List[str], List[str]]:
+    """
+    Compare the best times of a run against a baseline run.
+
+    Parameters:
+        current (Dict): The results of run().
+        baseline (Dict): The results of an earlier run(), usually loaded from a file.
+        threshold (float): How much slower than the baseline a result may be before it counts as a regression. (default: 0.15)
+
+    Returns:
+        Tuple[List[str], List[str]]: A line per result compared and the lines of the results that regressed.
+    """
+    lines, regressions = [], []
+    for name, by_length in current['results'].items():
+        for length, result in by_length.items():
+            before = baseline.get('results', {}).get(name, {}).get(length)
+            if before is None:
+                continue
+            ratio = result['best_us'] / before['best_us']
+            line = f"{name:<16} {length:>6}  {before['best_us']:>10.2f} us -> {result['best_us']:>10.2f} us  ({ratio - 1:+.1%})"
+            lines.append(line)
+            if ratio > 1 + threshold:
+                regressions.append(line)
+    return (lines, regressions)
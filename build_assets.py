@@ -0,0 +1,16 @@
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.assets import BUNDLE_PATH, build_bundle
+
+
+def main() -> int:
+    size = build_bundle()
+    print(f"Wrote {BUNDLE_PATH} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
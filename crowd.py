@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game.arena import Arena
+from game.tournament import load_agent, build_agent
+
+FPS = 30
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fill one board with hundreds of bot snakes and report how long the ticks take.")
+    parser.add_argument("--snakes", type=int, default=300, help="The number of snakes. (default: 300)")
+    parser.add_argument("--size", type=int, nargs=2, default=(4000, 3000), metavar=("WIDTH", "HEIGHT"), help="The size of the board. (default: 4000 3000)")
+    parser.add_argument("--fruits", type=int, default=None, help="The number of fruits. (default: one per snake)")
+    parser.add_argument("--ticks", type=int, default=3000, help="The number of ticks to run. (default: 3000)")
+    parser.add_argument("--report-every", type=int, default=500, help="Print the timings every this many ticks. (default: 500)")
+    parser.add_argument("--agent", default="game.agents:greedy_agent", help="The agent every snake plays with, as module:name.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--watch", action="store_true", help="Show the board, scaled down into a window.")
+    args = parser.parse_args()
+
+    window = world = None
+    if args.watch:
+        pygame.display.init()
+        window = pygame.display.set_mode((1150, round(1150 * args.size[1] / args.size[0])))
+        pygame.display.set_caption("Snake game by Dhyanesh! (crowd)")
+        world = pygame.Surface(args.size)
+    arena = Arena(args.snakes, size=tuple(args.size), seed=args.seed, fruits=args.fruits, display=world, respawn=True)
+    agent = load_agent(args.agent)
+    agents = [build_agent(agent, args.seed + player if args.seed is not None else None) for player in range(args.snakes)]
+    views = [arena.view(player) for player in range(args.snakes)]
+
+    # The ticks are timed apart from the agents, whose cost is their own.
+    step_times, agent_times, deaths = [], [], 0
+    for tick in range(1, args.ticks + 1):
+        start = time.perf_counter()
+        actions = [agents[player](views[player]) if arena.alive[player] else None for player in range(args.snakes)]
+        stepped = time.perf_counter()
+        _, dead = arena.step(actions)
+        step_times.append(time.perf_counter() - stepped)
+        agent_times.append(stepped - start)
+        deaths += len(dead)
+
+        if window is not None:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return 0
+            world.fill("black")
+            arena.render()
+            pygame.transform.smoothscale(world, window.get_size(), window)
+            pygame.display.flip()
+            pygame.time.wait(1000 // FPS)
+
+        if tick % args.report_every == 0 or tick == args.ticks:
+            times = sorted(step_times)
+            pieces = sum(len(snake.body) for snake in arena.snakes)
+            print(f"tick {tick:>6}: {sum(arena.alive):>4} alive, {pieces:>6} pieces, {deaths:>5} deaths | "
+                  f"tick mean {statistics.fmean(times) * 1e3:.2f} ms, 99th percentile {times[int(len(times) * 0.99)] * 1e3:.2f} ms | "
+                  f"agents {statistics.fmean(agent_times) * 1e3:.2f} ms")
+            step_times.clear()
+            agent_times.clear()
+            deaths = 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import os
+import sys
+import argparse
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game.capture import read_frames, frame_surface, pixel_format
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Turn a frame stream recorded by the game into images or raw video.")
+    parser.add_argument("capture", help="The frame stream to export.")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--png-dir", metavar="DIR", help="Save every frame as a numbered PNG in this directory.")
+    output.add_argument("--raw", action="store_true", help="Write the frames to stdout as raw video, to pipe into ffmpeg.")
+    output.add_argument("--info", action="store_true", help="Only print what the stream holds.")
+    args = parser.parse_args()
+
+    header, frames = read_frames(args.capture)
+    width, height = header['size']
+    row_bytes = width * header['bytesize']
+
+    if args.info:
+        numbers = [number for number, _ in frames]
+        missing = (numbers[-1] + 1 - numbers[0] - len(numbers)) if numbers else 0
+        print(f"{width}x{height} {pixel_format(header)} at {header['fps']:g} fps, {len(numbers)} frames, {missing} dropped")
+        return 0
+
+    if args.raw:
+        print(f"ffmpeg -f rawvideo -pixel_format {pixel_format(header)} -video_size {width}x{height} "
+              f"-framerate {header['fps']:g} -i - -c:v libx264 -crf 0 highlight.mp4", file=sys.stderr)
+        out = sys.stdout.buffer
+        next_number = None
+        for number, pixels in frames:
+            if header['pitch'] != row_bytes:
+                pixels = b"".join(pixels[row * header['pitch']:row * header['pitch'] + row_bytes] for row in range(height))
+            # Dropped frames are filled in with the frame after them, so the video keeps the timing of the game.
+            repeats = number - next_number + 1 if next_number is not None else 1
+            for _ in range(max(repeats, 1)):
+                out.write(pixels)
+            next_number = number + 1
+        return 0
+
+    os.makedirs(args.png_dir, exist_ok=True)
+    for number, pixels in frames:
+        pygame.image.save(frame_surface(header, pixels), os.path.join(args.png_dir, f"frame_{number:06d}.png"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
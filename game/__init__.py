@@ -1,3 +1,17 @@
 from .game import Game
+from .simulation import Simulation
+from .batch import BatchSimulation
+from .timestep import FixedTimestep
+from .profiler import FrameProfiler
+from .replay import Replay, ReplayRecorder, ReplayPlayer
+from .leaderboard import Leaderboard
+from .autopilot import Autopilot
+from .hamiltonian import HamiltonianAutopilot
+from .assets import AssetBundle
+from .capture import FrameRecorder
+from .observation import Observation
+from .vector_env import VectorEnv
+from .arena import Arena
+from .multiplayer import MultiplayerServer, MultiplayerClient
 
-__all__ = ["Game"]
\ No newline at end of file
+__all__ = ["Game", "Simulation", "BatchSimulation", "FixedTimestep", "FrameProfiler", "Replay", "ReplayRecorder", "ReplayPlayer", "Leaderboard", "Autopilot", "HamiltonianAutopilot", "AssetBundle", "FrameRecorder", "Observation", "VectorEnv", "Arena", "MultiplayerServer", "MultiplayerClient"]
\ No newline at end of file
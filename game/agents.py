@@ -0,0 +1,78 @@
+import random
+import pygame
+from typing import List
+
+from .simulation import Simulation
+
+DIRECTIONS = "udlr"
+OPPOSITES = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}
+
+
+def next_head_rect(simulation: Simulation, direction: str) -> pygame.Rect:
+    """Get where the head would be after moving one step in the given direction."""
+    head = simulation.snake.head
+    dx, dy = {'u': (0, -1), 'd': (0, 1), 'l': (-1, 0), 'r': (1, 0)}[direction]
+    return head.rect.move(dx * head.velocity, dy * head.velocity)
+
+
+def allowed_directions(simulation: Simulation) -> List[str]:
+    """Get the directions the snake can turn to, which is all of them except reversing into its own body."""
+    snake = simulation.snake
+    if len(snake.body) == 0:
+        return list(DIRECTIONS)
+    return [direction for direction in DIRECTIONS if direction != OPPOSITES[snake.direction]]
+
+
+def is_safe(simulation: Simulation, direction: str) -> bool:
+    """
+    Check if moving one step in the given direction keeps the head off the walls and the body.
+
+    The tail is counted as part of the body even though it moves away on the same tick, so this errs on the side of caution.
+    """
+    rect = next_head_rect(simulation, direction)
+    grid = simulation.collision_grid
+    return not (grid.hits_wall(rect) or grid.occupied(rect))
+
+
+def greedy_agent(simulation: Simulation) -> str:
+    """
+    Head straight for the fruit, along whichever axis is further from it, without taking a step that dies right away.
+
+    If no step towards the fruit is safe, any safe step is taken, keeping the current direction if possible.
+    """
+    head, fruit = simulation.snake.head.rect, simulation.fruit.rect
+    dx, dy = fruit.centerx - head.centerx, fruit.centery - head.centery
+    towards = []
+    for distance, negative, positive in sorted(((dx, 'l', 'r'), (dy, 'u', 'd')), key=lambda axis: -abs(axis[0])):
+        if distance:
+            towards.append(positive if distance > 0 else negative)
+    allowed = allowed_directions(simulation)
+    current = simulation.snake.direction
+    for direction in towards + [current] + allowed:
+        if direction in allowed and is_safe(simulation, direction):
+            return direction
+    return None
+
+
+class RandomAgent:
+    """
+    Take a random safe step, or any step if none is safe. A baseline for other agents to beat.
+
+    Every instance draws from a random number generator of its own, so a game played by RandomAgent(seed) can be played
+    again exactly, in any process. play_game() seeds it with the seed of the game.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        """
+        Parameters:
+            seed (int): The seed for the random number generator. (default: a random seed)
+        """
+        self.rng = random.Random(seed)
+
+    def __call__(self, simulation: Simulation) -> str:
+        allowed = allowed_directions(simulation)
+        safe = [direction for direction in allowed if is_safe(simulation, direction)]
+        return self.rng.choice(safe or allowed)
+
+
+random_agent = RandomAgent # Kept as an alias for existing agent specs (see load_agent)
@@ -0,0 +1,357 @@
+import zlib
+import array
+import random
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sprites.snake import Snake
+from sprites.fruit import Fruit
+from .boundary import Boundary
+from .gameover import GameOver
+from .collision import CollisionGrid
+from .camera import ChunkIndex
+
+OPPOSITES = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}
+COLORS = ("green", "dodgerblue", "orange", "magenta", "yellow", "cyan", "white", "purple")
+
+
+class PlayerView:
+    """
+    One player's view of an Arena, shaped like a Simulation (snake, fruit, collision_grid, ticks, score),
+    so the single-player agents (see game.agents) can steer any snake in the arena. The fruit is the one nearest to its head.
+    """
+
+    def __init__(self, arena: "Arena", player: int) -> None:
+        self.arena = arena
+        self.player = player
+        self.snake: Snake = arena.snakes[player]
+        self.collision_grid: CollisionGrid = arena.collision_grid
+
+    @property
+    def fruit(self) -> Fruit:
+        """Get the fruit nearest to the head of the player."""
+        return self.arena.nearest_fruit(self.snake.head.rect.topleft)
+
+    @property
+    def ticks(self) -> int:
+        return self.arena.ticks
+
+    @property
+    def score(self) -> int:
+        return self.arena.scores[self.player]
+
+
+class Arena:
+    """
+    Several snakes on one board, under the rules of Simulation. It is the shared state of a multiplayer game (see MultiplayerServer).
+
+    - All the bodies are tracked by one CollisionGrid, so a head running into any body (its own or another's) is a single lookup.
+      A head running into a wall or into another head ends that snake too; two heads meeting end both.
+    - The heads and the fruits are kept in maps from the cells they cover, rebuilt from the heads every tick and updated as fruits move,
+      so meeting heads, eating and placing fruits are lookups too. A tick costs as much as the number of living snakes,
+      however long they are and however many fruits there are, which lets hundreds of snakes share a board.
+    - Every tick, all living snakes turn and move first and are judged afterwards, so the order of the players never matters.
+      The bodies of snakes that died are taken off the board at the end of the tick.
+    - There are several fruits, placed on free spots away from every body, head and other fruit. Any head that reaches one eats it.
+    - Like Simulation, a round is fully determined by its seed and the turns taken at each tick, so clients replaying the
+      same turns stay in sync with the server. checksum() summarizes the state for checking that they do.
+    """
+
+    COLLISION_REASON = "SNAKE BUMPED INTO A SNAKE"
+    HEAD_ON_REASON = "SNAKES BUMPED HEADS"
+
+    def __init__(self,
+                 players: int,
+                 size: Tuple[int, int] = (1150, 760),
+                 seed: int = None,
+                 fruits: int = None,
+                 display: pygame.Surface = None,
+                 respawn: bool = False,
+                 ) -> None:
+        """
+        Parameters:
+            players (int): The number of snakes, at least 1. Up to 8 start in two columns facing each other, more on a lattice
+                           spread over the board, which has to be large enough to hold them (see start_positions()).
+            size (Tuple[int, int]): The width and height of the playing area, boundary included. (default: (1150, 760))
+            seed (int): The seed for the random number generator that places the fruits. (default: a random seed)
+            fruits (int): The number of fruits on the board. (default: one per player)
+            display (pygame.Surface): The surface to render on, if any. Leave it as None to run headless. (default: None)
+            respawn (bool): Whether snakes that die come back at the end of the tick (see revive()), so the round never ends.
+                            For keeping a crowd on the board. (default: False)
+        """
+        if players < 1:
+            raise ValueError(f"An arena needs at least 1 player, not {players}")
+        self.players = players
+        self.respawn = respawn
+        self.size = size
+        self.display = display
+        self.seed: int = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+
+        self.boundary = Boundary(display, size=size)
+        self.snakes: List[Snake] = [Snake(display, x, y, body_color=COLORS[player % len(COLORS)], outline_width=2, initial_direction=direction)
+                                    for player, (x, y, direction) in enumerate(self.start_positions())]
+        self.fruits: List[Fruit] = [Fruit(display, 0, 0, rng=self.rng) for _ in range(fruits or players)]
+        self.collision_grid = CollisionGrid(
+            boundary = self.boundary,
+            cell_size = self.snakes[0].body.piece_width,
+            origin = self.snakes[0].head.rect.topleft,
+            spot_size = (self.fruits[0].width, self.fruits[0].height),
+        )
+        for snake in self.snakes:
+            snake.body.on_piece_added = lambda piece: self.collision_grid.add(piece.rect)
+            snake.body.on_piece_removed = lambda piece: self.collision_grid.remove(piece.rect)
+
+        self.head_cells: Dict[int, int] = {} # The cells under the heads of the living snakes, and whose head it is
+        self.fruit_cells: Dict[int, int] = {} # The cells under the fruits, and which fruit it is
+        self.fruit_index = ChunkIndex()
+        self.fruit_numbers: Dict[Fruit, int] = {fruit: number for number, fruit in enumerate(self.fruits)}
+
+        self.ticks: int = 0
+        self.alive: List[bool] = []
+        self.scores: List[int] = []
+        self.reasons: List[str] = []
+        self.restart(self.seed)
+
+    def start_positions(self) -> List[Tuple[int, int, str]]:
+        """
+        Get where each snake starts: in two columns facing each other, spread over the height of the field.
+        Beyond 8 players, they start on a lattice six steps apart, filled row by row, the rows heading alternately right and left.
+
+        Returns:
+            List[Tuple[int, int, str]]: The top-left corner of the head and the starting direction of every player.
+
+        Raises:
+            ValueError: If the lattice doesn't fit that many players on the board.
+        """
+        step = 16 # The snake's movement step, which keeps every start on the same grid as Simulation's (60, 60)
+        width = self.size[0]
+        bottom = self.boundary.stats_separator.top - 60
+        right = 60 + (width - 60 - 60 - 32) // step * step
+        if self.players > len(COLORS):
+            pitch = step * 6
+            columns = (right - 60) // pitch + 1
+            rows = max((bottom - 60) // pitch + 1, 0)
+            if columns * rows < self.players:
+                raise ValueError(f"A board of {self.size[0]}x{self.size[1]} holds up to {columns * rows} players, not {self.players}")
+            return [(60 + (player % columns) * pitch, 60 + (player // columns) * pitch, 'r' if player // columns % 2 == 0 else 'l')
+                    for player in range(self.players)]
+        lanes = -(-self.players // 2)
+        gap = max((bottom - 60) // max(lanes - 1, 1) // step * step, step * 3)
+        return [(60 if player % 2 == 0 else right, 60 + (player // 2) * gap, 'r' if player % 2 == 0 else 'l')
+                for player in range(self.players)]
+
+    def restart(self, seed: int = None) -> None:
+        """
+        Start a new round with every snake back at its start and alive.
+
+        Parameters:
+            seed (int): The seed for the new round. (default: a seed drawn from the random number generator of the last round)
+        """
+        self.seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.rng.seed(self.seed)
+        self.ticks = 0
+        self.alive = [True] * self.players
+        self.scores = [0] * self.players
+        self.reasons = [""] * self.players
+        for snake in self.snakes:
+            snake.reset()
+        self.head_cells = {}
+        for player, snake in enumerate(self.snakes):
+            for cell in self.collision_grid.cells_of(snake.head.rect):
+                self.head_cells[cell] = player
+        for fruit in self.fruits:
+            self.place_fruit(fruit, (-fruit.width, -fruit.height))
+        for fruit in self.fruits:
+            self.change_fruit_pos(fruit)
+        for snake in self.snakes:
+            snake.start()
+
+    @property
+    def over(self) -> bool:
+        """Check if the round is over: every snake died, or only one is left of several. Never, when snakes respawn."""
+        if self.respawn:
+            return False
+        living = sum(self.alive)
+        return living == 0 or (living == 1 and self.players > 1)
+
+    def view(self, player: int) -> PlayerView:
+        """Get a view of the arena for an agent steering the given player."""
+        return PlayerView(self, player)
+
+    def turn(self, player: int, direction: str) -> bool:
+        """
+        Turn a player's snake towards the given direction. A snake can't reverse into its own body, and dead snakes don't turn.
+
+        Returns:
+            bool: Whether the turn was accepted.
+        """
+        if direction not in OPPOSITES:
+            raise ValueError(f"Invalid direction: {direction}")
+        snake = self.snakes[player]
+        if not self.alive[player] or direction == snake.direction:
+            return False
+        if snake.direction == OPPOSITES[direction] and len(snake.body) != 0:
+            return False
+        snake.direction = direction
+        return True
+
+    def nearest_fruit(self, position: Tuple[int, int]) -> Fruit:
+        """Get the fruit on the board whose top-left corner is nearest to a point, the first one if none is on the board."""
+        fruit = self.fruit_index.nearest(position, key=self.fruit_numbers.__getitem__)
+        return fruit if fruit is not None else self.fruits[0]
+
+    def place_fruit(self, fruit: Fruit, pos: Tuple[int, int]) -> None:
+        """Move a fruit to the given top-left corner, keeping fruit_cells and fruit_index up to date."""
+        grid = self.collision_grid
+        for cell in grid.cells_of(fruit.rect):
+            if self.fruit_cells.get(cell) == self.fruit_numbers[fruit]:
+                del self.fruit_cells[cell]
+        self.fruit_index.remove(fruit)
+        fruit.set_pos_to(pos)
+        if pos[0] < 0:
+            return # Off the board
+        for cell in grid.cells_of(fruit.rect):
+            if cell != -1:
+                self.fruit_cells[cell] = self.fruit_numbers[fruit]
+        self.fruit_index.add(fruit)
+
+    def clear_of_heads_and_fruits(self, rect: pygame.Rect, fruit_number: int = None) -> bool:
+        """Check that a grid-aligned Rect covers none of the living heads and no fruit, except the fruit with the given number."""
+        head_cells, fruit_cells = self.head_cells, self.fruit_cells
+        return not any(cell in head_cells or fruit_cells.get(cell, fruit_number) != fruit_number
+                       for cell in self.collision_grid.cells_of(rect))
+
+    def change_fruit_pos(self, fruit: Fruit) -> None:
+        """Move a fruit to a random free spot, clear of every body, head and other fruit, or off the board if there is none."""
+        grid = self.collision_grid
+        number = self.fruit_numbers[fruit]
+        # Heads and fruits aren't tracked by the grid. Free spots are drawn until one misses them all, which rarely takes more than one draw,
+        # and only when that keeps failing are they added to the grid just for the lookup.
+        for _ in range(8):
+            pos = grid.random_free_spot(self.rng)
+            if pos is None:
+                break
+            if self.clear_of_heads_and_fruits(pygame.Rect(pos, (fruit.width, fruit.height)), number):
+                self.place_fruit(fruit, pos)
+                return
+        others = [snake.head.rect for snake, alive in zip(self.snakes, self.alive) if alive]
+        others += [other.rect for other in self.fruits if other is not fruit]
+        for rect in others:
+            grid.add(rect)
+        pos = grid.random_free_spot(self.rng)
+        for rect in others:
+            grid.remove(rect)
+        self.place_fruit(fruit, pos if pos is not None else (-fruit.width, -fruit.height))
+
+    def revive(self, player: int) -> bool:
+        """
+        Bring a dead player's snake back with an empty body, on a random free spot clear of every head and fruit,
+        heading towards the middle of the board. It keeps its score.
+
+        Returns:
+            bool: Whether a spot was found. If not, the snake stays dead and can be revived later.
+        """
+        snake = self.snakes[player]
+        for _ in range(8):
+            pos = self.collision_grid.random_free_spot(self.rng)
+            if pos is None:
+                return False
+            rect = pygame.Rect(pos, snake.head.rect.size)
+            if self.clear_of_heads_and_fruits(rect):
+                break
+        else:
+            return False
+        dx, dy = self.size[0] // 2 - rect.centerx, self.boundary.stats_separator.top // 2 - rect.centery
+        snake.head.rect.topleft = pos
+        snake.direction = ('r' if dx > 0 else 'l') if abs(dx) > abs(dy) else ('d' if dy > 0 else 'u')
+        snake.start()
+        self.alive[player] = True
+        self.reasons[player] = ""
+        for cell in self.collision_grid.cells_of(rect):
+            self.head_cells[cell] = player
+        return True
+
+    def step(self, actions: Sequence[Optional[str]] = ()) -> Tuple[List[int], List[int]]:
+        """
+        Advance the round by one tick.
+
+        Parameters:
+            actions (Sequence[Optional[str]]): The direction each player turns to, or None to keep going.
+                                               Missing players keep going. (default: nobody turns)
+
+        Returns:
+            Tuple[List[int], List[int]]: The players that ate a fruit and the players that died this tick.
+                                         With respawn, the ones that died have already been revived where there was room.
+        """
+        living = [player for player in range(self.players) if self.alive[player]]
+        for player, action in enumerate(actions):
+            if action is not None:
+                self.turn(player, action)
+        self.ticks += 1
+        for player in living:
+            self.snakes[player].move()
+
+        grid = self.collision_grid
+        dead: Dict[int, str] = {}
+        head_cells: Dict[int, int] = {}
+        cells_of_heads: Dict[int, List[int]] = {}
+        walls, counts = grid.walls, grid.counts
+        for player in living:
+            # The same checks as CollisionGrid.hits_wall() and occupied(), on one lookup of the head's cells
+            cells = cells_of_heads[player] = grid.cells_of(self.snakes[player].head.rect)
+            if any(cell == -1 or walls[cell] for cell in cells):
+                dead[player] = GameOver.BOUNDARY_REASON
+            elif any(counts[cell] for cell in cells):
+                dead[player] = self.COLLISION_REASON
+            for cell in cells:
+                other = head_cells.setdefault(cell, player)
+                if other != player and cell != -1:
+                    dead.setdefault(player, self.HEAD_ON_REASON)
+                    dead.setdefault(other, self.HEAD_ON_REASON)
+
+        for player, reason in dead.items():
+            self.alive[player] = False
+            self.reasons[player] = reason
+            self.snakes[player].stop()
+            self.snakes[player].body.reset() # Takes the body off the board, at a cost paid for by the ticks it took to grow
+        self.head_cells = {cell: player for cell, player in head_cells.items() if cell != -1 and player not in dead}
+
+        # Every head that reached a fruit eats it, even when two reach the same one, before any fruit is moved.
+        # A head covering two fruits eats the first of them.
+        eaten, reached = [], set()
+        fruit_cells = self.fruit_cells
+        for player in living:
+            if player in dead:
+                continue
+            numbers = [fruit_cells[cell] for cell in cells_of_heads[player] if cell in fruit_cells]
+            if numbers:
+                self.snakes[player].extend()
+                self.scores[player] += 1
+                eaten.append(player)
+                reached.add(min(numbers))
+        for number in sorted(reached):
+            self.change_fruit_pos(self.fruits[number])
+        if self.respawn:
+            for player in range(self.players):
+                if not self.alive[player]:
+                    self.revive(player)
+        return (eaten, sorted(dead))
+
+    def checksum(self) -> int:
+        """Get a CRC of the heads, lengths, life and scores of the snakes and the fruit positions, to check that two arenas are in sync."""
+        values = array.array('i', [self.ticks])
+        for snake, alive, score in zip(self.snakes, self.alive, self.scores):
+            values.extend((snake.head.rect.x, snake.head.rect.y, len(snake.body), alive, score))
+        for fruit in self.fruits:
+            values.extend(fruit.rect.topleft)
+        return zlib.crc32(values.tobytes())
+
+    def render(self) -> None:
+        """Draw the boundary, the fruits and the living snakes."""
+        self.boundary.render()
+        for fruit in self.fruits:
+            fruit.render()
+        for snake, alive in zip(self.snakes, self.alive):
+            if alive:
+                snake.render()
@@ -0,0 +1,146 @@
+import io
+import os
+import json
+import struct
+import pygame
+from typing import Dict, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLE_PATH = os.path.join(ROOT, "assets", "bundle.bin")
+
+# The assets of the game by name, as paths relative to the root of the project.
+FONTS: Dict[str, str] = {
+    'game': "assets/fonts/game_font.ttf",
+    'message': "assets/fonts/message_font.ttf",
+}
+# Images are given along with the size they are scaled to, or None to keep their own size.
+IMAGES: Dict[str, Tuple[str, Optional[Tuple[int, int]]]] = {
+    'score_icon': ("game/apple.png", (32, 32)),
+    'highscore_icon': ("game/trophy.png", (32, 32)),
+    'icon': ("assets/icon.png", None),
+}
+
+MAGIC = b"SNKA"
+VERSION = 1
+_HEADER = struct.Struct("<4sBI") # Magic, version and length of the JSON index that follows
+
+
+class AssetBundle:
+    """
+    The fonts and images of the game, each loaded the first time it is used and kept for the rest of the run.
+
+    - A font file is read once, however many sizes of it are used. Each size is opened the first time it's asked for,
+      so a font that only shows up on the game over screen costs nothing until then.
+    - Images are scaled to their size and converted to the pixel format of the display once, so blitting them never converts them again.
+    - If a pre-built bundle (see build_bundle()) is newer than all the source files, everything is read from that one file,
+      with the images already scaled and decoded, so no PNG is decoded at startup. Otherwise the source files are loaded.
+    """
+
+    def __init__(self, bundle_path: str = BUNDLE_PATH, root: str = ROOT) -> None:
+        """
+        Parameters:
+            bundle_path (str): The pre-built bundle to read from, if it exists and is up to date. (default: assets/bundle.bin)
+            root (str): The directory the paths in FONTS and IMAGES are relative to. (default: the root of the project)
+        """
+        self.bundle_path = bundle_path
+        self.root = root
+
+        self.fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self.images: Dict[str, pygame.Surface] = {}
+        self._font_data: Dict[str, bytes] = {}
+        self._bundle: Dict = None # The index and data of the bundle, once it's read
+        self.from_bundle: bool = None # Whether the assets come from the bundle, once anything was loaded
+
+    def font(self, name: str, size: int) -> pygame.font.Font:
+        """Get one of the FONTS at the given size. pygame.font must have been initialized."""
+        key = (name, size)
+        if key not in self.fonts:
+            if name not in self._font_data:
+                bundle = self._load_bundle()
+                if bundle is not None:
+                    offset, length = bundle['index']['fonts'][name]
+                    self._font_data[name] = bundle['data'][offset:offset + length]
+                else:
+                    with open(os.path.join(self.root, FONTS[name]), "rb") as f:
+                        self._font_data[name] = f.read()
+            # Font keeps reading from the file object, so every size gets its own view of the bytes.
+            self.fonts[key] = pygame.font.Font(io.BytesIO(self._font_data[name]), size)
+        return self.fonts[key]
+
+    def image(self, name: str) -> pygame.Surface:
+        """
+        Get one of the IMAGES, scaled to its size. It is converted to the display's pixel format if the display was already opened,
+        since pygame can't convert surfaces before that.
+        """
+        if name not in self.images:
+            bundle = self._load_bundle()
+            if bundle is not None:
+                offset, length, width, height = bundle['index']['images'][name]
+                surface = pygame.image.frombuffer(bundle['data'][offset:offset + length], (width, height), "RGBA")
+            else:
+                path, size = IMAGES[name]
+                surface = pygame.image.load(os.path.join(self.root, path))
+                if size is not None:
+                    surface = pygame.transform.scale(surface, size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.images[name] = surface
+        return self.images[name]
+
+    def _sources_mtime(self) -> float:
+        """Get the time the most recently changed source file was modified."""
+        paths = list(FONTS.values()) + [path for path, _ in IMAGES.values()]
+        return max(os.path.getmtime(os.path.join(self.root, path)) for path in paths)
+
+    def _load_bundle(self) -> Optional[Dict]:
+        """Read the whole bundle the first time an asset is needed, or decide to use the source files if it's missing or out of date."""
+        if self.from_bundle is None:
+            self.from_bundle = False
+            try:
+                if os.path.getmtime(self.bundle_path) >= self._sources_mtime():
+                    with open(self.bundle_path, "rb") as f:
+                        data = f.read()
+                    magic, version, index_length = _HEADER.unpack_from(data)
+                    if magic == MAGIC and version == VERSION:
+                        index = json.loads(data[_HEADER.size:_HEADER.size + index_length])
+                        if set(index['fonts']) == set(FONTS) and set(index['images']) == set(IMAGES):
+                            self._bundle = {'index': index, 'data': memoryview(data)[_HEADER.size + index_length:]}
+                            self.from_bundle = True
+            except (OSError, ValueError, KeyError, struct.error):
+                pass # A missing or broken bundle just means loading the source files
+        return self._bundle
+
+
+def build_bundle(path: str = BUNDLE_PATH, root: str = ROOT) -> int:
+    """
+    Build the bundle AssetBundle reads: the raw bytes of every font and the pixels of every image, scaled to its size, in one file.
+
+    The file starts with the MAGIC, the VERSION and the length of a JSON index, followed by the index, which gives
+    the offset and length of every asset in the data after it (and the size of images), and then the data.
+
+    Returns:
+        int: The size of the bundle in bytes.
+    """
+    assets = AssetBundle(bundle_path="", root=root) # Never reads a bundle, so everything comes from the sources
+    index = {'fonts': {}, 'images': {}}
+    data = bytearray()
+    for name, source in FONTS.items():
+        with open(os.path.join(root, source), "rb") as f:
+            font = f.read()
+        index['fonts'][name] = [len(data), len(font)]
+        data += font
+    for name in IMAGES:
+        surface = assets.image(name)
+        pixels = pygame.image.tobytes(surface, "RGBA")
+        index['images'][name] = [len(data), len(pixels), *surface.get_size()]
+        data += pixels
+
+    index_bytes = json.dumps(index).encode()
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(data)
+    os.replace(temporary_path, path)
+    return _HEADER.size + len(index_bytes) + len(data)
+
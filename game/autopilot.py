@@ -0,0 +1,292 @@
+import heapq
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .simulation import Simulation
+
+INFINITY = 2**31 - 1
+OPPOSITES = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}
+
+
+class Autopilot:
+    """
+    Steers the snake to the fruit along shortest paths, falling back to chasing its own tail when going for the fruit
+    could trap it. It is an agent (see tournament.load_agent): call it with the simulation before every tick to get the direction to turn to.
+
+    #### Distance field:
+    - The head covers a block of cells, so the search runs over head positions, named by the top-left cell of the block.
+      A position is open when none of its cells is a wall or covered by the body.
+    - The distance from every open position to the nearest position that eats the fruit is kept in a field, computed by a
+      breadth-first search only when the fruit moves.
+    - Every tick, the body covers one new cell pair and usually frees the tail's. The collision grid reports those cells
+      (CollisionGrid.on_cell_changed) and only the positions around them are updated: positions that lost every shortest path
+      are invalidated along with whatever depended on them, then the invalidated and newly opened positions are relaxed again
+      from their neighbours. A tick costs as much as the part of the field that actually changed, not the whole board.
+
+    #### Safety:
+    - Before taking a step, a flood fill from the new position checks that the head can still reach the tail or an area
+      at least as large as the body. It stops as soon as either is found, so it is usually cheap.
+    - If no step towards the fruit passes, the safe step closest to the tail is taken. If no step is safe, the one with the most room is.
+    """
+
+    def __init__(self, simulation: Simulation = None) -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation to steer. (default: the first one the autopilot is called with)
+        """
+        self.simulation: Simulation = None
+        self.columns: int = 0
+        self.head_columns: int = 0
+        self.head_rows: int = 0
+        self.position_cells: List[List[int]] = []
+        self.neighbours: List[List[int]] = []
+        self.steps: Dict[str, int] = {}
+
+        self.open: bytearray = bytearray()
+        self.distances: array = array('i')
+        self.targets: Set[int] = set()
+        self.changed_cells: Set[int] = set()
+        self.fruit_rect = None
+        self.last_tick: int = None
+
+        if simulation is not None:
+            self.attach(simulation)
+
+    def attach(self, simulation: Simulation) -> None:
+        """Start steering a simulation, precomputing the layout of its grid."""
+        if self.simulation is not None:
+            self.simulation.collision_grid.on_cell_changed = None
+        self.simulation = simulation
+        grid = simulation.collision_grid
+        head = simulation.snake.head
+        columns, rows = grid.columns, grid.rows
+        self.columns = columns
+        self.head_columns = -(-head.rect.width // grid.cell_size)
+        self.head_rows = -(-head.rect.height // grid.cell_size)
+        self.steps = {'u': -columns, 'd': columns, 'l': -1, 'r': 1}
+
+        # Positions that would put the head outside the grid are left without cells and neighbours and never opened.
+        self.position_cells = [[] for _ in range(columns * rows)]
+        self.neighbours = [[] for _ in range(columns * rows)]
+        last_col, last_row = columns - self.head_columns, rows - self.head_rows
+        for row in range(last_row + 1):
+            for col in range(last_col + 1):
+                position = row * columns + col
+                self.position_cells[position] = [position + dy * columns + dx for dy in range(self.head_rows) for dx in range(self.head_columns)]
+                if col > 0: self.neighbours[position].append(position - 1)
+                if col < last_col: self.neighbours[position].append(position + 1)
+                if row > 0: self.neighbours[position].append(position - columns)
+                if row < last_row: self.neighbours[position].append(position + columns)
+
+        grid.on_cell_changed = self.changed_cells.add
+        self.reset()
+
+    def reset(self) -> None:
+        """Recompute the whole distance field, for instance after a snapshot was restored."""
+        grid = self.simulation.collision_grid
+        self.changed_cells.clear()
+        self.open = bytearray(len(self.position_cells))
+        for position, cells in enumerate(self.position_cells):
+            self.open[position] = self._is_open(cells)
+        self.fruit_rect = grid.fruit_rect.copy()
+        self.targets = self._fruit_positions()
+        self.last_tick = self.simulation.ticks
+
+        self.distances = array('i', [INFINITY]) * len(self.position_cells)
+        queue = deque()
+        for position in self.targets:
+            if self.open[position]:
+                self.distances[position] = 0
+                queue.append(position)
+        self._relax(queue)
+
+    def _is_open(self, cells: List[int]) -> bool:
+        """Check if the head can be placed over the cells."""
+        grid = self.simulation.collision_grid
+        return bool(cells) and not any(grid.walls[cell] or grid.counts[cell] for cell in cells)
+
+    def _positions_over(self, cells: Iterable[int]) -> Set[int]:
+        """Get the head positions that cover any of the cells."""
+        columns, position_cells = self.columns, self.position_cells
+        positions = set()
+        for cell in cells:
+            row, col = divmod(cell, columns)
+            for dy in range(min(row, self.head_rows - 1) + 1):
+                for dx in range(min(col, self.head_columns - 1) + 1):
+                    position = cell - dy * columns - dx
+                    if position_cells[position]:
+                        positions.add(position)
+        return positions
+
+    def _fruit_positions(self) -> Set[int]:
+        """Get the head positions that overlap the fruit."""
+        grid = self.simulation.collision_grid
+        return self._positions_over(cell for cell in grid.cells_of(self.fruit_rect) if cell != -1)
+
+    def _relax(self, queue: deque) -> None:
+        """Breadth-first search outwards from the positions in the queue, whose distances are final."""
+        distances, open_, neighbours = self.distances, self.open, self.neighbours
+        while queue:
+            position = queue.popleft()
+            distance = distances[position] + 1
+            for neighbour in neighbours[position]:
+                if open_[neighbour] and distances[neighbour] > distance:
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+
+    def update(self) -> None:
+        """Bring the distance field up to date with the cells that changed since the last update."""
+        if not self.changed_cells:
+            return
+        position_cells = self.position_cells
+        touched = self._positions_over(self.changed_cells)
+        self.changed_cells.clear()
+
+        closed, opened = [], []
+        for position in touched:
+            is_open = self._is_open(position_cells[position])
+            if is_open != bool(self.open[position]):
+                self.open[position] = is_open
+                (opened if is_open else closed).append(position)
+
+        distances, neighbours, open_ = self.distances, self.neighbours, self.open
+
+        # Invalidate every position whose shortest paths all went through a closed position, in order of distance,
+        # so a position is only judged once every position closer to the fruit has been.
+        invalid = set(closed)
+        heap = []
+        for position in closed:
+            if distances[position] != INFINITY:
+                for neighbour in neighbours[position]:
+                    if distances[neighbour] == distances[position] + 1:
+                        heapq.heappush(heap, (distances[neighbour], neighbour))
+        while heap:
+            distance, position = heapq.heappop(heap)
+            if position in invalid or not open_[position] or distances[position] != distance:
+                continue
+            if any(distances[neighbour] == distance - 1 and open_[neighbour] and neighbour not in invalid
+                   for neighbour in neighbours[position]):
+                continue
+            invalid.add(position)
+            for neighbour in neighbours[position]:
+                if distances[neighbour] == distance + 1:
+                    heapq.heappush(heap, (distance + 1, neighbour))
+        for position in invalid:
+            distances[position] = INFINITY
+
+        # Give the invalidated and opened positions the best distance their neighbours offer, then spread it.
+        heap = []
+        for position in list(invalid) + opened:
+            if not open_[position]:
+                continue
+            if position in self.targets:
+                best = 0
+            else:
+                best = min((distances[neighbour] for neighbour in neighbours[position] if open_[neighbour]), default=INFINITY)
+                best = best + 1 if best != INFINITY else INFINITY
+            if best < distances[position]:
+                distances[position] = best
+                heapq.heappush(heap, (best, position))
+        while heap:
+            distance, position = heapq.heappop(heap)
+            if distance != distances[position]:
+                continue
+            for neighbour in neighbours[position]:
+                if open_[neighbour] and distances[neighbour] > distance + 1:
+                    distances[neighbour] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbour))
+
+    def _flood(self, start: int, tail_positions: Set[int], neck_positions: Set[int], enough: int, delay: int = 0) -> Tuple[bool, int]:
+        """
+        Flood fill the open positions from start, counting the positions over the tail as open and the ones over the neck as closed.
+
+        Parameters:
+            neck_positions (Set[int]): The positions over the cells the head leaves, which the body covers once it moves.
+            delay (int): The number of ticks the tail stays put because the body is still growing. The fill only counts
+                         as reaching the tail if it gets there after that many steps.
+
+        Returns:
+            Tuple[bool, int]: Whether the fill reached the tail or found enough positions, and the number of positions it found.
+        """
+        open_, neighbours = self.open, self.neighbours
+        seen = {start}
+        level = [start]
+        steps = 0
+        while level:
+            steps += 1
+            next_level = []
+            for position in level:
+                for neighbour in neighbours[position]:
+                    if neighbour in seen or neighbour in neck_positions:
+                        continue
+                    if neighbour in tail_positions:
+                        if steps > delay:
+                            return (True, len(seen))
+                    elif open_[neighbour]:
+                        seen.add(neighbour)
+                        next_level.append(neighbour)
+                if len(seen) >= enough:
+                    return (True, len(seen))
+            level = next_level
+        return (False, len(seen))
+
+    def _tail_positions(self, tail_cells: Set[int]) -> Set[int]:
+        """Get the head positions that overlap the tail and would be open without it."""
+        grid = self.simulation.collision_grid
+        return set(position for position in self._positions_over(tail_cells)
+                   if not any(grid.walls[cell] or (grid.counts[cell] and cell not in tail_cells) for cell in self.position_cells[position]))
+
+    def __call__(self, simulation: Simulation) -> Optional[str]:
+        """Get the direction to turn to before the next tick, or None to keep going."""
+        if simulation is not self.simulation:
+            self.attach(simulation)
+        grid = simulation.collision_grid
+        if grid.fruit_rect != self.fruit_rect or simulation.ticks != self.last_tick:
+            self.reset() # The fruit moved, or the game was restarted or restored
+        else:
+            self.update()
+        self.last_tick = simulation.ticks + 1
+
+        snake = simulation.snake
+        head = grid.cells_of(snake.head.rect)[0]
+        body = snake.body
+        moves = [direction for direction in self.steps
+                 if not (body.pieces and direction == OPPOSITES[snake.direction])
+                 and head + self.steps[direction] in self.neighbours[head] and self.open[head + self.steps[direction]]]
+        if not moves:
+            return None
+
+        tail_cells = set(grid.cells_of(body.pieces[-1].rect)) if body.pieces else set()
+        tail_positions = self._tail_positions(tail_cells)
+        head_cells = set(grid.cells_of(snake.head.rect))
+        enough = len(body) + 1
+        delay = body.no_pieces - len(body)
+        floods = {}
+
+        def flood(direction: str) -> Tuple[bool, int]:
+            # Only flood the moves that are considered, since the first safe step towards the fruit is usually taken.
+            if direction not in floods:
+                if body.pieces:
+                    start = head + self.steps[direction]
+                    neck_positions = self._positions_over(head_cells.difference(self.position_cells[start]))
+                    floods[direction] = self._flood(start, tail_positions, neck_positions, enough, delay)
+                else:
+                    floods[direction] = (True, enough)
+            return floods[direction]
+
+        towards_fruit = sorted((self.distances[head + self.steps[direction]], direction != snake.direction, direction)
+                               for direction in moves if self.distances[head + self.steps[direction]] != INFINITY)
+        choice = next((direction for _, _, direction in towards_fruit if flood(direction)[0]), None)
+        if choice is None:
+            safe = [direction for direction in moves if flood(direction)[0]]
+            if safe and tail_cells:
+                tail_row, tail_col = divmod(min(tail_cells), self.columns)
+
+                def tail_distance(direction: str) -> int:
+                    row, col = divmod(head + self.steps[direction], self.columns)
+                    return abs(row - tail_row) + abs(col - tail_col)
+                choice = min(safe, key=tail_distance)
+            else:
+                choice = max(moves, key=lambda direction: flood(direction)[1])
+        return choice if choice != snake.direction or not snake.head.moving else None
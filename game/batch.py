@@ -0,0 +1,214 @@
+import numpy as np
+from typing import Tuple
+
+from .simulation import Simulation
+from .gameover import GameOver
+
+
+class BatchSimulation:
+    """
+    - Runs many independent snake games in lockstep. The state of every game is held in NumPy arrays and all of
+      them are advanced together by a single vectorized step() call.
+    - The rules are the ones of Simulation: the head moves one cell per tick, a piece is pushed right behind the head and
+      the tail is dropped unless the body is still growing, running into the body or a wall ends the game and eating the
+      fruit grows the body by extend_by pieces.
+    - The board geometry (cell size, walls, starting position, head, piece and fruit sizes) is taken from a headless
+      Simulation, so both always play on the same board.
+    - Games that end are reset automatically at the end of the step they ended on.
+
+    #### Layout:
+    - Positions are flat cell indices (row * columns + col) on the collision grid of the Simulation.
+    - Directions and actions are indices into DIRECTIONS ('u', 'd', 'l', 'r'). Any other action keeps the current direction.
+    - The body of each game is a ring buffer of pieces (position of the top-left cell and direction), starting at starts
+      with lengths pieces, ordered from the piece right behind the head to the tail.
+    - occupancy counts the body pieces covering every cell of every game.
+    """
+
+    DIRECTIONS = "udlr"
+    REASONS = ("", GameOver.SELF_COLLISION_REASON, GameOver.BOUNDARY_REASON)
+
+    def __init__(self,
+                 num_games: int,
+                 size: Tuple[int, int] = (1150, 760),
+                 seed: int = None,
+                 ) -> None:
+        """
+        Parameters:
+            num_games (int): The number of games to run in lockstep.
+            size (Tuple[int, int]): The width and height of the playing area, boundary included. (default: (1150, 760))
+            seed (int): The seed for the random number generator that places the fruits. (default: None)
+        """
+        template = Simulation(size=size)
+        grid = template.collision_grid
+        snake = template.snake
+        cell = grid.cell_size
+
+        self.num_games = num_games
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+
+        self.cell_size: int = cell
+        self.origin: Tuple[int, int] = (grid.x, grid.y)
+        self.columns: int = grid.columns
+        self.rows: int = grid.rows
+        self.walls: np.ndarray = np.frombuffer(bytes(grid.walls), dtype=np.uint8).astype(bool)
+        self.extend_by: int = snake.body.extend_by
+
+        columns = self.columns
+        head_columns = -(-snake.head.rect.width // cell)
+        head_rows = -(-snake.head.rect.height // cell)
+        piece_span = -(-snake.body.piece_height // cell)
+        self.fruit_columns: int = grid.spot_columns
+        self.fruit_rows: int = grid.spot_rows
+        self.start: int = grid.cells_of(snake.head.rect)[0]
+        self.start_direction: int = self.DIRECTIONS.index(snake.direction)
+        # Anything at or above this row is off the board, which is where fruits go when there is no room left.
+        self.off_board: int = -(self.fruit_rows + head_rows) * columns
+
+        # Lookup tables indexed by direction
+        self.velocities = np.array([-columns, columns, -1, 1])
+        self.opposites = np.array([1, 0, 3, 2])
+        # Offset of the piece placed right behind the head (see SnakePiece.behind)
+        self.behind = np.array([head_rows * columns, -columns, head_columns, -1])
+        # Cells covered by a piece; pieces lie across the direction they travel in.
+        side_by_side = np.arange(piece_span)
+        stacked = np.arange(piece_span) * columns
+        self.piece_cells = np.array([side_by_side, side_by_side, stacked, stacked])
+        self.head_cells = np.array([row * columns + col for row in range(head_rows) for col in range(head_columns)])
+        self.head_columns = head_columns
+        self.head_rows = head_rows
+
+        # A body can't have more pieces than the board has cells.
+        self.capacity: int = self.columns * self.rows
+
+        games = num_games
+        self.heads = np.zeros(games, dtype=np.int64)
+        self.directions = np.zeros(games, dtype=np.int64)
+        self.positions = np.zeros((games, self.capacity), dtype=np.int32)
+        self.piece_directions = np.zeros((games, self.capacity), dtype=np.int8)
+        self.starts = np.zeros(games, dtype=np.int64)
+        self.lengths = np.zeros(games, dtype=np.int64)
+        self.no_pieces = np.zeros(games, dtype=np.int64)
+        self.occupancy = np.zeros((games, self.capacity), dtype=np.uint16)
+        self.fruits = np.zeros(games, dtype=np.int64)
+        self.scores = np.zeros(games, dtype=np.int64)
+        self.ticks = np.zeros(games, dtype=np.int64)
+
+        # Outcome of the last game played in each slot, kept across the automatic resets.
+        self.final_scores = np.zeros(games, dtype=np.int64)
+        self.final_ticks = np.zeros(games, dtype=np.int64)
+        self.reasons = np.zeros(games, dtype=np.int8)
+
+        self.reset()
+
+    def reset(self, games: np.ndarray = None) -> None:
+        """
+        Reset games to their starting state and place a new fruit on each of them.
+
+        Parameters:
+            games (np.ndarray): The indices of the games to reset. (default: every game)
+        """
+        if games is None:
+            games = np.arange(self.num_games)
+        self.heads[games] = self.start
+        self.directions[games] = self.start_direction
+        self.starts[games] = 0
+        self.lengths[games] = 0
+        self.no_pieces[games] = 0
+        self.occupancy[games] = 0
+        self.scores[games] = 0
+        self.ticks[games] = 0
+        self.change_fruit_pos(games)
+
+    def change_fruit_pos(self, games: np.ndarray) -> None:
+        """
+        Move the fruit of the given games to a random spot that is free of walls, the body and the head.
+
+        If the snake has filled the whole board, the fruit is moved off the board.
+        """
+        if len(games) == 0:
+            return
+        rows, columns = self.rows, self.columns
+        blocked = (self.occupancy[games] > 0) | self.walls
+        blocked[np.arange(len(games))[:, None], self.heads[games][:, None] + self.head_cells] = True
+        free = ~blocked.reshape(len(games), rows, columns)
+
+        spot_rows = rows - self.fruit_rows + 1
+        spot_columns = columns - self.fruit_columns + 1
+        spots = np.ones((len(games), spot_rows, spot_columns), dtype=bool)
+        for row in range(self.fruit_rows):
+            for col in range(self.fruit_columns):
+                spots &= free[:, row:row + spot_rows, col:col + spot_columns]
+
+        # Picking the free spot with the highest random key samples the free spots uniformly.
+        keys = self.rng.random(spots.shape)
+        keys[~spots] = -1
+        keys = keys.reshape(len(games), -1)
+        picks = keys.argmax(axis=1)
+        pick_rows, pick_columns = np.divmod(picks, spot_columns)
+        fruits = pick_rows * columns + pick_columns
+        fruits[keys[np.arange(len(games)), picks] < 0] = self.off_board
+        self.fruits[games] = fruits
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advance every game by one tick.
+
+        Parameters:
+            actions (np.ndarray): The direction to turn to for each game, as an index into DIRECTIONS. Anything else keeps going.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Whether each snake ate its fruit this tick and whether each game ended.
+            Games that ended have already been reset; their score is kept in final_scores and the reason in reasons.
+        """
+        actions = np.asarray(actions)
+        games = np.arange(self.num_games)
+
+        # Turn, unless the snake would reverse into its own body
+        valid = (actions >= 0) & (actions < 4)
+        actions = np.where(valid, actions, self.directions)
+        accepted = (actions != self.opposites[self.directions]) | (self.lengths == 0)
+        self.directions = np.where(accepted, actions, self.directions)
+
+        # Move the head, push a piece right behind it and drop the tail unless the body is growing
+        self.heads += self.velocities[self.directions]
+        self.ticks += 1
+        growing = self.lengths < self.no_pieces
+        pushing = np.nonzero(growing | (self.lengths > 0))[0]
+        popping = np.nonzero(~growing & (self.lengths > 0))[0]
+
+        tails = (self.starts[popping] + self.lengths[popping] - 1) % self.capacity
+        tail_cells = self.positions[popping, tails][:, None] + self.piece_cells[self.piece_directions[popping, tails]]
+        self.occupancy[popping[:, None], tail_cells] -= 1
+
+        fronts = (self.starts[pushing] - 1) % self.capacity
+        directions = self.directions[pushing]
+        positions = self.heads[pushing] + self.behind[directions]
+        self.positions[pushing, fronts] = positions
+        self.piece_directions[pushing, fronts] = directions
+        self.occupancy[pushing[:, None], positions[:, None] + self.piece_cells[directions]] += 1
+        self.starts[pushing] = fronts
+        self.lengths += growing
+
+        # Game over, checked for the head only (see GameOver.check_game_over)
+        head_cells = self.heads[:, None] + self.head_cells
+        bumped = (self.occupancy[games[:, None], head_cells] > 0).any(axis=1)
+        out = self.walls[head_cells].any(axis=1)
+        done = bumped | out
+
+        # Eat the fruit if the head overlaps it
+        head_rows, head_columns = np.divmod(self.heads, self.columns)
+        fruit_rows, fruit_columns = np.divmod(self.fruits, self.columns)
+        scored = ((fruit_columns > head_columns - self.fruit_columns) & (fruit_columns < head_columns + self.head_columns)
+                  & (fruit_rows > head_rows - self.fruit_rows) & (fruit_rows < head_rows + self.head_rows))
+        self.scores += scored
+        self.no_pieces += scored * self.extend_by
+        self.change_fruit_pos(np.nonzero(scored & ~done)[0])
+
+        ended = np.nonzero(done)[0]
+        if len(ended):
+            self.final_scores[ended] = self.scores[ended]
+            self.final_ticks[ended] = self.ticks[ended]
+            self.reasons[ended] = np.where(bumped[ended], 1, 2)
+            self.reset(ended)
+        return (scored, done)
@@ -1,4 +1,5 @@
 import pygame
+from typing import Tuple
 
 class Boundary:
     """
@@ -9,19 +10,22 @@ class Boundary:
     bottom, left, right lines, as well as the separators for displaying game statistics.
     """
     def __init__(self, 
-                 display: pygame.Surface,
+                 display: pygame.Surface = None,
                  color: str = "red",
                  thickness: int = 8,
                  stats_sep_y_offset = 65,
+                 size: Tuple[int, int] = None,
                  ) -> None:
         """
         Parameters:
-            - display (pygame.Surface): The display surface to render the boundary on.
+            - display (pygame.Surface): The display surface to render the boundary on. Can be None when nothing is rendered.
             - color (str): The color of the boundary lines. (default: "red")
             - thickness (int): The thickness of the boundary lines. (default: 8)
             - stats_sep_y_offset (int): The y-offset for the stats separator line. (default: 65)
+            - size (Tuple[int, int]): The width and height of the area enclosed by the boundary. (default: the size of the display)
         """
         self.display = display
+        self.size: Tuple[int, int] = size if size is not None else display.get_size()
         
         self.color = color
         self.thickness = thickness
@@ -39,9 +43,8 @@ class Boundary:
         self.update_rects()
         
     def update_rects(self) -> None:
-        """Update the boundary and stat Rects based on the display size."""
-        display_width = self.display.get_width()
-        display_height = self.display.get_height()
+        """Update the boundary and stat Rects based on the size of the enclosed area."""
+        display_width, display_height = self.size
         
         highscore_separator_x = int(display_width / 4)
         score_separator_x = display_width - highscore_separator_x
@@ -0,0 +1,176 @@
+import pygame
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from sprites.snake.snake_body import SnakeBody
+from sprites.snake.snake_piece import SnakePiece
+from sprites.fruit import Fruit
+
+Item = Union[SnakePiece, Fruit]
+
+
+class Camera:
+    """
+    The part of a world larger than the display that is shown on it, kept centred on a target such as the snake's head.
+
+    - rect is the area of the world in view, in world coordinates. It never leaves the world, so the edges of the world
+      stop the camera instead of scrolling into the void.
+    - World positions are turned into display positions by subtracting the top-left corner of rect and adding the
+      position of the viewport on the display (see to_screen()).
+    """
+
+    def __init__(self, viewport: pygame.Rect, world_size: Tuple[int, int]) -> None:
+        """
+        Parameters:
+            viewport (pygame.Rect): The area of the display the world is drawn in.
+            world_size (Tuple[int, int]): The width and height of the world.
+        """
+        self.viewport = pygame.Rect(viewport)
+        self.world_size = world_size
+        self.rect = pygame.Rect((0, 0), self.viewport.size)
+
+    def follow(self, center: Tuple[int, int]) -> None:
+        """Centre the view on a point of the world, as far as the edges of the world allow."""
+        self.rect.center = center
+        world_width, world_height = self.world_size
+        # A world smaller than the view is centred in it instead.
+        self.rect.x = min(max(self.rect.x, 0), world_width - self.rect.width) if world_width > self.rect.width else (world_width - self.rect.width) // 2
+        self.rect.y = min(max(self.rect.y, 0), world_height - self.rect.height) if world_height > self.rect.height else (world_height - self.rect.height) // 2
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Get what is added to a world position to get its display position."""
+        return (self.viewport.x - self.rect.x, self.viewport.y - self.rect.y)
+
+    def to_screen(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        """Turn a world position into a display position."""
+        dx, dy = self.offset
+        return (position[0] + dx, position[1] + dy)
+
+    def visible(self, rect: pygame.Rect) -> bool:
+        """Check if any part of a Rect of the world is in view."""
+        return bool(self.rect.colliderect(rect))
+
+
+class ChunkIndex:
+    """
+    A spatial index of the pieces of snake bodies, splitting the world into square chunks, so that the pieces in view
+    can be found without looking at the rest of the body. Anything else with a rect can be indexed too, such as the
+    fruits of an Arena (see nearest()).
+
+    - Every piece is filed under the chunk its top-left corner lies in. A query looks at the chunks overlapping the area
+      it's given, widened by the largest piece size so that pieces reaching in from a neighbouring chunk are found too.
+    - The index follows a SnakeBody through its on_piece_added and on_piece_removed callbacks (see track()), so a tick costs
+      one removal and one insertion whatever the length of the snake, and a query costs as much as the pieces in view.
+    - SnakeBody.restore() (used for snapshots) doesn't call the callbacks, so call rebuild() after restoring.
+    """
+
+    def __init__(self, chunk_size: int = 256, margin: int = 32) -> None:
+        """
+        Parameters:
+            chunk_size (int): The width and height of a chunk. (default: 256)
+            margin (int): The width or height of the largest piece indexed. (default: 32)
+        """
+        self.chunk_size = chunk_size
+        self.margin = margin
+        # Dicts keep the pieces of a chunk in the order they were added and remove them in constant time.
+        self.chunks: Dict[Tuple[int, int], Dict[Item, None]] = {}
+        self.locations: Dict[Item, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Get the number of pieces in the index."""
+        return len(self.locations)
+
+    def track(self, body: SnakeBody) -> None:
+        """Keep the index up to date with a SnakeBody, on top of whatever its callbacks already did."""
+        added, removed = body.on_piece_added, body.on_piece_removed
+
+        def on_piece_added(piece: SnakePiece) -> None:
+            if added is not None:
+                added(piece)
+            self.add(piece)
+
+        def on_piece_removed(piece: SnakePiece) -> None:
+            if removed is not None:
+                removed(piece)
+            self.remove(piece)
+
+        body.on_piece_added = on_piece_added
+        body.on_piece_removed = on_piece_removed
+        self.rebuild(body.pieces)
+
+    def chunk_of(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        """Get the chunk a point of the world lies in."""
+        return (position[0] // self.chunk_size, position[1] // self.chunk_size)
+
+    def add(self, piece: Item) -> None:
+        """File a piece under the chunk of its current position."""
+        chunk = self.chunk_of(piece.rect.topleft)
+        self.chunks.setdefault(chunk, {})[piece] = None
+        self.locations[piece] = chunk
+
+    def remove(self, piece: Item) -> None:
+        """Take a piece out of the index. Does nothing if it isn't in it."""
+        chunk = self.locations.pop(piece, None)
+        if chunk is None:
+            return
+        pieces = self.chunks[chunk]
+        del pieces[piece]
+        if not pieces:
+            del self.chunks[chunk]
+
+    def rebuild(self, pieces: Iterable[Item]) -> None:
+        """Empty the index and add the pieces at their current positions."""
+        self.chunks.clear()
+        self.locations.clear()
+        for piece in pieces:
+            self.add(piece)
+
+    def query(self, rect: pygame.Rect) -> List[Item]:
+        """Get the pieces that may overlap a Rect: every one that does, and a few from around its edges."""
+        first_x, first_y = self.chunk_of((rect.left - self.margin, rect.top - self.margin))
+        last_x, last_y = self.chunk_of((rect.right - 1, rect.bottom - 1))
+        chunks = self.chunks
+        found = []
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                pieces = chunks.get((chunk_x, chunk_y))
+                if pieces:
+                    found.extend(pieces)
+        return found
+
+    def nearest(self, position: Tuple[int, int], key: Callable[[Item], int] = None) -> Optional[Item]:
+        """
+        Get the item whose top-left corner is nearest to a point, by the sum of the horizontal and vertical distances,
+        or None if the index is empty.
+
+        The chunks are searched in growing squares around the point and the search stops as soon as the next square
+        can't hold anything nearer, so it costs as much as the items around the point rather than all of them.
+        A handful of items are simply compared one by one.
+
+        Parameters:
+            position (Tuple[int, int]): The point to search from.
+            key (Callable[[Item], int]): Ranks items at the same distance, the lowest first. (default: any of them)
+        """
+        if not self.locations:
+            return None
+        x, y = position
+        if len(self.locations) <= 16:
+            # Few items may be spread over many empty chunks, so looking at each is quicker.
+            return min(self.locations, key=lambda item: (abs(item.rect.x - x) + abs(item.rect.y - y), key(item) if key is not None else 0))
+        center_x, center_y = self.chunk_of(position)
+        chunks, size = self.chunks, self.chunk_size
+        # How far the point is from the nearest edge of its chunk. Everything in the ring of chunks `ring` chunks away
+        # lies outside the square of the rings before it, at least this much plus (ring - 1) chunks away from the point.
+        inner = min(x - center_x * size, (center_x + 1) * size - x, y - center_y * size, (center_y + 1) * size - y)
+        best, best_rank = None, None
+        ring = 0
+        while best is None or ring == 0 or inner + (ring - 1) * size <= best_rank[0]:
+            for chunk_y in range(center_y - ring, center_y + ring + 1):
+                edge = chunk_y in (center_y - ring, center_y + ring)
+                for chunk_x in (range(center_x - ring, center_x + ring + 1) if edge else (center_x - ring, center_x + ring)):
+                    for item in chunks.get((chunk_x, chunk_y), ()):
+                        rank = (abs(item.rect.x - x) + abs(item.rect.y - y), key(item) if key is not None else 0)
+                        if best is None or rank < best_rank:
+                            best, best_rank = item, rank
+            ring += 1
+        return best
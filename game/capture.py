@@ -0,0 +1,236 @@
+import zlib
+import queue
+import struct
+import threading
+import numpy as np
+import pygame
+from typing import BinaryIO, Dict, Iterator, Tuple
+
+MAGIC = b"SNKV"
+VERSION = 1
+# Magic, version, width, height, pitch, bytes per pixel, the red, green, blue and alpha masks and the frame rate
+HEADER = struct.Struct("<4sBHHIBIIIIf")
+# Frame number, flags and the length of the compressed data that follows
+FRAME_HEADER = struct.Struct("<IBI")
+KEYFRAME = 1
+
+
+class FrameRecorder:
+    """
+    Records the frames shown on a surface (usually the display) into a lossless frame stream on disk, without stalling the game loop.
+
+    - Frames are copied into a fixed pool of surfaces with the display's pixel format, so capturing a frame is one blit
+      (a plain memory copy) and nothing is allocated or converted per frame. The display itself can't be handed over
+      without that copy, since the game draws the next frame into it right away.
+    - Captured frames go through a bounded queue to a background thread, which reads their pixels through buffer views,
+      stores how each one differs from the previous frame (a XOR, mostly zeros for a game like this) and compresses it with zlib.
+      NumPy and zlib release the GIL on buffers this large, so the work mostly runs alongside the game.
+    - If the writer falls behind and the queue is full, capture() drops the frame instead of waiting, and counts it in dropped.
+      Frame numbers are stored with every frame, so gaps show up when the stream is read back.
+    - Every keyframe_interval frames, a frame is stored whole, so a damaged stream can be read again from the next keyframe.
+    - Call close() when done, which writes out the frames still queued.
+
+    See read_frames() for reading a stream back, and export_capture.py for turning it into images or video.
+    """
+
+    def __init__(self,
+                 path: str,
+                 surface: pygame.Surface,
+                 fps: float = 60,
+                 max_queue: int = 8,
+                 compression: int = 1,
+                 keyframe_interval: int = 600,
+                 ) -> None:
+        """
+        Parameters:
+            path (str): The file to write the frame stream to.
+            surface (pygame.Surface): The surface to capture, which must keep its size.
+            fps (float): The frame rate stored in the stream, for playing it back. (default: 60)
+            max_queue (int): The number of captured frames that can wait for the writer before new ones are dropped. (default: 8)
+            compression (int): The zlib compression level, from 0 (none, fastest) to 9. (default: 1)
+            keyframe_interval (int): The number of frames between frames stored whole. (default: 600)
+        """
+        self.path = path
+        self.surface = surface
+        self.fps = fps
+        self.compression = compression
+        self.keyframe_interval = keyframe_interval
+
+        self.frames: int = 0
+        self.dropped: int = 0
+        self.bytes_written: int = 0
+        self.error: OSError = None
+
+        # Surfaces the frames are copied into: max_queue waiting, one being encoded and one kept as the previous frame.
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(max_queue + 2):
+            self._free.put(pygame.Surface(surface.get_size(), 0, surface))
+        self._queue: queue.Queue = queue.Queue(self._free.qsize())
+
+        self._file: BinaryIO = open(path, "wb")
+        sample = self._free.queue[0]
+        self._file.write(HEADER.pack(MAGIC, VERSION, *sample.get_size(), sample.get_pitch(), sample.get_bytesize(), *sample.get_masks(), fps))
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def capture(self) -> bool:
+        """
+        Capture what the surface shows right now. Call it after every frame is drawn. Never waits for the writer.
+
+        Returns:
+            bool: Whether the frame was captured, as opposed to dropped because the writer is behind.
+        """
+        number = self.frames + self.dropped
+        try:
+            frame = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        frame.blit(self.surface, (0, 0))
+        self._queue.put_nowait((number, frame)) # Never full, since it has room for every surface
+        self.frames += 1
+        return True
+
+    def close(self) -> None:
+        """Write out the frames still queued, then close the file."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+
+    def _run(self) -> None:
+        """Encode and write queued frames until close() is called."""
+        previous: pygame.Surface = None
+        delta: np.ndarray = None
+        written = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            number, frame = item
+            view = frame.get_view('0')
+            pixels = np.frombuffer(view, dtype=np.uint8)
+            if previous is None or written % self.keyframe_interval == 0:
+                flags, data = KEYFRAME, zlib.compress(pixels, self.compression)
+            else:
+                if delta is None:
+                    delta = np.empty_like(pixels)
+                previous_view = previous.get_view('0')
+                np.bitwise_xor(pixels, np.frombuffer(previous_view, dtype=np.uint8), out=delta)
+                del previous_view
+                flags, data = 0, zlib.compress(delta, self.compression)
+            del pixels, view # Unlocks the frame
+
+            if self.error is None:
+                try:
+                    self._file.write(FRAME_HEADER.pack(number, flags, len(data)))
+                    self._file.write(data)
+                    self.bytes_written += FRAME_HEADER.size + len(data)
+                except OSError as e: # Keep draining the queue, so the game isn't left without free surfaces
+                    self.error = e
+            written += 1
+            if previous is not None:
+                self._free.put(previous)
+            previous = frame
+
+
+def read_header(file: BinaryIO) -> Dict:
+    """
+    Read the header of a frame stream written by FrameRecorder.
+
+    Raises:
+        ValueError: If the file isn't a frame stream of a supported version.
+    """
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a frame stream: the header is truncated")
+    magic, version, width, height, pitch, bytesize, *masks, fps = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a frame stream")
+    if version != VERSION:
+        raise ValueError(f"Unsupported frame stream version {version}")
+    return {'size': (width, height), 'pitch': pitch, 'bytesize': bytesize, 'masks': tuple(masks), 'fps': fps}
+
+
+def read_frames(path: str) -> Tuple[Dict, Iterator[Tuple[int, bytes]]]:
+    """
+    Read a frame stream written by FrameRecorder.
+
+    Frames before the first keyframe of a damaged stream are skipped, and reading stops at a truncated frame,
+    such as the last one of a recording that was cut off.
+
+    Returns:
+        Tuple[Dict, Iterator[Tuple[int, bytes]]]: The header (see read_header()) and an iterator over the frames as
+                                                  (frame number, pixels), with rows pitch bytes apart.
+    """
+    file = open(path, "rb")
+    try:
+        header = read_header(file)
+    except ValueError:
+        file.close()
+        raise
+
+    def frames() -> Iterator[Tuple[int, bytes]]:
+        with file:
+            previous: np.ndarray = None
+            while True:
+                data = file.read(FRAME_HEADER.size)
+                if len(data) < FRAME_HEADER.size:
+                    return
+                number, flags, length = FRAME_HEADER.unpack(data)
+                data = file.read(length)
+                if len(data) < length:
+                    return
+                try:
+                    pixels = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+                except zlib.error:
+                    previous = None # Wait for the next keyframe
+                    continue
+                if not flags & KEYFRAME:
+                    if previous is None or len(previous) != len(pixels):
+                        continue
+                    pixels = np.bitwise_xor(pixels, previous)
+                previous = pixels
+                yield (number, pixels.tobytes())
+
+    return (header, frames())
+
+
+def frame_surface(header: Dict, pixels: bytes) -> pygame.Surface:
+    """Make a surface with the pixel format of the stream out of the pixels of a frame read by read_frames()."""
+    surface = pygame.Surface(header['size'], 0, header['bytesize'] * 8, header['masks'])
+    if surface.get_pitch() == header['pitch']:
+        surface.get_buffer().write(pixels)
+    else:
+        width = header['size'][0] * header['bytesize']
+        buffer = surface.get_buffer()
+        for row in range(header['size'][1]):
+            start = row * header['pitch']
+            buffer.write(pixels[start:start + width], row * surface.get_pitch())
+    return surface
+
+
+def pixel_format(header: Dict) -> str:
+    """
+    Get the order of the bytes of a pixel in the stream, in the naming ffmpeg uses for raw video ("bgra", "rgb0"...).
+
+    Raises:
+        ValueError: If the pixels aren't one byte per channel.
+    """
+    if header['bytesize'] not in (3, 4):
+        raise ValueError(f"Unsupported pixel size of {header['bytesize']} bytes")
+    names = []
+    for byte in range(header['bytesize']):
+        mask = 0xFF << (8 * byte)
+        for channel, channel_mask in zip("rgba", header['masks']):
+            if channel_mask == mask:
+                names.append(channel)
+                break
+        else:
+            if any(channel_mask & mask for channel_mask in header['masks']):
+                raise ValueError("Unsupported pixel format")
+            names.append("0")
+    return "".join(names)
+
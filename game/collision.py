@@ -0,0 +1,210 @@
+import pygame
+import random
+from array import array
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .boundary import Boundary
+from .free_cells import FreeCellIndex
+
+
+class CollisionGrid:
+    """
+    An occupancy grid over the playing area, used to check collisions in constant time.
+
+    - The area is split into square cells as wide as the snake's movement step and aligned with the snake's starting position,
+      so every snake piece and the head cover whole cells.
+    - The state of the grid is kept in flat arrays of machine integers, which can be copied at once (see Simulation.snapshot).
+    - Each cell keeps a count of the snake pieces covering it. The counts are updated incrementally as pieces enter and leave cells,
+      so nothing has to scan the body.
+    - Cells overlapping a boundary line or the stats bar below the playing field, and everything outside the grid, count as walls.
+    - The grid also keeps an index of the free spots, the grid-aligned positions where an object the size of the fruit fits
+      without touching a wall or the snake. Every spot counts the blocked cells under it, so a cell changing state only
+      updates the handful of spots that cover it. The spot sampled depends only on which spots are free (see FreeCellIndex).
+    - on_cell_changed is called with a cell whenever it becomes occupied or free, for anything that keeps its own
+      view of the grid up to date incrementally (see Autopilot).
+    """
+
+    def __init__(self,
+                 boundary: Boundary,
+                 cell_size: int,
+                 origin: Tuple[int, int] = (0, 0),
+                 spot_size: Tuple[int, int] = None,
+                 ) -> None:
+        """
+        Parameters:
+            boundary (Boundary): The Boundary object. Its size is covered by the grid and its lines and stats bar are marked as walls.
+            cell_size (int): The width and height of each cell, which should match the snake's movement step.
+            origin (Tuple[int, int]): Any point on the corner of a cell, such as the snake's starting position. (default: (0, 0))
+            spot_size (Tuple[int, int]): The size of the object placed on free spots, such as the fruit. (default: one cell)
+        """
+        self.cell_size = cell_size
+
+        # Shift the grid so that it is aligned with the origin and still covers the top-left corner of the area.
+        self.x: int = origin[0] % cell_size - cell_size
+        self.y: int = origin[1] % cell_size - cell_size
+
+        width, height = boundary.size
+        self.columns: int = -(-(width - self.x) // cell_size)
+        self.rows: int = -(-(height - self.y) // cell_size)
+
+        self.counts: array = array('H', [0]) * (self.columns * self.rows)
+        self.walls: bytearray = bytearray(self.columns * self.rows)
+
+        self.fruit_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self.on_cell_changed: Callable[[int], None] = None
+
+        if spot_size is None:
+            spot_size = (cell_size, cell_size)
+        self.spot_columns: int = -(-spot_size[0] // cell_size)
+        self.spot_rows: int = -(-spot_size[1] // cell_size)
+
+        # Spots are indexed by their top-left cell. The ones that don't fit inside the grid start with
+        # a blocked cell that never goes away, so they are never considered free.
+        self.blocked: bytearray = bytearray(b'\x01') * (self.columns * self.rows)
+        self.free_spots: FreeCellIndex = FreeCellIndex(self.columns * self.rows)
+        last_col = self.columns - self.spot_columns
+        for row in range(self.rows - self.spot_rows + 1):
+            first = row * self.columns
+            self.blocked[first:first + last_col + 1] = bytes(last_col + 1)
+            self.free_spots.insert_all(range(first, first + last_col + 1))
+        self._open: Tuple[bytes, Tuple[bytes, bytes]] = (bytes(self.blocked), self.free_spots.getstate()) # The spots before any walls
+        self._empty: Tuple[bytes, Tuple[bytes, bytes]] = None # The spots with the walls alone, see clear()
+
+        stats_bar = pygame.Rect(0, boundary.stats_separator.top, width, height - boundary.stats_separator.top)
+        self.mark_walls([boundary.top_line,
+                         boundary.bottom_line,
+                         boundary.left_line,
+                         boundary.right_line,
+                         stats_bar])
+
+    def cells_of(self, rect: pygame.Rect) -> List[int]:
+        """
+        Get the indices of the cells a Rect overlaps.
+
+        Cells that fall outside the grid are given as -1.
+        """
+        size = self.cell_size
+        first_col = (rect.left - self.x) // size
+        last_col = (rect.right - 1 - self.x) // size
+        first_row = (rect.top - self.y) // size
+        last_row = (rect.bottom - 1 - self.y) // size
+        columns = self.columns
+        if first_col >= 0 and first_row >= 0 and last_col < columns and last_row < self.rows:
+            return [row * columns + col for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)]
+
+        cells = []
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                inside = 0 <= col < self.columns and 0 <= row < self.rows
+                cells.append(row * self.columns + col if inside else -1)
+        return cells
+
+    def mark_walls(self, rects: Iterable[pygame.Rect]) -> None:
+        """Mark every cell overlapping any of the Rects as a wall."""
+        self._empty = None
+        for rect in rects:
+            for cell in self.cells_of(rect):
+                if cell != -1 and not self.walls[cell]:
+                    self.walls[cell] = 1
+                    if not self.counts[cell]:
+                        self._block(cell)
+
+    def clear(self) -> None:
+        """
+        Take everything but the walls off the grid, as if every Rect added had been removed, without calling on_cell_changed.
+
+        The arrays are overwritten in place, so views of them (see Observation) stay valid. The spots of an empty grid
+        are worked out once and copied from then on, so this costs about as much as copying the arrays.
+        """
+        memoryview(self.counts).cast('B')[:] = bytes(len(self.counts) * self.counts.itemsize)
+        if self._empty is None:
+            self.blocked[:] = self._open[0]
+            self.free_spots.setstate(self._open[1])
+            for cell, wall in enumerate(self.walls):
+                if wall:
+                    self._block(cell)
+            self._empty = (bytes(self.blocked), self.free_spots.getstate())
+        else:
+            self.blocked[:] = self._empty[0]
+            self.free_spots.setstate(self._empty[1])
+
+    def _spots_covering(self, cell: int) -> List[int]:
+        """Get the spots that would cover a cell."""
+        columns = self.columns
+        row, col = divmod(cell, columns)
+        if row >= self.spot_rows - 1 and col >= self.spot_columns - 1:
+            first = cell - (self.spot_rows - 1) * columns - (self.spot_columns - 1)
+            return [first + spot_row * columns + spot_col for spot_row in range(self.spot_rows) for spot_col in range(self.spot_columns)]
+        spots = []
+        for spot_row in range(max(row - self.spot_rows + 1, 0), row + 1):
+            for spot_col in range(max(col - self.spot_columns + 1, 0), col + 1):
+                spots.append(spot_row * self.columns + spot_col)
+        return spots
+
+    def _block(self, cell: int) -> None:
+        """Take the spots covering a cell that just got blocked out of the free spots."""
+        blocked = self.blocked
+        for spot in self._spots_covering(cell):
+            blocked[spot] += 1
+            if blocked[spot] == 1:
+                self.free_spots.remove(spot)
+
+    def _unblock(self, cell: int) -> None:
+        """Put the spots covering a cell that just got released back into the free spots, if nothing else blocks them."""
+        blocked = self.blocked
+        for spot in self._spots_covering(cell):
+            blocked[spot] -= 1
+            if blocked[spot] == 0:
+                self.free_spots.insert(spot)
+
+    def add(self, rect: pygame.Rect) -> None:
+        """Mark the cells covered by a Rect (such as a snake piece) as occupied."""
+        counts = self.counts
+        for cell in self.cells_of(rect):
+            if cell != -1:
+                counts[cell] += 1
+                if counts[cell] == 1:
+                    if not self.walls[cell]:
+                        self._block(cell)
+                    if self.on_cell_changed is not None:
+                        self.on_cell_changed(cell)
+
+    def remove(self, rect: pygame.Rect) -> None:
+        """Release the cells covered by a Rect that was previously added."""
+        counts = self.counts
+        for cell in self.cells_of(rect):
+            if cell != -1:
+                counts[cell] -= 1
+                if counts[cell] == 0:
+                    if not self.walls[cell]:
+                        self._unblock(cell)
+                    if self.on_cell_changed is not None:
+                        self.on_cell_changed(cell)
+
+    def occupied(self, rect: pygame.Rect) -> bool:
+        """Check if any cell covered by the Rect is occupied."""
+        return any(cell != -1 and self.counts[cell] for cell in self.cells_of(rect))
+
+    def hits_wall(self, rect: pygame.Rect) -> bool:
+        """Check if the Rect overlaps a wall or leaves the grid."""
+        return any(cell == -1 or self.walls[cell] for cell in self.cells_of(rect))
+
+    def random_free_spot(self, rng: random.Random = None) -> Optional[Tuple[int, int]]:
+        """
+        Get the top-left coordinates of a random free spot, or None if there is no free spot left.
+
+        Parameters:
+            rng (random.Random): The random number generator to pick the spot with. (default: the random module)
+        """
+        if not self.free_spots:
+            return None
+        row, col = divmod(self.free_spots.sample(rng), self.columns)
+        return (self.x + col * self.cell_size, self.y + row * self.cell_size)
+
+    def set_fruit(self, rect: pygame.Rect) -> None:
+        """Set the Rect of the fruit used by hits_fruit()."""
+        self.fruit_rect = pygame.Rect(rect)
+
+    def hits_fruit(self, rect: pygame.Rect) -> bool:
+        """Check if the Rect (usually the snake's head) overlaps the fruit."""
+        return bool(self.fruit_rect.colliderect(rect))
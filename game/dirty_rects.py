@@ -0,0 +1,63 @@
+import pygame
+from typing import List, Tuple
+
+from .simulation import Simulation
+
+
+class DirtyRects:
+    """
+    Keeps track of the areas of the playing field that changed since the last frame was drawn,
+    so that a renderer can clear and redraw only those areas instead of the whole display.
+
+    - A tick changes very little: the head moves, a new piece appears right behind it, the tail leaves its
+      position and, when the fruit is eaten, the fruit moves.
+    - Anything the areas can't describe, such as the body growing while the snake is stopped, asks for a full redraw instead.
+    """
+
+    def __init__(self, simulation: Simulation) -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation to track.
+        """
+        self.simulation = simulation
+
+        self.rects: List[pygame.Rect] = []
+        self.vacated: List[pygame.Rect] = []
+        self.moves: int = 0
+        self.full_redraw: bool = True
+
+    def step(self, action: str = None) -> Tuple[bool, bool]:
+        """
+        Advance the simulation by one tick (see Simulation.step) and record the areas it changed.
+        """
+        snake, fruit = self.simulation.snake, self.simulation.fruit
+        head_before = snake.head.rect.copy()
+        fruit_before = fruit.rect.copy()
+        tail_before = snake.body.pieces[-1].rect.copy() if snake.body.pieces else None
+        length_before = len(snake.body)
+
+        result = self.simulation.step(action)
+
+        if snake.head.rect != head_before:
+            self.moves += 1
+            self.rects.extend((head_before, snake.head.rect.copy()))
+            if tail_before is not None and len(snake.body) == length_before:
+                self.vacated.append(tail_before)
+                self.rects.append(tail_before)
+        elif len(snake.body) != length_before:
+            self.full_redraw = True
+
+        if fruit.rect != fruit_before:
+            self.rects.extend((fruit_before, fruit.rect.copy()))
+        return result
+
+    def invalidate(self) -> None:
+        """Ask for the whole display to be redrawn on the next frame."""
+        self.full_redraw = True
+
+    def clear(self) -> None:
+        """Forget the recorded areas, once a frame has been drawn."""
+        self.rects = []
+        self.vacated = []
+        self.moves = 0
+        self.full_redraw = False
@@ -0,0 +1,94 @@
+import random
+from array import array
+from typing import Iterable, Tuple
+
+SAMPLE_TRIES = 32
+
+
+class FreeCellIndex:
+    """
+    An unordered set of cell indices that supports inserting, removing and sampling a random cell in constant time.
+
+    - The cells are kept packed in a list, and every cell remembers its position in that list.
+    - Removing a cell moves the last cell of the list into the hole, so nothing ever has to be shifted or searched.
+    - Both are kept in flat arrays of machine integers, so the whole index can be saved and put back at once (see getstate()).
+    - The order of the list depends on the order cells were inserted and removed in, so sampling doesn't use it. A sample
+      draws random cells until it finds one in the index, which takes a few draws while a fair share of the cells are in it,
+      and picks from the cells in ascending order once SAMPLE_TRIES draws have missed. Either way the cell drawn depends only
+      on which cells are in the index and the state of the random number generator, so a seed places the fruit the same
+      way in every game (see Replay) and a game restored from a snapshot draws the same fruit as the original (see Simulation.snapshot).
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Parameters:
+            size (int): The number of cells that can be indexed. Cells are numbered from 0 to size - 1.
+        """
+        self.cells: array = array('i')
+        self.positions: array = array('i', [-1]) * size
+
+    def __len__(self) -> int:
+        """Get the number of cells in the index."""
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        """Check if a cell is in the index."""
+        return self.positions[cell] != -1
+
+    def insert(self, cell: int) -> None:
+        """Add a cell to the index. Does nothing if the cell is already in it."""
+        if self.positions[cell] != -1:
+            return
+        self.positions[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def insert_all(self, cells: Iterable[int]) -> None:
+        """
+        Add many cells to the index at once, in the same order insert() would have added them one by one.
+
+        Much faster than calling insert() in a loop, for filling a new index. The cells must not be in the index yet.
+        """
+        start = len(self.cells)
+        self.cells.extend(cells)
+        positions = self.positions
+        for position in range(start, len(self.cells)):
+            positions[self.cells[position]] = position
+
+    def remove(self, cell: int) -> None:
+        """Remove a cell from the index. Does nothing if the cell isn't in it."""
+        position = self.positions[cell]
+        if position == -1:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[position] = last
+            self.positions[last] = position
+        self.positions[cell] = -1
+
+    def getstate(self) -> Tuple[bytes, bytes]:
+        """Get a copy of the whole index, to be put back with setstate()."""
+        return (self.cells.tobytes(), self.positions.tobytes())
+
+    def setstate(self, state: Tuple[bytes, bytes]) -> None:
+        """Put back an index saved by getstate(), in place, as a plain copy of its arrays."""
+        cells, positions = state
+        del self.cells[:]
+        self.cells.frombytes(cells)
+        memoryview(self.positions).cast('B')[:] = positions
+
+    def sample(self, rng: random.Random = None) -> int:
+        """
+        Get a random cell from the index.
+
+        Raises:
+            IndexError: If the index is empty.
+        """
+        if not self.cells:
+            raise IndexError("Can't sample from an empty FreeCellIndex")
+        rng = rng if rng is not None else random
+        positions = self.positions
+        for _ in range(SAMPLE_TRIES):
+            cell = rng.randrange(len(positions))
+            if positions[cell] != -1:
+                return cell
+        return sorted(self.cells)[rng.randrange(len(self.cells))]
@@ -1,87 +1,178 @@
 import pygame
 import os
-from typing import Tuple, Union, Dict
-import pickle
+from typing import Tuple, Union, Dict, List
 
 from sprites.snake import Snake
+from sprites.snake.snake_piece import SnakePiece
 from sprites.fruit import Fruit
+from sprites.atlas import SpriteAtlas
 from .score import Score
 from .boundary import Boundary
 from .gameover import GameOver
-from .utils import center_of_rect
+from .simulation import Simulation
+from .dirty_rects import DirtyRects
+from .profiler import FrameProfiler
+from .persistence import GameDataStore
+from .replay import ReplayRecorder
+from .leaderboard import Leaderboard
+from .autopilot import Autopilot
+from .assets import AssetBundle
+from .camera import Camera, ChunkIndex
+from .utils import center_of, center_of_rect, render_text
+
+
+AUTOPILOT_PLAYER = "autopilot" # The name games played by the autopilot are recorded on the leaderboard under
+BACKDROP_COLOR = (24, 24, 24) # The grid drawn behind a scrolling world, so that its movement shows
 
 
 class Game:
     """
     - This class puts together all the necessary components to create a fully working snake game.
-    - It manages the game's logic and rendering, such as handling events, updating the score, and rendering game objects on the display surface.
-    - The game loop, however, must be handled somewhere else.
+    - The game's logic lives in a headless Simulation; this class feeds it keyboard events, keeps the scoreboard in sync and renders its state on the display surface.
+    - The game loop, however, must be handled somewhere else. It should call update() once per logic tick and render() once per frame,
+      and pass the Rects returned by render() to pygame.display.update(). See FixedTimestep for running the two at different rates.
     """
     
-    def __init__(self, display: pygame.Surface) -> None:
+    def __init__(self, 
+                 display: pygame.Surface, 
+                 dirty_rendering: bool = False,
+                 background_color: Union[str, Tuple[int, int, int]] = (0, 0, 0),
+                 profiler: FrameProfiler = None,
+                 simulation: Simulation = None,
+                 replay_dir: str = None,
+                 leaderboard: Leaderboard = None,
+                 player: str = "player",
+                 autopilot: bool = False,
+                 assets: AssetBundle = None,
+                 world_size: Tuple[int, int] = None,
+                 ) -> None:
         """
         Parameters:
             display (pygame.Surface): The display surface to render the game on.
+            dirty_rendering (bool): Redraw only the areas that changed since the last frame instead of the whole display. (default: False)
+            background_color (Union[str, Tuple[int, int, int]]): The color the display is cleared with. (default: (0, 0, 0))
+            profiler (FrameProfiler): Times the phases of every tick and frame, and counts draw calls, if given. (default: None)
+            simulation (Simulation): The simulation to render, such as one a replay is played on. It must have been created with the display.
+                                     (default: a new simulation the size of the display)
+            replay_dir (str): The directory to record a replay of every game to, if given (see ReplayRecorder). (default: None)
+            leaderboard (Leaderboard): The leaderboard every finished game is recorded on, if given. (default: None)
+            player (str): The name games are recorded on the leaderboard under. (default: "player")
+            autopilot (bool): Start with the autopilot steering the snake, as a demo. It is toggled with the A key. (default: False)
+            assets (AssetBundle): Where the fonts and images come from. (default: a new AssetBundle)
+            world_size (Tuple[int, int]): The size of the playing area, if it should be larger than the display. The view then scrolls
+                                          with a camera following the head, and only what is in view is drawn (see render_scrolling()).
+                                          Dirty rendering is off in that case, since the whole view moves every tick. (default: the size of the display)
         """
         
         self.display = display
+        self.background_color = background_color
+        self.dirty_rendering = dirty_rendering
+        self.profiler = profiler
+        self.leaderboard = leaderboard
+        self.player = player
+        self.assets = assets if assets is not None else AssetBundle()
         
         # Types
+        self.simulation: Simulation = simulation
+        self.world_size = world_size
         self.snake: Snake
         self.fruit: Fruit
         self.boundary: Boundary
+        self.hud: Boundary # Lays out the stats bar on the display, which is the boundary itself unless the view scrolls
+        self.camera: Camera = None
+        self.piece_index: ChunkIndex = None
         self.gameover_handler: GameOver
-        self.game_font: pygame.font.Font
-        self.gameover_font: pygame.font.Font
-        self.message_font: pygame.font.Font
+        self.atlas: SpriteAtlas
         self.scoreboard: Score
+        self.dirty_rects: DirtyRects = None
+        self.game_data_store: GameDataStore
+        self.replay_recorder: ReplayRecorder = None
+        self.autopilot: Autopilot = None
+        
+        # What the display showed the last time it was drawn, used by dirty rendering
+        self._drawn_game_over: bool = None
+        self._drawn_scores: Tuple[int, int] = None
+        self._drawn_direction: str = None
+        
+        # Positions of the head and the tail and the length of the body before the last tick, used to interpolate between ticks
+        self._previous_head_pos: Tuple[int, int]
+        self._previous_tail: Tuple[Tuple[int, int], int] = (None, 0)
         
         self.game_data: Dict = {
             'high_score': 0
         }
 
-        self._load_fonts()
         self._load_game_objects()
         self._load_scoreboard()
         self.load_game_data()
+        if replay_dir is not None:
+            self.replay_recorder = ReplayRecorder(self.simulation, replay_dir)
+        if autopilot:
+            self.toggle_autopilot()
+        if self.profiler is not None:
+            self._instrument()
         
     def _load_game_objects(self) -> None:
-        """Initialize the necessary game objects."""
-        self.snake = Snake(self.display, 60, 60, outline_width=2)
-        self.fruit = Fruit(self.display, 20, 20)
-        self.boundary = Boundary(self.display)
-        self.gameover_handler = GameOver(
-            display = self.display, 
-            snake = self.snake, 
-            boundary = self.boundary, 
-            gameover_font = self.gameover_font, 
-            message_font = self.message_font,
-            gameover_callback = self.snake.stop,
-            restart_callback = self.restart_game,
-        )
-        self.change_fruit_pos()
+        """Initialize the simulation and keep references to the game objects it owns for rendering."""
+        if self.simulation is None:
+            self.simulation = Simulation(size=self.world_size or self.display.get_size(), display=self.display)
+        self.snake = self.simulation.snake
+        self.fruit = self.simulation.fruit
+        self.boundary = self.simulation.boundary
+        self.gameover_handler = self.simulation.gameover_handler
+        self.atlas = SpriteAtlas(self.snake, self.fruit)
+        self._previous_head_pos = self.snake.head.rect.topleft
+        self.hud = self.boundary
+        if tuple(self.simulation.size) != self.display.get_size():
+            # The stats bar stays at the bottom of the display, and the world scrolls in the area above it.
+            self.hud = Boundary(self.display)
+            self.camera = Camera(pygame.Rect(0, 0, self.display.get_width(), self.hud.stats_separator.top), self.simulation.size)
+            self.piece_index = ChunkIndex(margin=max(self.snake.body.piece_width, self.snake.body.piece_height))
+            self.piece_index.track(self.snake.body)
+            self.dirty_rendering = False
+        if self.dirty_rendering:
+            self.dirty_rects = DirtyRects(self.simulation)
         
-    def _load_fonts(self) -> None:
-        """Load the fonts used in the game."""
-        font_path = "assets/fonts"
+    def _instrument(self) -> None:
+        """Time the phases of every tick and frame with the profiler."""
+        self.profiler.instrument(self.snake, "move", "snake move")
+        self.profiler.instrument(self.gameover_handler, "handle_game_over", "game over check")
+        self.profiler.instrument(self.simulation, "point")
+        self.profiler.instrument(self, "render_snake", "snake render")
+        self.profiler.instrument(self, "render_fruit", "fruit render")
+        self.profiler.instrument(self, "render_scoreboard", "scoreboard")
+        self.profiler.instrument(self.hud, "render", "boundary")
+        self.profiler.instrument(self, "render_walls", "walls")
+        self.profiler.instrument(self, "render_title", "title")
+        self.profiler.instrument(self, "render_gameover_text", "game over text")
         
-        game_font_path = f"{font_path}/game_font.ttf"
-        self.game_font = pygame.font.Font(game_font_path, 40)
-        self.gameover_font = pygame.font.Font(game_font_path, 110)
+    def _count_draw_calls(self, count: int) -> None:
+        """Count draw calls with the profiler, if there is one."""
+        if self.profiler is not None:
+            self.profiler.count_draw_calls(count)
         
-        message_font_path = f"{font_path}/message_font.ttf"
-        self.message_font = pygame.font.Font(message_font_path, 35)
+    # The fonts are only opened the first time they are used (see AssetBundle).
+    @property
+    def game_font(self) -> pygame.font.Font:
+        return self.assets.font('game', 40)
+    
+    @property
+    def gameover_font(self) -> pygame.font.Font:
+        return self.assets.font('game', 110)
+    
+    @property
+    def message_font(self) -> pygame.font.Font:
+        return self.assets.font('message', 35)
         
     def _load_scoreboard(self) -> None:
         """
         Initialize the Score class for tracking and rendering the
         score and highscore.
         """
-        cur_dir = os.path.dirname(__file__)
         self.scoreboard = Score(
             display = self.display,
-            score_icon_path = f"{cur_dir}/apple.png",
-            highscore_icon_path = f"{cur_dir}/trophy.png",
+            score_icon_path = self.assets.image('score_icon'),
+            highscore_icon_path = self.assets.image('highscore_icon'),
             font = self.game_font
             )
         self.scoreboard.on_new_highscore = self.new_highscore
@@ -90,100 +181,132 @@ class Game:
         """
         The function that gets called when a new high score is achieved. 
         
-        Updates the high score in the game data and saves it to a file.
+        Updates the high score in the game data and saves it to a file, unless the autopilot set it.
         """
+        if self.autopilot is not None:
+            return
         self.game_data['high_score'] = high_score
         self.save_game_data()
             
     def load_game_data(self) -> None:
         """
         - Loads the game data from a file and applies it to the game.
-        - If the game data file doesn't exist, it creates a new file with default game data.
-        - If the file exists but is empty or corrupted, it resets the game data to default values.
+        - If the game data file doesn't exist, is empty or is corrupted, the default game data is used.
+        - Game data saved by older versions, which pickled it to game_data.dat, is picked up too.
         """
         cur_dir = os.path.dirname(__file__)
-        file_path = f"{cur_dir}/game_data.dat"
-        if not os.path.exists(file_path): # File not found
-            self.save_game_data()
-        with open(file_path, "rb") as f:
-            try:
-                self.game_data = pickle.load(f)
-                self.apply_game_data()
-            except EOFError: # File exists but is likely empty
-                self.save_game_data()
-            except pickle.UnpicklingError: # Corrupted game data
-                self.save_game_data()
+        self.game_data_store = GameDataStore(
+            path = f"{cur_dir}/game_data.json",
+            defaults = self.game_data,
+            legacy_path = f"{cur_dir}/game_data.dat",
+        )
+        self.game_data = self.game_data_store.load()
+        self.apply_game_data()
         
     def save_game_data(self) -> None:
-        """Saves the game data to a file."""
-        cur_dir = os.path.dirname(__file__)
-        with open(f"{cur_dir}/game_data.dat", "wb") as f:
-            pickle.dump(self.game_data, f)
+        """Saves the game data to a file, on a background thread a moment later (see GameDataStore)."""
+        self.game_data_store.save(self.game_data)
+        
+    def close(self) -> None:
+        """Write any game data, replay or leaderboard entries that haven't been saved yet. Call this before quitting."""
+        if self.replay_recorder is not None:
+            self.replay_recorder.close()
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+        self.game_data_store.close()
+        
+    def record_finished_game(self) -> None:
+        """Record the game that just ended on the leaderboard, along with the id of its replay if it was recorded."""
+        replay_id = None
+        if self.replay_recorder is not None:
+            replay_id = os.path.basename(self.replay_recorder.path)
+        self.leaderboard.record(
+            score = self.simulation.score,
+            length = len(self.snake.body),
+            ticks = self.simulation.ticks,
+            reason = self.gameover_handler.reason,
+            replay_id = replay_id,
+            player = self.player if self.autopilot is None else AUTOPILOT_PLAYER,
+        )
             
     def apply_game_data(self) -> None:
         """Applies the loaded game data to the respective objects in the game."""
         self.scoreboard.highscore = self.game_data['high_score']
         
-    def point(self) -> None:
+    def toggle_autopilot(self) -> None:
+        """Hand the snake over to the autopilot, or take it back."""
+        if self.autopilot is None:
+            self.autopilot = Autopilot(self.simulation)
+        else:
+            self.simulation.collision_grid.on_cell_changed = None
+            self.autopilot = None
+            self.apply_game_data() # Bring back the player's high score in case the autopilot beat it
+        
+    def update(self) -> None:
         """
-        Check if the snake collides with the fruit and update the score and snake.
+        Advance the simulation by one tick and keep the scoreboard in sync with it.
 
-        If the snake's head collides with the fruit, the snake is extended, the fruit position is changed,
-        and the score is incremented.
+        While the autopilot is on, it picks the direction of every tick and a new game is started as soon as one ends.
         """
-        if self.snake.head.colliding_with(self.fruit.rect):
-            self.snake.extend()
-            self.change_fruit_pos()
-            self.scoreboard.increment_score()
-            
-    def change_fruit_pos(self) -> None:
-        """Change the position of the fruit to a random coordinate within the game boundaries."""
-        self.fruit.set_random_pos(
-            x_range=(self.boundary.left_line.right, self.boundary.right_line.left),
-            y_range=(self.boundary.top_line.bottom, self.boundary.stats_separator.top)
-        )
-        
-    def restart_game(self) -> None:
-        """Restart the snake game."""
-        self.scoreboard.reset_score()
-        self.snake.reset()
-        self.change_fruit_pos()
-        self.snake.start()
+        self._previous_head_pos = self.snake.head.rect.topleft
+        pieces = self.snake.body.pieces
+        self._previous_tail = (pieces[-1].rect.topleft, len(pieces)) if pieces else (None, 0)
+        was_over = self.gameover_handler.game_over
+        action = None
+        if self.autopilot is not None:
+            if was_over:
+                self.gameover_handler.reset()
+                # The game may end again before the next frame, which then can't tell that the old body has to be cleared.
+                self.request_full_redraw()
+                was_over = False
+            action = self.autopilot(self.simulation)
+        if self.dirty_rects is not None:
+            self.dirty_rects.step(action)
+        else:
+            self.simulation.step(action)
+        if self.gameover_handler.game_over and not was_over and self.leaderboard is not None:
+            self.record_finished_game()
+        if self.scoreboard.score != self.simulation.score:
+            self.scoreboard.score = self.simulation.score
         
+    def request_full_redraw(self) -> None:
+        """Make the next render() redraw the whole display, for when something else has drawn over it."""
+        if self.dirty_rendering:
+            self.dirty_rects.invalidate()
+
     def handle_event(self, event: pygame.event.Event) -> None:
         """
         Handle the keyboard events for controlling the snake and restarting the game.
 
         - This method handles the pygame.KEYDOWN event and determines the action based on the pressed key.
         - Arrow keys control the snake's movement, the space and enter keys trigger game restart.
+        - The A key toggles the autopilot. Arrow keys do nothing while it is steering.
 
         Parameters:
             event (pygame.event.Event): The pygame event to handle.
         """
         
+        if event.type == pygame.VIDEOEXPOSE and self.dirty_rects is not None:
+            self.dirty_rects.invalidate()
+        
         if event.type != pygame.KEYDOWN:
             return
         
-        # To start the game when an arrow key is pressed for the first time after opening it
-        # Snake().start() doesn't do anything if it is already started, 
-        # so it's safe to use this statement whenever an arrow key is pressed and the 
-        # game_over flag is set to False.
-        start = lambda: None if self.gameover_handler.game_over else self.snake.start()
-        
-        if event.key == pygame.K_UP and (self.snake.direction != 'd' or len(self.snake.body) == 0):
-            start()
-            self.snake.up()
-        elif event.key == pygame.K_DOWN and (self.snake.direction != 'u' or len(self.snake.body) == 0):
-            start()
-            self.snake.down()
-        elif event.key == pygame.K_LEFT and (self.snake.direction != 'r' or len(self.snake.body) == 0):
-            start()
-            self.snake.left()
-        elif event.key == pygame.K_RIGHT and (self.snake.direction != 'l' or len(self.snake.body) == 0):
-            start()
-            self.snake.right()
-        elif event.key in [pygame.K_SPACE, pygame.K_RETURN]:
+        # The first arrow key press after opening the game also starts it (see Simulation.turn).
+        directions = {
+            pygame.K_UP: 'u',
+            pygame.K_DOWN: 'd',
+            pygame.K_LEFT: 'l',
+            pygame.K_RIGHT: 'r',
+        }
+        
+        if event.key == pygame.K_a:
+            self.toggle_autopilot()
+        elif event.key in directions and self.autopilot is None:
+            self.simulation.turn(directions[event.key])
+        elif event.key in [pygame.K_SPACE, pygame.K_RETURN] and self.gameover_handler.game_over:
             self.gameover_handler.reset()
+            self.request_full_redraw()
             
     def render_title(self) -> None:
         """
@@ -191,33 +314,271 @@ class Game:
 
         The title text is rendered in between the score and high score.
         """
-        title_text = self.game_font.render("SNAKE GAME BY DHYANESH !!" , True , "white")
+        title_text = render_text(self.game_font, "SNAKE GAME BY DHYANESH !!" , True , "white")
         title_rect = title_text.get_rect(center=center_of_rect(
-            (self.boundary.highscore_separator.right, self.boundary.score_separator.left),
-            (self.boundary.stats_separator.bottom, self.boundary.bottom_line.top+2)
+            (self.hud.highscore_separator.right, self.hud.score_separator.left),
+            (self.hud.stats_separator.bottom, self.hud.bottom_line.top+2)
         ))
         self.display.blit(title_text, title_rect)
+        self._count_draw_calls(1)
+        
+    def render_gameover_text(self) -> None:
+        """Render the game over text on the display surface if the game_over flag is set to true."""
+        if not self.gameover_handler.game_over: return
+        game_over_text = render_text(self.gameover_font, "GAMEOVER!" , True , "white")
+        reason_text = render_text(self.message_font, f"REASON: {self.gameover_handler.reason}" , False , "white") 
+        restart_text = render_text(self.message_font, "PRESS ENTER OR SPACEBAR TO CONTINUE" , False , "white")  
+        
+        y_spacing = 20
+        x_range = (self.hud.left_line.right, self.hud.right_line.left)
+        
+        game_over_rect = game_over_text.get_rect(midbottom=center_of_rect(
+            x_range,
+            (self.hud.top_line.bottom, self.hud.stats_separator.top)
+        ))
+        
+        reason_rect = reason_text.get_rect(midtop=(
+            center_of(x_range), game_over_rect.bottom + y_spacing
+        ))
+        
+        restart_rect = restart_text.get_rect(midtop=(
+            center_of(x_range), reason_rect.bottom + y_spacing
+        ))
+        
+        self.display.blit(game_over_text, game_over_rect)
+        self.display.blit(reason_text, reason_rect)
+        self.display.blit(restart_text, restart_rect)
+        self._count_draw_calls(3)
     
-    def render(self) -> None:
-        """
-        Render the game objects such as the snake, fruit, score, boundaries 
-        and title on the display surface.
-        """
-        self.gameover_handler.handle_game_over()
-        self.point()
-        self.snake.render()
-        self.fruit.render()
+    def score_area(self) -> pygame.Rect:
+        """Get the area of the stats bar the score is rendered in."""
+        left, right = self.hud.score_separator.right, self.hud.right_line.left
+        top, bottom = self.hud.stats_separator.bottom, self.hud.bottom_line.top
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def highscore_area(self) -> pygame.Rect:
+        """Get the area of the stats bar the high score is rendered in."""
+        left, right = self.hud.left_line.right, self.hud.highscore_separator.left
+        top, bottom = self.hud.stats_separator.bottom, self.hud.bottom_line.top
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def render_scoreboard(self) -> None:
+        """Render the score and high score in their areas of the stats bar."""
+        score_area, highscore_area = self.score_area(), self.highscore_area()
         self.scoreboard.render(
             score_coords = center_of_rect(
-                (self.boundary.score_separator.right, self.boundary.right_line.left),
-                (self.boundary.stats_separator.bottom, self.boundary.bottom_line.top)
+                (score_area.left, score_area.right),
+                (score_area.top, score_area.bottom)
             ),
             highscore_coords = center_of_rect(
-                (self.boundary.left_line.right, self.boundary.highscore_separator.left),
-                (self.boundary.stats_separator.bottom, self.boundary.bottom_line.top)
+                (highscore_area.left, highscore_area.right),
+                (highscore_area.top, highscore_area.bottom)
             )
         )
+        self._count_draw_calls(4)
+        
+    def render_snake(self, alpha: float = 1.0) -> None:
+        """
+        Draw the snake from the sprite atlas, with its head, first piece and tail interpolated by alpha (see render()).
+
+        When the view scrolls, only the pieces the chunk index finds in view are drawn, moved by the camera.
+        """
+        head_dest = self.interpolated_head_pos(alpha) if alpha < 1.0 else None
+        moved = self.interpolated_piece_positions(alpha) if alpha < 1.0 else {}
+        pieces = self.snake.body.pieces
+        dx, dy = self.camera.offset if self.camera is not None else (0, 0)
+        blits = []
+        if moved:
+            # The tail is drawn where it slides from as well as where it is, since the piece that was in front of it has moved on.
+            x, y = moved.pop(pieces[-1])
+            blits.append(self.atlas.piece_blit(pieces[-1], (x + dx, y + dy)))
+        if self.camera is None:
+            blits += self.atlas.snake_blits(self.snake, head_dest)
+            if moved:
+                surface, _, area = blits[1]
+                blits[1] = (surface, moved[pieces[0]], area)
+        else:
+            for piece in self.piece_index.query(self.camera.rect):
+                x, y = moved.get(piece, piece.rect.topleft)
+                blits.append(self.atlas.piece_blit(piece, (x + dx, y + dy)))
+            x, y = head_dest if head_dest is not None else self.snake.head.rect.topleft
+            blits.append(self.atlas.piece_blit(self.snake.head, (x + dx, y + dy)))
+        self.display.blits(blits, doreturn=False)
+        self._count_draw_calls(len(blits))
+        
+    def render_fruit(self) -> None:
+        """Draw the fruit from the sprite atlas, if it is in view."""
+        surface, dest, area = self.atlas.fruit_blit(self.fruit)
+        if self.camera is not None:
+            if not self.camera.visible(self.fruit.rect):
+                return
+            dest = self.camera.to_screen(dest)
+        self.display.blit(surface, dest, area)
+        self._count_draw_calls(1)
+
+    def render_walls(self) -> None:
+        """Draw the parts of the boundary lines of the world that are in view, moved by the camera, over a backdrop grid that shows the scrolling."""
+        view, (dx, dy) = self.camera.rect, self.camera.offset
+        spacing = self.snake.body.piece_width * 8
+        first_x, first_y = view.left - view.left % spacing, view.top - view.top % spacing
+        for x in range(first_x, view.right, spacing):
+            pygame.draw.line(self.display, BACKDROP_COLOR, (x + dx, view.top + dy), (x + dx, view.bottom + dy))
+        for y in range(first_y, view.bottom, spacing):
+            pygame.draw.line(self.display, BACKDROP_COLOR, (view.left + dx, y + dy), (view.right + dx, y + dy))
+        walls = (self.boundary.top_line, self.boundary.bottom_line, self.boundary.left_line, self.boundary.right_line, self.boundary.stats_separator)
+        for wall in walls:
+            visible = wall.clip(view)
+            if visible:
+                pygame.draw.rect(self.display, self.boundary.color, visible.move(dx, dy))
+        self._count_draw_calls(len(walls) + view.width // spacing + view.height // spacing)
+    
+    def _interpolate(self, previous: Tuple[int, int], current: Tuple[int, int], alpha: float) -> Tuple[int, int]:
+        """Get the point a fraction alpha of the way from previous to current, or current if they aren't a single step apart."""
+        prev_x, prev_y = previous
+        x, y = current
+        if abs(x - prev_x) + abs(y - prev_y) != self.snake.head.velocity:
+            return (x, y)
+        return (round(prev_x + (x - prev_x) * alpha), round(prev_y + (y - prev_y) * alpha))
+
+    def interpolated_head_pos(self, alpha: float) -> Tuple[int, int]:
+        """
+        Get the position of the head a fraction of the way from where it was before the last tick to where it is now.
+        
+        If the head didn't just take a single step (it stopped, or the game restarted), its current position is returned.
+        
+        Parameters:
+            alpha (float): How far to go from the previous position (0.0) to the current one (1.0).
+        """
+        return self._interpolate(self._previous_head_pos, self.snake.head.rect.topleft, alpha)
+
+    def interpolated_piece_positions(self, alpha: float) -> Dict[SnakePiece, Tuple[int, int]]:
+        """
+        Get the positions of the first piece and the tail a fraction alpha of the way along their last step.
+
+        Every piece takes the place the piece in front of it had, and the pieces all look alike, so the body in between
+        looks the same whether it's interpolated or not. Only its two ends visibly move: the first piece slides out from
+        under the second, and the tail slides from where it was before the last tick, unless the body just grew.
+        For a body of one piece, that piece is both and slides from where the tail was.
+        """
+        pieces = self.snake.body.pieces
+        if not pieces:
+            return {}
+        previous_tail, previous_length = self._previous_tail
+        tail_from = previous_tail if previous_length == len(pieces) else pieces[-1].rect.topleft
+        first_from = pieces[1].rect.topleft if len(pieces) > 1 else tail_from
+        positions = {pieces[-1]: self._interpolate(tail_from, pieces[-1].rect.topleft, alpha)}
+        positions[pieces[0]] = self._interpolate(first_from, pieces[0].rect.topleft, alpha)
+        return positions
+    
+    def render(self, alpha: float = 1.0) -> List[pygame.Rect]:
+        """
+        Render the game objects such as the snake, fruit, score, boundaries 
+        and title on the display surface.
+        
+        This only draws the current state of the simulation, see update() for advancing it.
+        With dirty rendering, only the areas that changed since the last frame are redrawn when possible.
+        
+        Parameters:
+            alpha (float): How far the frame is between the last tick and the next one (see FixedTimestep.alpha). 
+                           The head and the ends of the body are drawn that far along their last step so the snake glides between ticks. 
+                           Ignored with dirty rendering, which only draws whole ticks. (default: 1.0)
+        
+        Returns:
+            List[pygame.Rect]: The areas of the display that were redrawn.
+        """
+        if self.dirty_rects is not None and not self._needs_full_redraw():
+            return self.render_changes()
+        if self.camera is not None:
+            return self.render_scrolling(alpha)
+        
+        self.display.fill(self.background_color)
+        self.render_snake(alpha)
+        self.render_fruit()
+        self.render_scoreboard()
         self.boundary.render()
+        self._count_draw_calls(8) # The fill and the boundary lines
+        self.render_title()
+        self.render_gameover_text() # Drawn last so nothing overlaps it
+        
+        self._remember_drawn_state()
+        return [self.display.get_rect()]
+    
+    def render_scrolling(self, alpha: float = 1.0) -> List[pygame.Rect]:
+        """
+        Render the view of a world larger than the display: the camera is centred on the (interpolated) head,
+        the walls, fruit and pieces in view are drawn within the area above the stats bar, and then the stats bar below it.
+        Nothing outside the view is drawn or even looked at, so the cost of a frame doesn't grow with the size of the world or the length of the snake.
+        """
+        head = self.snake.head.rect
+        x, y = self.interpolated_head_pos(alpha) if alpha < 1.0 else head.topleft
+        self.camera.follow((x + head.width // 2, y + head.height // 2))
+
+        self.display.fill(self.background_color)
+        self.display.set_clip(self.camera.viewport)
+        self.render_walls()
+        self.render_fruit()
+        self.render_snake(alpha)
+        # The stats bar is laid out like the one of a normal game, with its lines clipped to the bar.
+        self.display.set_clip(pygame.Rect(0, self.camera.viewport.bottom, self.display.get_width(), self.display.get_height()))
+        self.render_scoreboard()
+        self.hud.render()
         self.render_title()
-        self.gameover_handler.render_gameover_text() # Redraw the text just in case anything is overlapping it
+        self.display.set_clip(None)
+        self._count_draw_calls(8) # The fill and the stats bar lines
+        self.render_gameover_text()
+
+        self._remember_drawn_state()
+        return [self.display.get_rect()]
+
+    def _needs_full_redraw(self) -> bool:
+        """Check if the changes since the last frame can't be redrawn through dirty rects alone."""
+        if self.dirty_rects.full_redraw or self._drawn_game_over != self.gameover_handler.game_over:
+            return True
+        # The tail left its position but some other piece still covers it
+        return any(self.simulation.collision_grid.occupied(rect) for rect in self.dirty_rects.vacated)
+    
+    def _remember_drawn_state(self) -> None:
+        """Remember what the display currently shows and forget the recorded changes."""
+        self._drawn_game_over = self.gameover_handler.game_over
+        self._drawn_scores = (self.scoreboard.score, self.scoreboard.highscore)
+        self._drawn_direction = self.snake.direction
+        if self.dirty_rects is not None:
+            self.dirty_rects.clear()
+    
+    def render_changes(self) -> List[pygame.Rect]:
+        """
+        Clear and redraw only the areas that changed since the last frame: the positions the head and tail left, 
+        the head and the new pieces behind it, the old and new fruit, the head when it turns on the spot 
+        and the score or high score when they change.
+        
+        Returns:
+            List[pygame.Rect]: The areas of the display that were redrawn.
+        """
+        rects = self.dirty_rects.rects
+        if not self.dirty_rects.moves and self.snake.direction != self._drawn_direction:
+            rects.append(self.snake.head.rect.copy())
+        for rect in rects:
+            self.display.fill(self.background_color, rect)
+        
+        blits = []
+        if rects:
+            pieces = self.snake.body.pieces
+            for idx in range(min(self.dirty_rects.moves, len(pieces))):
+                blits.append(self.atlas.piece_blit(pieces[idx]))
+                rects.append(pieces[idx].rect)
+            blits.append(self.atlas.piece_blit(self.snake.head))
+        if self.fruit.rect.collidelist(rects) != -1:
+            blits.append(self.atlas.fruit_blit(self.fruit))
+        self.display.blits(blits, doreturn=False)
+        self._count_draw_calls(len(rects) + len(blits))
+        
+        score, highscore = self._drawn_scores
+        if score != self.scoreboard.score or highscore != self.scoreboard.highscore:
+            for area in (self.score_area(), self.highscore_area()):
+                self.display.fill(self.background_color, area)
+                rects.append(area)
+            self.render_scoreboard()
+        
+        self._remember_drawn_state()
+        return rects
         
\ No newline at end of file
@@ -0,0 +1,204 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from .simulation import Simulation
+
+
+class HamiltonianAutopilot:
+    """
+    Fills the whole board by following a Hamiltonian cycle, a closed path through every block of the board,
+    taking shortcuts towards the fruit while they can't trap the snake. Like Autopilot, it is an agent (see tournament.load_agent).
+
+    #### The cycle:
+    - The snake turns only when its head covers a whole block the size of the head (two body pieces wide), aligned with its
+      starting position. Moving from block to block this way, the body always covers whole blocks, two pieces each.
+    - The cycle runs through the blocks that lie inside the walls, and is stored as a table from every cell of the grid
+      to the position of its block on the cycle (or -1), so looking up where anything is on the cycle takes constant time.
+    - The snake's body always lies on the stretch of the cycle that ends at the head, in cycle order. Following the cycle keeps
+      it that way, so the head never runs into the body and the snake can grow until it fills every block.
+
+    #### Shortcuts:
+    - Instead of the next block on the cycle, the head may move to any free neighbouring block further along the cycle
+      as long as it stays behind the tail with room to spare for the pieces the body is still going to grow, and doesn't pass the fruit.
+      The blocks skipped over are left behind the head and the order of the body on the cycle is kept.
+    - Once the snake covers half the board, it stops taking shortcuts, so the board fills up without gaps the fruit could hide in.
+    - A decision looks up the head, tail, fruit and four neighbours in the table, so it takes the same time whatever the length of the snake.
+
+    #### Limits:
+    - The board is full once the fruit has nowhere to go and is moved off the board (see Simulation.change_fruit_pos).
+      The growth still pending by then has no room left, so the game ends a few ticks later.
+    - Cells along the walls that don't make up a whole block are left out of the cycle. If both sides of the board are an odd
+      number of blocks, no cycle covers all of them and the last row of blocks is left out too.
+    - The cells left out are marked as walls when the autopilot is attached, so the fruit is never placed where the snake
+      can't reach it, and the board counts as full once the cycle is.
+    """
+
+    def __init__(self, simulation: Simulation = None) -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation to steer. (default: the first one the autopilot is called with)
+        """
+        self.simulation: Simulation = None
+        self.columns: int = 0
+        self.block_columns: int = 0
+        self.block_rows: int = 0
+        self.cycle: List[int] = []
+        self.cycle_index: array = array('i')
+        self.steps: Dict[str, int] = {}
+        self.directions: Dict[int, str] = {}
+        self.pieces_per_block: int = 1
+
+        if simulation is not None:
+            self.attach(simulation)
+
+    def attach(self, simulation: Simulation) -> None:
+        """
+        Build the cycle for the board of a simulation.
+
+        Raises:
+            ValueError: If the board is too small for a cycle, or the snake doesn't start on it.
+        """
+        self.simulation = simulation
+        grid = simulation.collision_grid
+        snake = simulation.snake
+        columns = grid.columns
+        self.columns = columns
+        self.block_columns = -(-snake.head.rect.width // grid.cell_size)
+        self.block_rows = -(-snake.head.rect.height // grid.cell_size)
+        self.pieces_per_block = max(1, self.block_columns * self.block_rows // self._piece_cells(simulation))
+
+        # Lay the blocks out from the head's starting cell, and keep the ones that don't touch a wall.
+        head_col, head_row = self._cell_position(grid.cells_of(snake.head.rect)[0])
+        first_col = head_col % self.block_columns
+        first_row = head_row % self.block_rows
+        block_cols = range(first_col, grid.columns - self.block_columns + 1, self.block_columns)
+        block_rows = range(first_row, grid.rows - self.block_rows + 1, self.block_rows)
+        free = [(col, row) for row in block_rows for col in block_cols if not self._touches_wall(col, row)]
+        if not free:
+            raise ValueError("The board has no room for a Hamiltonian cycle")
+
+        # The playing area is a rectangle, so its free blocks are too.
+        left, right = min(col for col, _ in free), max(col for col, _ in free)
+        top, bottom = min(row for _, row in free), max(row for _, row in free)
+        width = (right - left) // self.block_columns + 1
+        height = (bottom - top) // self.block_rows + 1
+        if len(free) != width * height:
+            raise ValueError("The free area of the board isn't a rectangle")
+        if width % 2 and height % 2:
+            height -= 1
+
+        self.cycle = [(top + row * self.block_rows) * columns + left + col * self.block_columns
+                      for col, row in self._rectangle_cycle(width, height)]
+        self.cycle_index = array('i', [-1]) * (columns * grid.rows)
+        for index, block in enumerate(self.cycle):
+            for cell in self._block_cells(block):
+                self.cycle_index[cell] = index
+        if self.cycle_index[grid.cells_of(snake.head.rect)[0]] == -1:
+            raise ValueError("The snake doesn't start on the Hamiltonian cycle")
+        self._wall_off_cycle(simulation)
+
+        self.steps = {'u': -self.block_rows * columns, 'd': self.block_rows * columns, 'l': -self.block_columns, 'r': self.block_columns}
+        self.directions = {step: direction for direction, step in self.steps.items()}
+
+    def _wall_off_cycle(self, simulation: Simulation) -> None:
+        """Mark the cells left out of the cycle as walls, and move the fruit if it was on any of them."""
+        grid = simulation.collision_grid
+        size = grid.cell_size
+        off_cycle = [cell for cell, index in enumerate(self.cycle_index) if index == -1 and not grid.walls[cell]]
+        if not off_cycle:
+            return
+        grid.mark_walls(pygame.Rect(grid.x + col * size, grid.y + row * size, size, size)
+                        for col, row in map(self._cell_position, off_cycle))
+        if any(cell != -1 and self.cycle_index[cell] == -1 for cell in grid.cells_of(simulation.fruit.rect)):
+            simulation.change_fruit_pos()
+
+    @staticmethod
+    def _piece_cells(simulation: Simulation) -> int:
+        """Get the number of cells a body piece covers."""
+        body, cell_size = simulation.snake.body, simulation.collision_grid.cell_size
+        return (-(-body.piece_width // cell_size)) * (-(-body.piece_height // cell_size))
+
+    def _cell_position(self, cell: int) -> Tuple[int, int]:
+        """Get the column and row of a cell."""
+        row, col = divmod(cell, self.columns)
+        return (col, row)
+
+    def _block_cells(self, block: int) -> List[int]:
+        """Get the cells of the block whose top-left cell is given."""
+        return [block + dy * self.columns + dx for dy in range(self.block_rows) for dx in range(self.block_columns)]
+
+    def _touches_wall(self, col: int, row: int) -> bool:
+        """Check if the block with the given top-left cell overlaps a wall."""
+        walls = self.simulation.collision_grid.walls
+        return any(walls[cell] for cell in self._block_cells(row * self.columns + col))
+
+    @staticmethod
+    def _rectangle_cycle(width: int, height: int) -> List[Tuple[int, int]]:
+        """
+        Get a Hamiltonian cycle through a width x height grid as a list of (column, row), starting at the top-left corner.
+
+        Goes along the top row, snakes up and down through the other columns and comes back up the first one,
+        which needs an even width. An odd width is handled by doing the same on the transposed grid.
+        """
+        if width == 1 or height == 1:
+            if width * height > 2:
+                raise ValueError("The board has no room for a Hamiltonian cycle")
+            return [(col, row) for row in range(height) for col in range(width)]
+        if width % 2:
+            return [(col, row) for row, col in HamiltonianAutopilot._rectangle_cycle(height, width)]
+        cycle = [(col, 0) for col in range(width)]
+        for col in range(width - 1, 0, -1):
+            rows = range(1, height) if (width - 1 - col) % 2 == 0 else range(height - 1, 0, -1)
+            cycle.extend((col, row) for row in rows)
+        cycle.extend((0, row) for row in range(height - 1, 0, -1))
+        return cycle
+
+    def _ahead(self, start: int, end: int) -> int:
+        """Get how many blocks along the cycle end is from start."""
+        return (end - start) % len(self.cycle)
+
+    def __call__(self, simulation: Simulation) -> Optional[str]:
+        """Get the direction to turn to before the next tick, or None to keep going."""
+        if simulation is not self.simulation:
+            self.attach(simulation)
+        grid = simulation.collision_grid
+        snake = simulation.snake
+        body = snake.body
+        head_rect = snake.head.rect
+
+        # Only turn when the head covers a whole block.
+        head = ((head_rect.y - grid.y) // grid.cell_size) * self.columns + (head_rect.x - grid.x) // grid.cell_size
+        if not 0 <= head < len(self.cycle_index) or self.cycle_index[head] == -1 or self.cycle[self.cycle_index[head]] != head:
+            return None
+        head_index = self.cycle_index[head]
+        size = len(self.cycle)
+        choice = self.cycle[(head_index + 1) % size]
+
+        fruit_ahead = min((self._ahead(head_index, self.cycle_index[cell]) for cell in grid.cells_of(grid.fruit_rect)
+                           if cell != -1 and self.cycle_index[cell] != -1), default=None)
+        if fruit_ahead is not None:
+            if body.pieces:
+                tail_ahead = self._ahead(head_index, self.cycle_index[grid.cells_of(body.pieces[-1].rect)[0]])
+            else:
+                tail_ahead = size
+            # Blocks the body still fills in as it grows, counting the fruit it might eat next, plus one to spare.
+            growth = -(-(body.no_pieces - len(body) + body.extend_by) // self.pieces_per_block) + 1
+            length = -(-body.no_pieces // self.pieces_per_block) + 1
+            if length + growth < size // 2:
+                longest = min(fruit_ahead, tail_ahead - growth - 1)
+                best = 1
+                head_col = head % self.columns
+                for step in self.steps.values():
+                    neighbour = head + step
+                    if not 0 <= neighbour < len(self.cycle_index) or self.cycle_index[neighbour] == -1 \
+                            or abs(neighbour % self.columns - head_col) > self.block_columns:
+                        continue
+                    ahead = self._ahead(head_index, self.cycle_index[neighbour])
+                    if best < ahead <= longest and self.cycle[self.cycle_index[neighbour]] == neighbour \
+                            and not any(grid.counts[cell] for cell in self._block_cells(neighbour)):
+                        best = ahead
+                        choice = neighbour
+        direction = self.directions[choice - head]
+        return direction if direction != snake.direction or not snake.head.moving else None
@@ -0,0 +1,146 @@
+import time
+import sqlite3
+from typing import Dict, List, Tuple
+
+
+class Leaderboard:
+    """
+    A local leaderboard of every finished game, stored in an SQLite database.
+
+    - Games are recorded into a buffer and inserted batch_size at a time in a single transaction,
+      so recording a game costs next to nothing and the database isn't written to after every game.
+      Queries and close() insert whatever is buffered first.
+    - Top-N and per-player best queries are answered from indexes on the score, without scanning the table.
+    - A count of games per score is kept alongside the games, so percentiles only ever look at one row per distinct score.
+    """
+
+    def __init__(self, path: str = "leaderboard.db", batch_size: int = 64) -> None:
+        """
+        Parameters:
+            path (str): The database file. It is created if it doesn't exist. ":memory:" keeps it in memory. (default: "leaderboard.db")
+            batch_size (int): The number of games buffered before they are inserted. (default: 64)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.pending: List[Tuple] = []
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        """Create the tables and indexes, unless the database already has them."""
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY,
+                    player TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    ticks INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    replay_id TEXT,
+                    played_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, ticks);
+                CREATE INDEX IF NOT EXISTS games_by_player ON games (player, score DESC);
+                CREATE TABLE IF NOT EXISTS score_counts (
+                    score INTEGER PRIMARY KEY,
+                    count INTEGER NOT NULL
+                );
+            """)
+
+    def record(self,
+               score: int,
+               length: int,
+               ticks: int,
+               reason: str,
+               replay_id: str = None,
+               player: str = "player",
+               played_at: float = None,
+               ) -> None:
+        """
+        Record a finished game.
+
+        Parameters:
+            score (int): The final score.
+            length (int): The number of body pieces the snake ended with.
+            ticks (int): How long the game lasted, in ticks.
+            reason (str): Why the game ended (see GameOver.reason).
+            replay_id (str): The id of the replay of the game, if it was recorded. (default: None)
+            player (str): The name of the player. (default: "player")
+            played_at (float): When the game ended, as a Unix timestamp. (default: now)
+        """
+        self.pending.append((player, score, length, ticks, reason, replay_id, played_at if played_at is not None else time.time()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert the buffered games."""
+        if not self.pending:
+            return
+        counts: Dict[int, int] = {}
+        for game in self.pending:
+            counts[game[1]] = counts.get(game[1], 0) + 1
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO games (player, score, length, ticks, reason, replay_id, played_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self.pending
+            )
+            self.connection.executemany(
+                "INSERT INTO score_counts (score, count) VALUES (?, ?) ON CONFLICT (score) DO UPDATE SET count = count + excluded.count",
+                counts.items()
+            )
+        self.pending = []
+
+    def _query(self, sql: str, parameters: Tuple = ()) -> List[Dict]:
+        """Insert the buffered games, run a query and get its rows as dicts."""
+        self.flush()
+        cursor = self.connection.execute(sql, parameters)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def top(self, n: int = 10) -> List[Dict]:
+        """Get the n best games, highest score first. Ties go to the game that took fewer ticks."""
+        return self._query("SELECT * FROM games ORDER BY score DESC, ticks LIMIT ?", (n,))
+
+    def player_best(self, player: str) -> Dict:
+        """Get the best game of a player, or None if they haven't played."""
+        games = self._query("SELECT * FROM games WHERE player = ? ORDER BY score DESC LIMIT 1", (player,))
+        return games[0] if games else None
+
+    def player_top(self, player: str, n: int = 10) -> List[Dict]:
+        """Get the n best games of a player, highest score first."""
+        return self._query("SELECT * FROM games WHERE player = ? ORDER BY score DESC LIMIT ?", (player, n))
+
+    def count(self) -> int:
+        """Get the number of games recorded."""
+        return self._query("SELECT COALESCE(SUM(count), 0) AS games FROM score_counts")[0]['games']
+
+    def percentile_rank(self, score: int) -> float:
+        """Get the percentage of recorded games that scored less than the given score."""
+        row = self._query(
+            "SELECT COALESCE(SUM(CASE WHEN score < ? THEN count END), 0) AS below, COALESCE(SUM(count), 0) AS games FROM score_counts",
+            (score,)
+        )[0]
+        return 100 * row['below'] / row['games'] if row['games'] else 0.0
+
+    def score_at_percentile(self, percentile: float) -> int:
+        """Get the score at a percentile: the lowest score that the given percentage of recorded games didn't beat. None if there are no games."""
+        counts = self._query("SELECT score, count FROM score_counts ORDER BY score")
+        total = sum(row['count'] for row in counts)
+        if not total:
+            return None
+        needed = percentile / 100 * total
+        seen = 0
+        for row in counts:
+            seen += row['count']
+            if seen >= needed:
+                return row['score']
+        return counts[-1]['score']
+
+    def close(self) -> None:
+        """Insert the buffered games and close the database."""
+        self.flush()
+        self.connection.close()
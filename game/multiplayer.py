@@ -0,0 +1,355 @@
+import time
+import struct
+import random
+import asyncio
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .arena import Arena, PlayerView
+
+DIRECTIONS = "udlr"
+NO_TURN = 255
+
+# Every message starts with its type byte, followed by the struct of that type.
+JOIN = b"J"           # Client: a name follows, as its length and the UTF-8 bytes
+INPUT = b"I"          # Client: the direction of the player for one tick
+WELCOME = b"W"        # Server: the player number and the settings of the game
+START = b"S"          # Server: a round starts
+TICK = b"T"           # Server: a tick was simulated, with the turns taken on it
+INPUT_FORMAT = struct.Struct("<BIB")       # Round, tick and direction (an index into DIRECTIONS, or NO_TURN)
+WELCOME_FORMAT = struct.Struct("<BBBBHHH") # Player, players, fruits, input delay, tick rate, width and height
+START_FORMAT = struct.Struct("<BQ")        # Round and seed
+TICK_FORMAT = struct.Struct("<IIB")        # Tick, checksum of the arena after it and the number of turns that follow
+TURN_FORMAT = struct.Struct("<BB")         # Player and direction
+
+MAX_BUFFERED = 64 * 1024 # A client that lets this many bytes of ticks pile up unread is disconnected
+
+
+class MultiplayerServer:
+    """
+    An authoritative server for several players sharing an Arena. Clients only send their directions, and get back
+    the turns every tick was simulated with, which is all they need to replay the round on their own copy of the arena.
+
+    #### Lockstep:
+    - Every tick has a number, and the server simulates tick T once it has the input of every player for T,
+      but never earlier than its place in the tick rate.
+    - A client answers each tick T it receives with its input for tick T + input_delay, so its input has input_delay ticks
+      to travel before the server needs it. The first input_delay ticks of a round go by without turns.
+    - A tick message holds the tick number, the accepted turns (two bytes each) and a checksum of the arena after the tick
+      (see Arena.checksum), so clients can tell if they fell out of sync. A tick nobody turned on is 10 bytes.
+
+    #### Stragglers:
+    - The server waits for missing inputs for up to straggler_timeout past the time a tick was due. After that the tick is
+      simulated without them, as if those players kept going, and the miss is counted in missed.
+    - An input that arrives after its tick was simulated is applied on the next tick instead, and counted in late.
+    - A player missing max_missed ticks in a row, or leaving their ticks unread, is disconnected and no longer waited for.
+      Their snake keeps going until it crashes.
+    """
+
+    def __init__(self,
+                 players: int,
+                 host: str = "127.0.0.1",
+                 port: int = 5555,
+                 tick_rate: float = 30,
+                 input_delay: int = 2,
+                 straggler_timeout: float = None,
+                 max_missed: int = 90,
+                 rounds: int = None,
+                 round_pause: float = 2.0,
+                 seed: int = None,
+                 size: Tuple[int, int] = (1150, 760),
+                 fruits: int = None,
+                 ) -> None:
+        """
+        Parameters:
+            players (int): The number of players to wait for before the first round starts.
+            host (str): The address to listen on. (default: "127.0.0.1")
+            port (int): The port to listen on; 0 picks a free one, see port after start(). (default: 5555)
+            tick_rate (float): The number of ticks per second. (default: 30)
+            input_delay (int): The number of ticks between a tick a client receives and the tick its answer is for. (default: 2)
+            straggler_timeout (float): How long past its time a tick waits for missing inputs, in seconds. (default: half a tick)
+            max_missed (int): The number of ticks in a row a player can miss before being disconnected. (default: 90)
+            rounds (int): The number of rounds to play before stopping. (default: no limit)
+            round_pause (float): The pause between rounds, in seconds. (default: 2)
+            seed (int): The seed the seeds of the rounds are drawn from. (default: a random seed)
+            size (Tuple[int, int]): The size of the board. (default: (1150, 760))
+            fruits (int): The number of fruits on the board. (default: one per player)
+        """
+        self.players = players
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.input_delay = input_delay
+        self.straggler_timeout = straggler_timeout if straggler_timeout is not None else 0.5 / tick_rate
+        self.max_missed = max_missed
+        self.rounds = rounds
+        self.round_pause = round_pause
+        self.rng = random.Random(seed)
+        self.arena = Arena(players, size=size, seed=self.rng.getrandbits(64), fruits=fruits)
+
+        self.names: List[str] = []
+        self.writers: Dict[int, asyncio.StreamWriter] = {}
+        self.round: int = 0
+        self.inputs: Dict[int, Dict[int, str]] = {} # The directions of the players by tick; None for no turn
+        self.pending: Dict[int, str] = {}           # Late inputs, applied on the next tick
+        self.missed: List[int] = [0] * players
+        self.late: List[int] = [0] * players
+        self.tick_times: List[float] = []           # The time it took to simulate and send out each tick, in seconds
+
+        self.on_tick: Callable[[int], None] = None
+        self._missed_in_a_row: List[int] = [0] * players
+        self._server: asyncio.AbstractServer = None
+        self._handlers: Set[asyncio.Task] = set()
+        self._joined = asyncio.Event()
+        self._inputs_complete = asyncio.Event()
+        self._waiting_tick: int = 0
+
+    async def start(self) -> None:
+        """Start listening for players."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def run(self) -> None:
+        """Wait for every player to join, then play rounds until rounds is reached or everybody left."""
+        if self._server is None:
+            await self.start()
+        await self._joined.wait()
+        played = 0
+        while self.writers and (self.rounds is None or played < self.rounds):
+            await self._play_round()
+            played += 1
+            if self.rounds is None or played < self.rounds:
+                await asyncio.sleep(self.round_pause)
+        await self.close()
+
+    async def close(self) -> None:
+        """Disconnect every player and stop listening."""
+        for writer in list(self.writers.values()):
+            writer.close()
+        self.writers.clear()
+        # The connection handlers end on their own once their connection is closed, instead of being cancelled with the loop.
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _play_round(self) -> None:
+        """Play a round from its start message to the tick it ends on."""
+        arena = self.arena
+        self.round = (self.round + 1) % 256
+        seed = self.rng.getrandbits(64)
+        arena.restart(seed)
+        self.inputs.clear()
+        self.pending.clear()
+        self._broadcast(START + START_FORMAT.pack(self.round, seed))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        while not arena.over and self.writers:
+            tick = arena.ticks + 1
+            due = started + tick / self.tick_rate
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            await self._wait_for_inputs(tick, due + self.straggler_timeout - loop.time())
+
+            began = time.perf_counter()
+            self._step(tick)
+            self.tick_times.append(time.perf_counter() - began)
+            if self.on_tick is not None:
+                self.on_tick(tick)
+
+    async def _wait_for_inputs(self, tick: int, timeout: float) -> None:
+        """Wait until every connected player sent their input for a tick, or for timeout seconds at most."""
+        if tick <= self.input_delay or not self._missing(tick):
+            return
+        self._waiting_tick = tick
+        self._inputs_complete.clear()
+        try:
+            await asyncio.wait_for(self._inputs_complete.wait(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        self._waiting_tick = 0
+
+    def _missing(self, tick: int) -> Set[int]:
+        """Get the connected players that haven't sent their input for a tick yet."""
+        return set(self.writers) - set(self.inputs.get(tick, ()))
+
+    def _step(self, tick: int) -> None:
+        """Simulate a tick with the inputs that arrived for it, and send its turns to every player."""
+        arena = self.arena
+        inputs = self.inputs.pop(tick, {})
+        if tick > self.input_delay:
+            for player in set(self.writers) - set(inputs):
+                inputs[player] = None
+                self.missed[player] += 1
+                self._missed_in_a_row[player] += 1
+                if self._missed_in_a_row[player] >= self.max_missed:
+                    self._disconnect(player)
+        for player, direction in self.pending.items():
+            if inputs.get(player) is None:
+                inputs[player] = direction
+        self.pending.clear()
+
+        # Only accepted turns are sent, and clients take them in the same order, so their copies turn exactly like this one.
+        turns = []
+        for player, direction in sorted(inputs.items()):
+            if direction is not None and arena.turn(player, direction):
+                turns.append(TURN_FORMAT.pack(player, DIRECTIONS.index(direction)))
+        arena.step()
+        self._broadcast(TICK + TICK_FORMAT.pack(tick, arena.checksum(), len(turns)) + b"".join(turns))
+
+    def _broadcast(self, message: bytes) -> None:
+        """Send a message to every connected player, dropping the ones that stopped reading."""
+        for player, writer in list(self.writers.items()):
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                self._disconnect(player)
+            else:
+                writer.write(message)
+
+    def _disconnect(self, player: int) -> None:
+        """Stop waiting for a player and close their connection."""
+        writer = self.writers.pop(player, None)
+        if writer is not None:
+            writer.close()
+        if self._waiting_tick and not self._missing(self._waiting_tick):
+            self._inputs_complete.set()
+
+    def _receive_input(self, player: int, round_: int, tick: int, direction: str) -> None:
+        """Store a player's input for a tick, or for the next tick if that one was already simulated."""
+        if round_ != self.round:
+            return # Sent before the round changed
+        self._missed_in_a_row[player] = 0
+        if tick <= self.arena.ticks:
+            self.late[player] += 1
+            if direction is not None:
+                self.pending[player] = direction
+            return
+        self.inputs.setdefault(tick, {})[player] = direction
+        if tick == self._waiting_tick and not self._missing(tick):
+            self._inputs_complete.set()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Take a player in, then read their inputs until they disconnect."""
+        player = None
+        self._handlers.add(asyncio.current_task())
+        try:
+            if await reader.readexactly(1) != JOIN:
+                return
+            name = (await reader.readexactly((await reader.readexactly(1))[0])).decode(errors="replace")
+            if len(self.names) >= self.players:
+                return # The game is full
+            player = len(self.names)
+            self.names.append(name)
+            self.writers[player] = writer
+            width, height = self.arena.size
+            writer.write(WELCOME + WELCOME_FORMAT.pack(player, self.players, len(self.arena.fruits), self.input_delay,
+                                                       round(self.tick_rate), width, height))
+            if len(self.names) == self.players:
+                self._joined.set()
+
+            while True:
+                kind = await reader.readexactly(1)
+                if kind != INPUT:
+                    break
+                round_, tick, direction = INPUT_FORMAT.unpack(await reader.readexactly(INPUT_FORMAT.size))
+                self._receive_input(player, round_, tick, DIRECTIONS[direction] if direction < 4 else None)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if player is not None:
+                self._disconnect(player)
+            writer.close()
+            self._handlers.discard(asyncio.current_task())
+
+
+class MultiplayerClient:
+    """
+    A player of a MultiplayerServer. It keeps its own copy of the Arena in step with the server by replaying the turns of
+    every tick, and answers each tick with its direction for the tick input_delay ticks later.
+
+    - The direction comes from the agent, if any, which is called with the player's view of the arena (see PlayerView),
+      so the single-player agents can play. Otherwise it's the last direction given to steer(), such as from the keyboard.
+    - on_start and on_tick are called after a round starts and after each tick is replayed, for rendering.
+    - desyncs counts the ticks after which the copy didn't match the server's checksum.
+    """
+
+    def __init__(self, name: str = "player", agent: Callable[[PlayerView], Optional[str]] = None, display=None) -> None:
+        """
+        Parameters:
+            name (str): The name to join with. (default: "player")
+            agent (Callable[[PlayerView], Optional[str]]): The agent that plays, if any. (default: None)
+            display (pygame.Surface): The surface the arena is rendered on, if any. (default: None)
+        """
+        self.name = name
+        self.agent = agent
+        self.display = display
+
+        self.player: int = None
+        self.arena: Arena = None
+        self.view: PlayerView = None
+        self.input_delay: int = 0
+        self.tick_rate: int = 0
+        self.round: int = 0
+        self.desyncs: int = 0
+        self.direction: str = None # The direction to send with the next input
+
+        self.on_start: Callable[[], None] = None
+        self.on_tick: Callable[[int], None] = None
+        self._writer: asyncio.StreamWriter = None
+
+    def steer(self, direction: str) -> None:
+        """Turn towards a direction with the next input sent."""
+        self.direction = direction
+
+    async def play(self, host: str = "127.0.0.1", port: int = 5555) -> None:
+        """Join a server and play until it closes the connection."""
+        reader, writer = await asyncio.open_connection(host, port)
+        self._writer = writer
+        name = self.name.encode()[:255]
+        writer.write(JOIN + bytes([len(name)]) + name)
+        try:
+            while True:
+                kind = await reader.readexactly(1)
+                if kind == WELCOME:
+                    self._welcome(*WELCOME_FORMAT.unpack(await reader.readexactly(WELCOME_FORMAT.size)))
+                elif kind == START:
+                    self._start(*START_FORMAT.unpack(await reader.readexactly(START_FORMAT.size)))
+                elif kind == TICK:
+                    tick, checksum, count = TICK_FORMAT.unpack(await reader.readexactly(TICK_FORMAT.size))
+                    turns = await reader.readexactly(count * TURN_FORMAT.size)
+                    self._tick(tick, checksum, [TURN_FORMAT.unpack_from(turns, offset) for offset in range(0, len(turns), TURN_FORMAT.size)])
+                else:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _welcome(self, player: int, players: int, fruits: int, input_delay: int, tick_rate: int, width: int, height: int) -> None:
+        """Set up the copy of the arena."""
+        self.player = player
+        self.input_delay = input_delay
+        self.tick_rate = tick_rate
+        self.arena = Arena(players, size=(width, height), fruits=fruits, display=self.display)
+        self.view = self.arena.view(player)
+
+    def _start(self, round_: int, seed: int) -> None:
+        """Start a round on the copy of the arena."""
+        self.round = round_
+        self.direction = None
+        self.arena.restart(seed)
+        if self.on_start is not None:
+            self.on_start()
+
+    def _tick(self, tick: int, checksum: int, turns: List[Tuple[int, int]]) -> None:
+        """Replay a tick on the copy of the arena and answer it with the input for tick + input_delay."""
+        arena = self.arena
+        for player, direction in turns:
+            arena.turn(player, DIRECTIONS[direction])
+        arena.step()
+        if arena.checksum() != checksum:
+            self.desyncs += 1
+
+        direction = self.agent(self.view) if self.agent is not None and arena.alive[self.player] else self.direction
+        self.direction = None
+        self._writer.write(INPUT + INPUT_FORMAT.pack(self.round, tick + self.input_delay, DIRECTIONS.index(direction) if direction else NO_TURN))
+        if self.on_tick is not None:
+            self.on_tick(tick)
@@ -0,0 +1,142 @@
+import numpy as np
+import pygame
+from typing import List, Tuple
+
+from .simulation import Simulation
+
+# The codes of the cells of Observation.board.
+EMPTY = 0
+BODY = 1
+HEAD = 2
+FRUIT = 3
+WALL = 4
+
+
+class Observation:
+    """
+    The state of a Simulation as NumPy arrays, for agents that learn from the board instead of the screen.
+    Call update() after every tick; the arrays are kept up to date in place, so nothing is rasterised or copied per tick.
+
+    #### Arrays:
+    - board: a (rows, columns) array of uint8 codes over the cells of the collision grid, one of EMPTY, BODY, HEAD, FRUIT or WALL.
+      A cell under the head is HEAD even though it's also a wall at the moment the snake crashes.
+    - counts and walls: views of the collision grid's own arrays (CollisionGrid.counts and walls), shaped like the board.
+      They share memory with the grid, so they are always current, even between calls to update().
+    - pixels(): an optional view of the display's pixels (see pixels()).
+
+    #### Updates:
+    - A tick only changes the cells under the head, the first body piece, the tail and the fruit, before and after the tick.
+      update() rewrites just those cells from SnakeHead.rect, SnakeBody.pieces and Fruit.rect, a few dozen writes whatever the length of the snake.
+    - If the simulation wasn't advanced by exactly one tick since the last update (a restart, or a missed update),
+      the board is rebuilt as a whole with a few vectorized writes. Call reset() after restoring a snapshot.
+    """
+
+    def __init__(self, simulation: Simulation, board: np.ndarray = None) -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation to observe.
+            board (np.ndarray): A contiguous (rows, columns) uint8 array to keep the board in, such as part of a shared memory block
+                                (see VectorEnv). (default: a new array)
+        """
+        self.simulation = simulation
+        grid = simulation.collision_grid
+        shape = (grid.rows, grid.columns)
+
+        if board is None:
+            board = np.zeros(shape, dtype=np.uint8)
+        elif board.shape != shape or board.dtype != np.uint8 or not board.flags.c_contiguous:
+            raise ValueError(f"The board must be a contiguous uint8 array of shape {shape}")
+        self.board: np.ndarray = board
+        self.counts: np.ndarray = np.frombuffer(grid.counts, dtype=np.uint16).reshape(shape)
+        self.walls: np.ndarray = np.frombuffer(grid.walls, dtype=np.uint8).reshape(shape)
+
+        self._cells: np.ndarray = self.board.reshape(-1) # The same memory, indexed by cell
+        self._head: List[int] = []
+        self._tail: List[int] = []
+        self._fruit: List[int] = []
+        self.last_tick: int = None
+
+        self.reset()
+
+    def reset(self) -> np.ndarray:
+        """Rebuild the whole board from the simulation, for instance after a snapshot was restored. Returns the board."""
+        cells = self._cells
+        cells.fill(EMPTY)
+        cells[self.walls.reshape(-1) != 0] = WALL
+        cells[self.counts.reshape(-1) != 0] = BODY
+        self._track()
+        for cell in self._fruit:
+            cells[cell] = FRUIT
+        for cell in self._head:
+            cells[cell] = HEAD
+        return self.board
+
+    def update(self) -> np.ndarray:
+        """Bring the board up to date with the simulation after a tick. Returns the board."""
+        ticks = self.simulation.ticks
+        if ticks == self.last_tick:
+            return self.board
+        if self.last_tick is None or ticks != self.last_tick + 1:
+            return self.reset()
+
+        changed = self._head + self._tail + self._fruit
+        self._track()
+        head, fruit = self._head, self._fruit
+        changed += head + fruit
+        body = self.simulation.snake.body.pieces
+        if body:
+            changed += self._cells_of(body[0].rect)
+
+        grid, cells = self.simulation.collision_grid, self._cells
+        counts, walls = grid.counts, grid.walls
+        for cell in set(changed):
+            if cell in head:
+                cells[cell] = HEAD
+            elif counts[cell]:
+                cells[cell] = BODY
+            elif cell in fruit:
+                cells[cell] = FRUIT
+            elif walls[cell]:
+                cells[cell] = WALL
+            else:
+                cells[cell] = EMPTY
+        return self.board
+
+    def step(self, action: str = None) -> Tuple[bool, bool]:
+        """Step the simulation (see Simulation.step) and update the board."""
+        result = self.simulation.step(action)
+        self.update()
+        return result
+
+    def pixels(self, step: int = 1) -> np.ndarray:
+        """
+        Get a view of the pixels of the display the simulation draws on, as a (height, width, 3) array of RGB values.
+
+        - It is a view of the surface's own memory (pygame.surfarray.pixels3d), transposed and strided without copying,
+          so it shows whatever was drawn last. A step above 1 samples every step-th pixel in both directions, for a cheap downscaled view.
+        - The display stays locked while the view exists, and a locked surface can't be drawn on,
+          so delete the view before the next frame is rendered.
+
+        Parameters:
+            step (int): The distance between the pixels sampled. (default: 1)
+
+        Raises:
+            ValueError: If the simulation runs headless, without a display.
+        """
+        display = self.simulation.display
+        if display is None:
+            raise ValueError("The simulation has no display to get the pixels of")
+        return pygame.surfarray.pixels3d(display)[::step, ::step].transpose(1, 0, 2)
+
+    def _cells_of(self, rect: pygame.Rect) -> List[int]:
+        """Get the cells a Rect overlaps, leaving out the ones outside the grid."""
+        return [cell for cell in self.simulation.collision_grid.cells_of(rect) if cell != -1]
+
+    def _track(self) -> None:
+        """Remember the cells of the head, tail and fruit, whose old cells the next update has to rewrite."""
+        simulation = self.simulation
+        body = simulation.snake.body.pieces
+        self._head = self._cells_of(simulation.snake.head.rect)
+        self._tail = self._cells_of(body[-1].rect) if body else []
+        self._fruit = self._cells_of(simulation.fruit.rect)
+        self.last_tick = simulation.ticks
@@ -0,0 +1,161 @@
+import os
+import io
+import json
+import time
+import pickle
+import threading
+from typing import Callable, Dict
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """An Unpickler that refuses to load any class or function, so only plain data (dicts, numbers, strings...) can be read."""
+
+    def find_class(self, module: str, name: str):
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name}")
+
+
+class GameDataStore:
+    """
+    Persists the game data (such as the high score) as JSON, away from the game loop.
+
+    - save() only hands a copy of the data over and returns right away. A background thread writes the latest data
+      debounce seconds after the first unwritten save, so a burst of saves (a new high score on every fruit) becomes one write.
+    - Writes go to a temporary file that is flushed to disk and then renamed over the real one, so the file is
+      never left half-written, even if the game crashes or the power goes out mid-write.
+    - flush() writes anything pending right away, and close() does so and stops the thread. Call close() when quitting.
+      A write that fails isn't retried and its error is kept in error. The next save() writes the latest data as usual.
+    - The data used to be pickled to legacy_path. If there is no JSON file yet, it is read from there once, without
+      loading anything but plain data.
+    """
+
+    def __init__(self,
+                 path: str,
+                 defaults: Dict = None,
+                 debounce: float = 1.0,
+                 legacy_path: str = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 ) -> None:
+        """
+        Parameters:
+            path (str): The JSON file the data is stored in.
+            defaults (Dict): The data to start with if nothing was stored, or to fill in missing keys. (default: {})
+            debounce (float): How many seconds to wait for more saves before writing. (default: 1.0)
+            legacy_path (str): A pickle file the data may have been stored in before. (default: None)
+            clock (Callable[[], float]): A function returning the current time in seconds. (default: time.monotonic)
+        """
+        self.path = path
+        self.defaults: Dict = dict(defaults) if defaults is not None else {}
+        self.debounce = debounce
+        self.legacy_path = legacy_path
+        self.clock = clock
+
+        self.writes: int = 0
+        self.error: Exception = None # The error of the last failed write, if any. It isn't retried, see the class docstring.
+
+        self.__condition = threading.Condition()
+        self.__pending: Dict = None
+        self.__pending_since: float = 0.0
+        self.__writing: bool = False
+        self.__flushing: bool = False
+        self.__closing: bool = False
+        self.__thread: threading.Thread = None
+
+    def load(self) -> Dict:
+        """
+        Load the stored data, with any missing keys filled in from the defaults.
+
+        Missing, empty or corrupted files give the defaults.
+        """
+        data = dict(self.defaults)
+        try:
+            with open(self.path, "rb") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            stored = self._load_legacy()
+        except (ValueError, UnicodeDecodeError): # Empty or corrupted
+            stored = None
+        if isinstance(stored, dict):
+            data.update(stored)
+        return data
+
+    def _load_legacy(self) -> Dict:
+        """Load the data from the legacy pickle file, if there is one."""
+        if self.legacy_path is None:
+            return None
+        try:
+            with open(self.legacy_path, "rb") as f:
+                return _RestrictedUnpickler(io.BytesIO(f.read())).load()
+        except FileNotFoundError:
+            return None
+        except Exception: # Empty, corrupted or not plain data
+            return None
+
+    def save(self, data: Dict) -> None:
+        """Schedule the data to be written. Returns immediately."""
+        with self.__condition:
+            if self.__closing:
+                raise RuntimeError("The store is closed")
+            if self.__pending is None:
+                self.__pending_since = self.clock()
+            self.__pending = dict(data)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self._run, name="GameDataStore", daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def flush(self) -> None:
+        """Write any pending data now and wait until it is on disk."""
+        with self.__condition:
+            if self.__thread is None:
+                return
+            self.__flushing = True
+            self.__condition.notify_all()
+            while self.__pending is not None or self.__writing:
+                self.__condition.wait()
+            self.__flushing = False
+
+    def close(self) -> None:
+        """Write any pending data and stop the background thread."""
+        with self.__condition:
+            self.__closing = True
+            self.__condition.notify_all()
+            thread = self.__thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        """Write pending data once it has been pending for debounce seconds, or sooner when asked to."""
+        with self.__condition:
+            while True:
+                if self.__pending is None:
+                    if self.__closing:
+                        return
+                    self.__condition.wait()
+                    continue
+                remaining = self.__pending_since + self.debounce - self.clock()
+                if remaining > 0 and not (self.__flushing or self.__closing):
+                    self.__condition.wait(remaining)
+                    continue
+
+                data, self.__pending = self.__pending, None
+                self.__writing = True
+                self.__condition.release()
+                try:
+                    self._write(data)
+                except Exception as e: # Such as an OSError or data json can't serialize. flush() and close() rely on the thread staying up.
+                    self.error = e
+                finally:
+                    self.__condition.acquire()
+                    self.__writing = False
+                    self.__condition.notify_all()
+
+    def _write(self, data: Dict) -> None:
+        """Write the data to a temporary file next to the real one and rename it over the real one."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = os.path.join(directory, f".{os.path.basename(self.path)}.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.writes += 1
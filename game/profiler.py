@@ -0,0 +1,235 @@
+import pygame
+import json
+import time
+import functools
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+
+class _Phase:
+    """Context manager timing one run of a phase for a FrameProfiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start: float = 0.0
+
+    def __enter__(self) -> None:
+        self.start = self.profiler.clock()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.name, self.start, self.profiler.clock())
+
+
+class FrameProfiler:
+    """
+    Opt-in, per-frame instrumentation of the game.
+
+    - Phases are timed either with the phase() context manager or by instrument()-ing a method of an object,
+      which only wraps that method on that one object, so nothing pays for profiling unless it was asked for.
+    - Keeps rolling per-phase timings, frame time percentiles (p50, p99), frame pacing jitter and draw calls per frame
+      over the last window frames.
+    - Every timed phase is also kept as a trace event, which can be exported to a JSON file that Chrome's
+      about://tracing (or Perfetto) can open.
+    - The numbers can be shown as an overlay on top of the game, toggled with overlay_key. export_key exports the trace.
+    """
+
+    def __init__(self,
+                 enabled: bool = True,
+                 window: int = 300,
+                 max_trace_events: int = 100_000,
+                 overlay_key: int = pygame.K_F3,
+                 export_key: int = pygame.K_F4,
+                 trace_path: str = "profile_trace.json",
+                 clock: Callable[[], float] = time.perf_counter,
+                 ) -> None:
+        """
+        Parameters:
+            enabled (bool): Whether anything is recorded. (default: True)
+            window (int): The number of recent frames the rolling statistics are computed over. (default: 300)
+            max_trace_events (int): The number of most recent trace events kept for export. (default: 100000)
+            overlay_key (int): The key that toggles the overlay. (default: pygame.K_F3)
+            export_key (int): The key that exports the trace to trace_path. (default: pygame.K_F4)
+            trace_path (str): The file the trace is exported to with export_key. (default: "profile_trace.json")
+            clock (Callable[[], float]): A function returning the current time in seconds. (default: time.perf_counter)
+        """
+        self.enabled = enabled
+        self.window = window
+        self.overlay_key = overlay_key
+        self.export_key = export_key
+        self.trace_path = trace_path
+        self.clock = clock
+
+        self.overlay_visible: bool = False
+        self.overlay_font: pygame.font.Font = None
+        self.overlay_surface: pygame.Surface = None
+        self.overlay_size: Tuple[int, int] = (0, 0)
+        self.overlay_updated_at: float = 0.0
+
+        self.phases: Dict[str, Deque[float]] = {}
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.draw_calls: Deque[int] = deque(maxlen=window)
+        self.trace_events: Deque[Tuple[str, float, float]] = deque(maxlen=max_trace_events)
+
+        self.__frame_start: float = None
+        self.__frame_draw_calls: int = 0
+        self.__epoch: float = clock()
+
+    def phase(self, name: str) -> _Phase:
+        """Get a context manager that times the code run inside it as the given phase."""
+        return _Phase(self, name)
+
+    def instrument(self, obj: object, method_name: str, phase_name: str = None) -> None:
+        """
+        Time every call to a method of an object as a phase.
+
+        Only the given object is affected: the wrapper is stored as an attribute of the object itself, shadowing the method.
+
+        Parameters:
+            obj (object): The object whose method to time.
+            method_name (str): The name of the method.
+            phase_name (str): The name of the phase. (default: the method name)
+        """
+        method = getattr(obj, method_name)
+        phase = self.phase(phase_name or method_name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return method(*args, **kwargs)
+            with phase:
+                return method(*args, **kwargs)
+
+        setattr(obj, method_name, timed)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Record one run of a phase, given its start and end times."""
+        if not self.enabled:
+            return
+        if name not in self.phases:
+            self.phases[name] = deque(maxlen=self.window)
+        self.phases[name].append(end - start)
+        self.trace_events.append((name, start, end))
+
+    def count_draw_calls(self, count: int = 1) -> None:
+        """Count draw calls (blits, fills and primitive draws) made in the current frame."""
+        self.__frame_draw_calls += count
+
+    def begin_frame(self) -> None:
+        """Mark the start of a new frame. The time since the previous one is recorded as the frame time."""
+        now = self.clock()
+        if self.enabled and self.__frame_start is not None:
+            self.frame_times.append(now - self.__frame_start)
+            self.draw_calls.append(self.__frame_draw_calls)
+            self.trace_events.append(("frame", self.__frame_start, now))
+        self.__frame_start = now
+        self.__frame_draw_calls = 0
+
+    def stats(self) -> Dict:
+        """
+        Get the rolling statistics over the last window frames. Times are in milliseconds.
+
+        Returns:
+            Dict: The keys are 'phases' (mean and max time per call for each phase), 'frame_p50', 'frame_p99',
+                  'jitter' (the mean change in frame time from one frame to the next) and 'draw_calls' (the mean per frame).
+        """
+        phases = {
+            name: {'mean': sum(times) / len(times) * 1000, 'max': max(times) * 1000}
+            for name, times in self.phases.items() if times
+        }
+        stats = {'phases': phases, 'frame_p50': 0.0, 'frame_p99': 0.0, 'jitter': 0.0, 'draw_calls': 0.0}
+        if self.frame_times:
+            frame_times = sorted(self.frame_times)
+            stats['frame_p50'] = frame_times[int(0.50 * (len(frame_times) - 1))] * 1000
+            stats['frame_p99'] = frame_times[int(0.99 * (len(frame_times) - 1))] * 1000
+            ordered = list(self.frame_times)
+            if len(ordered) > 1:
+                stats['jitter'] = sum(abs(b - a) for a, b in zip(ordered, ordered[1:])) / (len(ordered) - 1) * 1000
+            stats['draw_calls'] = sum(self.draw_calls) / len(self.draw_calls)
+        return stats
+
+    def export_chrome_trace(self, path: str = None) -> str:
+        """
+        Write the recorded trace events to a Chrome trace JSON file.
+
+        Parameters:
+            path (str): The file to write to. (default: trace_path)
+
+        Returns:
+            str: The path of the written file.
+        """
+        path = path or self.trace_path
+        events = [
+            {
+                'name': name,
+                'cat': 'frame' if name == 'frame' else 'phase',
+                'ph': 'X',
+                'ts': (start - self.__epoch) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': 0,
+                'tid': 0 if name == 'frame' else 1,
+            }
+            for name, start, end in self.trace_events
+        ]
+        with open(path, "w") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Toggle the overlay or export the trace when their keys are pressed.
+
+        Returns:
+            bool: Whether the overlay was toggled, which means the area behind it should be redrawn.
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == self.overlay_key:
+            self.overlay_visible = not self.overlay_visible
+            self.overlay_surface = None
+            self.overlay_size = (0, 0)
+            return True
+        if event.key == self.export_key:
+            self.export_chrome_trace()
+        return False
+
+    def _overlay_lines(self) -> List[str]:
+        """Get the lines of text shown on the overlay."""
+        stats = self.stats()
+        lines = [
+            f"frame p50 {stats['frame_p50']:.2f} ms  p99 {stats['frame_p99']:.2f} ms",
+            f"jitter {stats['jitter']:.2f} ms  draw calls {stats['draw_calls']:.0f}",
+        ]
+        for name, times in stats['phases'].items():
+            lines.append(f"{name}: {times['mean']:.3f} ms (max {times['max']:.3f})")
+        return lines
+
+    def render_overlay(self, display: pygame.Surface, pos: Tuple[int, int] = (16, 16), refresh: float = 0.25) -> pygame.Rect:
+        """
+        Draw the statistics on an opaque box on the display surface, if the overlay is visible.
+
+        The text is rendered again at most every refresh seconds, so the overlay itself doesn't skew the timings much.
+        The box never shrinks while the overlay is visible, so it always covers what it drew before.
+
+        Returns:
+            pygame.Rect: The area that was drawn on, which is empty when the overlay is hidden.
+        """
+        if not self.overlay_visible:
+            return pygame.Rect(pos, (0, 0))
+        now = self.clock()
+        if self.overlay_surface is None or now - self.overlay_updated_at >= refresh:
+            if self.overlay_font is None:
+                self.overlay_font = pygame.font.Font(None, 22)
+            lines = [self.overlay_font.render(line, True, "white") for line in self._overlay_lines()]
+            width = max(max(line.get_width() for line in lines) + 12, self.overlay_size[0])
+            height = max(sum(line.get_height() for line in lines) + 12, self.overlay_size[1])
+            self.overlay_size = (width, height)
+            self.overlay_surface = pygame.Surface(self.overlay_size)
+            y = 6
+            for line in lines:
+                self.overlay_surface.blit(line, (6, y))
+                y += line.get_height()
+            self.overlay_updated_at = now
+        return display.blit(self.overlay_surface, pos)
@@ -0,0 +1,319 @@
+import os
+import time
+from typing import BinaryIO, List, Tuple
+
+from .simulation import Simulation
+
+MAGIC = b"SNKR"
+VERSION = 2 # 2: fruit is sampled independently of the order spots were freed in (see FreeCellIndex)
+DIRECTIONS = "udlr"
+
+# Codes stored in the low bits of every record, after the four directions
+GAME_OVER = 4
+QUIT = 5
+CODE_BITS = 3
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer in as few bytes as it needs, 7 bits per byte (LEB128)."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Decode a varint (see encode_varint) starting at pos.
+
+    Returns:
+        Tuple[int, int]: The value and the position right after it.
+    """
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return (value, pos)
+
+
+class Replay:
+    """
+    A recorded game: everything needed to simulate it again, exactly as it was played.
+
+    #### Format:
+    - A header: MAGIC, the VERSION byte, then the board width, height and seed as varints and a byte telling
+      whether the snake was already moving when the game started (it is after a restart, but not when the game is opened).
+    - Then one varint per record, holding the ticks since the previous record shifted left by CODE_BITS,
+      with the record's code in the low bits: a direction index into DIRECTIONS for every accepted turn,
+      or GAME_OVER / QUIT followed by the final score as a varint.
+    - A game that was cut short, for instance by a crash, simply has no final record.
+    """
+
+    def __init__(self,
+                 size: Tuple[int, int],
+                 seed: int,
+                 started: bool = False,
+                 turns: List[Tuple[int, str]] = None,
+                 end: Tuple[int, int, bool] = None,
+                 ) -> None:
+        """
+        Parameters:
+            size (Tuple[int, int]): The size of the board the game was played on.
+            seed (int): The seed of the game (see Simulation).
+            started (bool): Whether the snake was moving from the start. (default: False)
+            turns (List[Tuple[int, str]]): The tick every accepted turn was taken at and its direction. (default: no turns)
+            end (Tuple[int, int, bool]): The tick the game ended at, its final score and whether it ended in a game over. (default: None)
+        """
+        self.size = size
+        self.seed = seed
+        self.started = started
+        self.turns: List[Tuple[int, str]] = turns if turns is not None else []
+        self.end = end
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Parse a replay from its binary format."""
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a replay")
+        pos = len(MAGIC)
+        if pos >= len(data) or data[pos] != VERSION:
+            raise ValueError("Unsupported replay version")
+        width, pos = decode_varint(data, pos + 1)
+        height, pos = decode_varint(data, pos)
+        seed, pos = decode_varint(data, pos)
+        if pos >= len(data):
+            raise ValueError("Truncated replay header")
+        replay = cls((width, height), seed, bool(data[pos]))
+        pos += 1
+
+        tick = 0
+        while pos < len(data):
+            try:
+                record, record_end = decode_varint(data, pos)
+                tick += record >> CODE_BITS
+                code = record & ((1 << CODE_BITS) - 1)
+                if code in (GAME_OVER, QUIT):
+                    score, record_end = decode_varint(data, record_end)
+            except ValueError:
+                break # The last record of a game that was cut short may be incomplete.
+            pos = record_end
+            if code < len(DIRECTIONS):
+                replay.turns.append((tick, DIRECTIONS[code]))
+            elif code in (GAME_OVER, QUIT):
+                replay.end = (tick, score, code == GAME_OVER)
+                break
+            else:
+                raise ValueError(f"Unknown record code: {code}")
+        return replay
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """Load a replay from a file."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def to_bytes(self) -> bytes:
+        """Get the binary format of the replay."""
+        out = bytearray(header_bytes(self.size, self.seed, self.started))
+        last_tick = 0
+        for tick, direction in self.turns:
+            out += encode_varint((tick - last_tick) << CODE_BITS | DIRECTIONS.index(direction))
+            last_tick = tick
+        if self.end is not None:
+            tick, score, game_over = self.end
+            out += encode_varint((tick - last_tick) << CODE_BITS | (GAME_OVER if game_over else QUIT))
+            out += encode_varint(score)
+        return bytes(out)
+
+
+def header_bytes(size: Tuple[int, int], seed: int, started: bool) -> bytes:
+    """Get the header of a replay (see Replay)."""
+    return MAGIC + bytes([VERSION]) + encode_varint(size[0]) + encode_varint(size[1]) + encode_varint(seed) + bytes([started])
+
+
+class ReplayWriter:
+    """
+    Writes a single game to a replay file as it is played, one record at a time.
+
+    Records are flushed as soon as they are written, so a game that is cut short still leaves a playable replay behind.
+    """
+
+    def __init__(self, file: BinaryIO, size: Tuple[int, int], seed: int, started: bool) -> None:
+        """
+        Parameters:
+            file (BinaryIO): The file to write to, opened for writing in binary mode. It is closed by close().
+            size (Tuple[int, int]): The size of the board.
+            seed (int): The seed of the game.
+            started (bool): Whether the snake is moving from the start.
+        """
+        self.file = file
+        self.last_tick: int = 0
+        self.turns: int = 0
+        self.ended: bool = False
+        self.file.write(header_bytes(size, seed, started))
+        self.file.flush()
+
+    def turn(self, tick: int, direction: str) -> None:
+        """Record a turn taken before the given tick."""
+        self._write(encode_varint((tick - self.last_tick) << CODE_BITS | DIRECTIONS.index(direction)))
+        self.last_tick = tick
+        self.turns += 1
+
+    def end(self, tick: int, score: int, game_over: bool) -> None:
+        """Record the end of the game, after which nothing else is recorded."""
+        if self.ended:
+            return
+        self._write(encode_varint((tick - self.last_tick) << CODE_BITS | (GAME_OVER if game_over else QUIT)) + encode_varint(score))
+        self.last_tick = tick
+        self.ended = True
+
+    def _write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+
+
+class ReplayRecorder:
+    """
+    Records every game played on a Simulation to its own replay file in a directory.
+
+    - A new file is started whenever the simulation restarts. Its path is kept in path, which doubles as the id of the replay.
+    - A game in which the snake never moved isn't worth keeping, so its file is deleted.
+    - close() must be called when the game is quit, which records the end of the current game.
+    """
+
+    def __init__(self, simulation: Simulation, directory: str = "replays") -> None:
+        """
+        Parameters:
+            simulation (Simulation): The simulation to record.
+            directory (str): The directory the replays are saved to. It is created if it doesn't exist. (default: "replays")
+        """
+        self.simulation = simulation
+        self.directory = directory
+        self.path: str = None
+        self.writer: ReplayWriter = None
+
+        os.makedirs(directory, exist_ok=True)
+        simulation.on_turn = self.turn
+        simulation.on_game_over = self.game_over
+        simulation.on_restart = self.restart
+        self._begin(started=simulation.snake.head.moving)
+
+    def _begin(self, started: bool) -> None:
+        """Start recording a new game from the current state of the simulation."""
+        simulation = self.simulation
+        name = f"replay_{time.strftime('%Y%m%d-%H%M%S')}_{simulation.seed:016x}"
+        self.path = os.path.join(self.directory, name + ".snkr")
+        number = 1
+        while os.path.exists(self.path): # Another game with the same seed in the same second
+            self.path = os.path.join(self.directory, f"{name}_{number}.snkr")
+            number += 1
+        self.writer = ReplayWriter(open(self.path, "wb"), simulation.size, simulation.seed, started)
+
+    def _finish(self, game_over: bool) -> None:
+        """Record the end of the current game and close its file."""
+        if self.writer is None:
+            return
+        if self.writer.turns == 0 and not game_over and not self.writer.ended:
+            self.writer.close()
+            os.remove(self.path)
+        else:
+            self.writer.end(self.simulation.ticks, self.simulation.score, game_over)
+            self.writer.close()
+        self.writer = None
+
+    def turn(self, direction: str) -> None:
+        """Record an accepted turn. Called by the simulation."""
+        if self.writer is not None:
+            self.writer.turn(self.simulation.ticks, direction)
+
+    def game_over(self) -> None:
+        """Record the end of the game. Called by the simulation."""
+        self._finish(game_over=True)
+
+    def restart(self) -> None:
+        """Start recording the new game. Called by the simulation."""
+        self._finish(game_over=False)
+        self._begin(started=True)
+
+    def close(self) -> None:
+        """Record the end of the current game, if it hasn't ended yet, and stop recording."""
+        self._finish(game_over=False)
+        self.simulation.on_turn = self.simulation.on_game_over = self.simulation.on_restart = None
+
+
+class ReplayPlayer:
+    """
+    Plays a replay back by simulating it again, tick by tick, on a Simulation set up with its seed.
+
+    Nothing is rendered by the player itself. Run it at full speed with run(), or call apply_turns() and step
+    the simulation some other way, such as through Game.update(), to render it at any speed.
+    """
+
+    def __init__(self, replay: Replay, simulation: Simulation = None) -> None:
+        """
+        Parameters:
+            replay (Replay): The replay to play.
+            simulation (Simulation): A fresh simulation created with the size and seed of the replay. (default: a new headless one)
+        """
+        self.replay = replay
+        self.simulation = simulation if simulation is not None else Simulation(size=replay.size, seed=replay.seed)
+        if replay.started:
+            self.simulation.snake.start()
+        self.__next_turn: int = 0
+
+    @property
+    def finished(self) -> bool:
+        """Check if the whole replay has been played."""
+        simulation = self.simulation
+        if self.replay.end is not None:
+            return simulation.ticks >= self.replay.end[0]
+        # A replay without an end plays until the snake can't move anymore.
+        return self.__next_turn >= len(self.replay.turns) and (simulation.game_over or not simulation.snake.head.moving)
+
+    def apply_turns(self) -> None:
+        """Take the turns recorded before the coming tick."""
+        turns, simulation = self.replay.turns, self.simulation
+        while self.__next_turn < len(turns) and turns[self.__next_turn][0] <= simulation.ticks:
+            simulation.turn(turns[self.__next_turn][1])
+            self.__next_turn += 1
+
+    def step(self) -> bool:
+        """
+        Play one tick of the replay.
+
+        Returns:
+            bool: Whether there is anything left to play.
+        """
+        self.apply_turns()
+        if self.finished:
+            return False
+        self.simulation.step()
+        return not self.finished
+
+    def run(self) -> Simulation:
+        """Play the rest of the replay as fast as possible and return the simulation in its final state."""
+        while self.step():
+            pass
+        return self.simulation
+
+    def verify(self) -> bool:
+        """Play the rest of the replay and check that it ends with the recorded score and outcome."""
+        simulation = self.run()
+        if self.replay.end is None:
+            return True
+        tick, score, game_over = self.replay.end
+        return simulation.ticks == tick and simulation.score == score and simulation.game_over == game_over
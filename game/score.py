@@ -1,5 +1,5 @@
 import pygame
-from typing import Callable, Tuple, List
+from typing import Callable, Tuple, List, Union
 
 
 class Score:
@@ -7,11 +7,13 @@ class Score:
     This class handles the management and rendering of the score and highscore in the game.
     It provides methods to increment and reset the score, as well as rendering the score and
     highscore on a display surface.
+    
+    The text surfaces of the score and highscore are kept between frames and only rendered again when their text changes.
     """
     def __init__(self,
                  display: pygame.Surface,
-                 score_icon_path: pygame.Surface,
-                 highscore_icon_path: pygame.Surface,
+                 score_icon_path: Union[str, pygame.Surface],
+                 highscore_icon_path: Union[str, pygame.Surface],
                  font: pygame.font.Font,
                  spacing: int = 10,
                  icon_size: Tuple[int, int] = None,
@@ -19,8 +21,8 @@ class Score:
         """
         Parameters:
             display (pygame.Surface): The display surface to render the score on.
-            score_icon_path (str): The file path to the score icon image.
-            highscore_icon_path (str): The file path to the highscore icon image.
+            score_icon_path (Union[str, pygame.Surface]): The file path to the score icon image, or the image itself.
+            highscore_icon_path (Union[str, pygame.Surface]): The file path to the highscore icon image, or the image itself.
             font (pygame.font.Font): The font used for rendering the score and highscore.
             spacing (int): The spacing between the icon and the score/highscore. (default: 10)
             icon_size (Tuple[int, int]): The size of the score/highscore icons. (default: (32, 32))
@@ -32,11 +34,8 @@ class Score:
         if self.icon_size is None:
             self.icon_size = (32, 32)
             
-        self.score_icon = pygame.image.load(score_icon_path).convert_alpha()
-        self.score_icon = pygame.transform.scale(self.score_icon, self.icon_size)
-        
-        self.highscore_icon = pygame.image.load(highscore_icon_path).convert_alpha()
-        self.highscore_icon = pygame.transform.scale(self.highscore_icon, self.icon_size)
+        self.score_icon = self.__load_icon(score_icon_path)
+        self.highscore_icon = self.__load_icon(highscore_icon_path)
         
         self.on_new_highscore: Callable = None
         
@@ -44,6 +43,18 @@ class Score:
         self._score: int = 0
         self.highscore: int = 0
         
+        # The last text rendered for the score and highscore, along with its surface
+        self.__score_surface: Tuple[str, pygame.Surface] = ("", None)
+        self.__highscore_surface: Tuple[str, pygame.Surface] = ("", None)
+        
+    def __load_icon(self, icon: Union[str, pygame.Surface]) -> pygame.Surface:
+        """Load an icon from a file if it isn't loaded already, and scale it to the icon size unless it already has that size."""
+        if isinstance(icon, str):
+            icon = pygame.image.load(icon).convert_alpha()
+        if icon.get_size() != tuple(self.icon_size):
+            icon = pygame.transform.scale(icon, self.icon_size)
+        return icon
+        
     @property
     def score(self) -> int:
         return self._score
@@ -103,7 +114,9 @@ class Score:
             text (str): The text template for the score. '$' is replaced with self.score. (default: "$")
         """
         text = text.replace("$", str(self.score))
-        score_font = self.font.render(text, True, "white")
+        if self.__score_surface[0] != text or self.__score_surface[1] is None:
+            self.__score_surface = (text, self.font.render(text, True, "white"))
+        score_font = self.__score_surface[1]
         icon_rect, font_rect = self.__get_rects(
             icon=self.score_icon,
             font=score_font,
@@ -125,7 +138,9 @@ class Score:
             text (str): The text template for the highscore. '$' is replaced with self.highscore. (default: "$")
         """
         text = text.replace("$", str(self.highscore))
-        highscore_font = self.font.render(text, True, "white")
+        if self.__highscore_surface[0] != text or self.__highscore_surface[1] is None:
+            self.__highscore_surface = (text, self.font.render(text, True, "white"))
+        highscore_font = self.__highscore_surface[1]
         icon_rect, font_rect = self.__get_rects(
             icon=self.highscore_icon,
             font=highscore_font,
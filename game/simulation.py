@@ -0,0 +1,206 @@
+import pygame
+import random
+from typing import Callable, Tuple
+
+from sprites.snake import Snake
+from sprites.fruit import Fruit
+from .boundary import Boundary
+from .gameover import GameOver
+from .collision import CollisionGrid
+from .snapshot import take_snapshot, restore_snapshot
+
+
+class Simulation:
+    """
+    - The display-free core of the snake game. It owns the snake, fruit, boundary and game over state and advances them one tick at a time with step().
+    - Nothing in here draws, loads fonts or loads images, so it can run headless for bots and regression tests.
+    - Rendering is done by a separate consumer of its state (see Game).
+    - Every game is fully determined by its seed and the turns taken at each tick, which is what a replay records (see ReplayRecorder).
+      on_turn, on_game_over and on_restart are called when those happen.
+    """
+
+    def __init__(self,
+                 size: Tuple[int, int] = (1150, 760),
+                 seed: int = None,
+                 display: pygame.Surface = None,
+                 ) -> None:
+        """
+        Parameters:
+            size (Tuple[int, int]): The width and height of the playing area, boundary included. (default: (1150, 760))
+            seed (int): The seed for the random number generator that places the fruit. (default: a random seed)
+            display (pygame.Surface): The surface the game objects will be rendered on, if any. Leave it as None to run headless. (default: None)
+        """
+        self.size = size
+        self.seed: int = seed if seed is not None else random.getrandbits(64)
+        self.display = display
+        self.rng = random.Random(self.seed)
+
+        # Types
+        self.snake: Snake
+        self.fruit: Fruit
+        self.boundary: Boundary
+        self.gameover_handler: GameOver
+        self.collision_grid: CollisionGrid
+
+        self.score: int = 0
+        self.ticks: int = 0
+
+        self.on_turn: Callable[[str], None] = None
+        self.on_game_over: Callable[[], None] = None
+        self.on_restart: Callable[[], None] = None
+
+        self._load_game_objects()
+
+    def _load_game_objects(self) -> None:
+        """Initialize the necessary game objects."""
+        self.snake = Snake(self.display, 60, 60, outline_width=2)
+        self.fruit = Fruit(self.display, 20, 20, rng=self.rng)
+        self.boundary = Boundary(self.display, size=self.size)
+        self.collision_grid = CollisionGrid(
+            boundary = self.boundary,
+            cell_size = self.snake.body.piece_width,
+            origin = self.snake.head.rect.topleft,
+            spot_size = (self.fruit.width, self.fruit.height),
+        )
+        self.snake.body.on_piece_added = lambda piece: self.collision_grid.add(piece.rect)
+        self.snake.body.on_piece_removed = lambda piece: self.collision_grid.remove(piece.rect)
+        self.gameover_handler = GameOver(
+            snake = self.snake,
+            boundary = self.boundary,
+            collision_grid = self.collision_grid,
+            gameover_callback = self.snake.stop,
+            restart_callback = self.restart,
+        )
+        self.change_fruit_pos()
+
+    @property
+    def game_over(self) -> bool:
+        """Get the game over status."""
+        return self.gameover_handler.game_over
+
+    def point(self) -> bool:
+        """
+        Check if the snake collides with the fruit and update the score and snake.
+
+        If the snake's head collides with the fruit, the snake is extended, the fruit position is changed,
+        and the score is incremented.
+
+        Returns:
+            bool: Whether the snake ate the fruit.
+        """
+        if self.collision_grid.hits_fruit(self.snake.head.rect):
+            self.snake.extend()
+            self.change_fruit_pos()
+            self.score += 1
+            return True
+        return False
+
+    def change_fruit_pos(self) -> None:
+        """
+        Move the fruit to a random free spot on the grid, so that it is aligned with the snake's movement
+        and never lands on the snake or a wall.
+
+        If the snake has filled the whole board, the fruit is moved off the board.
+        """
+        # The head isn't tracked by the grid, so it's added just for the lookup.
+        self.collision_grid.add(self.snake.head.rect)
+        pos = self.collision_grid.random_free_spot(self.rng)
+        self.collision_grid.remove(self.snake.head.rect)
+
+        if pos is None:
+            pos = (-self.fruit.width, -self.fruit.height)
+        self.fruit.set_pos_to(pos)
+        self.collision_grid.set_fruit(self.fruit.rect)
+
+    def restart(self, seed: int = None) -> None:
+        """
+        Restart the snake game.
+
+        Parameters:
+            seed (int): The seed for the new game. (default: a seed drawn from the random number generator of the last game)
+        """
+        self.seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.rng.seed(self.seed)
+        self.score = 0
+        self.ticks = 0
+        self.snake.reset()
+        self.change_fruit_pos()
+        self.snake.start()
+        if self.on_restart is not None:
+            self.on_restart()
+
+    def snapshot(self) -> bytes:
+        """
+        Save the complete state of the game (the snake, pending growth, fruit, score, ticks, game over state
+        and RNG) into a compact byte buffer, to be restored with restore(), which rebuilds the collision grid from the snake.
+
+        Restoring a snapshot and stepping it with the same actions plays out exactly like the original game did,
+        which makes snapshots usable for save states, rewinding and branching search. See take_snapshot() for the layout.
+        """
+        return take_snapshot(self)
+
+    def restore(self, data: bytes) -> None:
+        """
+        Restore the state of the game from a snapshot taken by snapshot() on a board of the same size.
+
+        Raises:
+            ValueError: If the data isn't a snapshot or was taken on a board of another size.
+        """
+        restore_snapshot(self, data)
+
+    def turn(self, direction: str) -> bool:
+        """
+        Turn the snake towards the given direction, the same way an arrow key press does.
+
+        - The snake can't reverse into itself, unless it has no body yet.
+        - The first turn after opening the game also starts the snake, unless the game is over.
+
+        Parameters:
+            direction (str): 'u' for up, 'd' for down, 'l' for left or 'r' for right.
+
+        Returns:
+            bool: Whether the turn was accepted.
+        """
+        opposite = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}
+        if direction not in opposite:
+            raise ValueError(f"Invalid direction: {direction}")
+        if self.snake.direction == opposite[direction] and len(self.snake.body) != 0:
+            return False
+
+        # Snake().start() doesn't do anything if it is already started,
+        # so it's safe to call it on every turn while the game_over flag is set to False.
+        if not self.gameover_handler.game_over:
+            self.snake.start()
+
+        if direction == 'u': self.snake.up()
+        elif direction == 'd': self.snake.down()
+        elif direction == 'l': self.snake.left()
+        elif direction == 'r': self.snake.right()
+        accepted = self.snake.head.moving
+        if accepted and self.on_turn is not None:
+            self.on_turn(direction)
+        return accepted
+
+    def step(self, action: str = None) -> Tuple[bool, bool]:
+        """
+        Advance the game by one tick.
+
+        The snake is turned according to the action (if any) and moved, then the game over
+        conditions are checked and the fruit is eaten if the head reached it.
+
+        Parameters:
+            action (str): The direction to turn to before moving ('u', 'd', 'l' or 'r'), or None to keep going. (default: None)
+
+        Returns:
+            Tuple[bool, bool]: Whether the snake ate the fruit this tick and whether the game is over.
+        """
+        if action is not None:
+            self.turn(action)
+        self.ticks += 1
+        self.snake.move()
+        was_over = self.gameover_handler.game_over
+        self.gameover_handler.handle_game_over()
+        scored = self.point()
+        if self.gameover_handler.game_over and not was_over and self.on_game_over is not None:
+            self.on_game_over()
+        return (scored, self.gameover_handler.game_over)
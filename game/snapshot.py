@@ -0,0 +1,124 @@
+import struct
+from array import array
+from typing import TYPE_CHECKING
+
+from .gameover import GameOver
+
+if TYPE_CHECKING:
+    from .simulation import Simulation
+
+MAGIC = b"SNKS"
+VERSION = 3
+DIRECTIONS = "udlr"
+REASONS = ("", GameOver.SELF_COLLISION_REASON, GameOver.BOUNDARY_REASON)
+RNG_STATE_SIZE = 625
+
+# magic, version, grid columns and rows,
+# head x, y, direction and whether the head and body are moving, pieces to grow to, number of pieces,
+# score, ticks, seed, game over flag and reason, fruit x and y, gauss_next of the RNG (flag and value)
+HEADER = struct.Struct("=4sBII" "iiBBBII" "IQQBBii" "Bd")
+
+
+def take_snapshot(simulation: "Simulation") -> bytes:
+    """
+    Serialize the complete state of a simulation into a fixed-layout byte buffer (see Simulation.snapshot).
+
+    The collision grid isn't stored: it follows from the walls and the body pieces and is rebuilt on restore.
+    The fruit is sampled independently of the history of the grid (see FreeCellIndex), so the rebuilt grid draws the same fruit.
+
+    #### Layout:
+    - HEADER, in native byte order with standard sizes.
+    - The internal state of the RNG (625 uint32).
+    - The x and y of every body piece (int32 each), ordered from the piece right behind the head to the tail.
+    - The direction of every body piece (uint8), as an index into DIRECTIONS.
+    """
+    snake, fruit, grid = simulation.snake, simulation.fruit, simulation.collision_grid
+    head, pieces = snake.head, snake.body.pieces
+    gameover_handler = simulation.gameover_handler
+    _, rng_state, gauss_next = simulation.rng.getstate()
+
+    header = HEADER.pack(
+        MAGIC, VERSION, grid.columns, grid.rows,
+        head.rect.x, head.rect.y, DIRECTIONS.index(head.direction), head.moving, snake.body.moving,
+        snake.body.no_pieces, len(pieces),
+        simulation.score, simulation.ticks, simulation.seed % 2**64,
+        gameover_handler.game_over, REASONS.index(gameover_handler.reason),
+        fruit.rect.x, fruit.rect.y,
+        gauss_next is not None, gauss_next or 0.0,
+    )
+    return b"".join((
+        header,
+        array('I', rng_state).tobytes(),
+        array('i', [piece.rect.x for piece in pieces]).tobytes(),
+        array('i', [piece.rect.y for piece in pieces]).tobytes(),
+        bytes([DIRECTIONS.index(piece.direction) for piece in pieces]),
+    ))
+
+
+def restore_snapshot(simulation: "Simulation", data: bytes) -> None:
+    """
+    Restore a simulation to the state saved in a snapshot taken by take_snapshot().
+
+    Raises:
+        ValueError: If the data isn't a snapshot or was taken on a board of another size.
+    """
+    grid = simulation.collision_grid
+    if len(data) < HEADER.size:
+        raise ValueError("Not a snapshot")
+    (magic, version, columns, rows,
+     head_x, head_y, head_direction, head_moving, body_moving, no_pieces, piece_count,
+     score, ticks, seed, game_over, reason, fruit_x, fruit_y,
+     has_gauss, gauss_next) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a snapshot")
+    if (columns, rows) != (grid.columns, grid.rows):
+        raise ValueError("The snapshot was taken on a board of another size")
+
+    view = memoryview(data)
+    pos = HEADER.size
+
+    def take(count: int, itemsize: int) -> memoryview:
+        nonlocal pos
+        end = pos + count * itemsize
+        if end > len(data):
+            raise ValueError("Truncated snapshot")
+        values = view[pos:end]
+        pos = end
+        return values
+
+    rng_state = take(RNG_STATE_SIZE, 4).cast('I')
+    xs = take(piece_count, 4).cast('i')
+    ys = take(piece_count, 4).cast('i')
+    directions = take(piece_count, 1)
+
+    snake, head = simulation.snake, simulation.snake.head
+    head.rect.topleft = (head_x, head_y)
+    head.direction = DIRECTIONS[head_direction]
+    if head_moving:
+        head.start()
+    else:
+        head.stop()
+    if body_moving:
+        snake.body.start()
+    else:
+        snake.body.stop()
+    snake.body.restore(zip(xs, ys, (DIRECTIONS[direction] for direction in directions)))
+    snake.body.no_pieces = no_pieces
+
+    # Anything following the grid through on_cell_changed (see Autopilot) has to be reset after a restore anyway.
+    on_cell_changed, grid.on_cell_changed = grid.on_cell_changed, None
+    grid.clear()
+    for piece in snake.body.pieces:
+        grid.add(piece.rect)
+    grid.on_cell_changed = on_cell_changed
+
+    simulation.fruit.set_pos_to((fruit_x, fruit_y))
+    grid.set_fruit(simulation.fruit.rect)
+
+    simulation.score = score
+    simulation.ticks = ticks
+    simulation.seed = seed
+    simulation.gameover_handler.game_over = bool(game_over)
+    simulation.gameover_handler.reason = REASONS[reason]
+    simulation.rng.setstate((3, tuple(rng_state), gauss_next if has_gauss else None))
+
@@ -0,0 +1,66 @@
+import time
+from typing import Callable
+
+
+class FixedTimestep:
+    """
+    Schedules game logic ticks at a fixed rate, independent of how often frames are rendered.
+
+    - The real time that passed since the last frame is added to an accumulator, and every whole tick
+      in it is handed out to be simulated. Whatever is left carries over to the next frame.
+    - At most max_ticks_per_frame ticks are handed out per frame. If more are owed, after a stalled frame or
+      on a machine too slow to keep up, the rest are dropped. Catching up on all of them would make the next
+      frame even longer and the game would never recover (the "spiral of death").
+    - alpha tells how far the current time is between the last tick and the next one, so that rendering can
+      interpolate between the two.
+    """
+
+    def __init__(self,
+                 tick_rate: float,
+                 max_ticks_per_frame: int = 5,
+                 clock: Callable[[], float] = time.perf_counter,
+                 ) -> None:
+        """
+        Parameters:
+            tick_rate (float): The number of logic ticks per second.
+            max_ticks_per_frame (int): The most ticks handed out for a single frame. (default: 5)
+            clock (Callable[[], float]): A function returning the current time in seconds. (default: time.perf_counter)
+        """
+        self.tick_duration: float = 1 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+
+        self.accumulator: float = 0.0
+        self.last_time: float = None
+        self.ticks: int = 0
+        self.dropped_ticks: int = 0
+
+    def advance(self) -> int:
+        """
+        Account for the time that passed since the last call.
+
+        Returns:
+            int: The number of ticks to simulate before rendering this frame.
+        """
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        owed = int(self.accumulator / self.tick_duration)
+        ticks = min(owed, self.max_ticks_per_frame)
+        self.accumulator -= owed * self.tick_duration
+        self.dropped_ticks += owed - ticks
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """Get how far the current time is between the last tick (0.0) and the next one (1.0)."""
+        return min(self.accumulator / self.tick_duration, 1.0)
+
+    def reset(self) -> None:
+        """Forget the time accumulated so far, for instance after the game was paused."""
+        self.accumulator = 0.0
+        self.last_time = None
@@ -0,0 +1,130 @@
+import time
+import os
+import inspect
+import importlib
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from .simulation import Simulation
+
+TICK_LIMIT_REASON = "TICK LIMIT REACHED"
+
+
+def load_agent(spec: str) -> Callable:
+    """
+    Import an agent from a "module:name" spec, such as "game.agents:greedy_agent".
+
+    An agent is a callable that is given the Simulation before every tick and returns the direction to turn to
+    ('u', 'd', 'l' or 'r'), or None to keep going. If the spec names a class, a new instance of it plays each game
+    (see build_agent()).
+    """
+    module_name, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"Agent spec must look like 'module:name', got {spec!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def build_agent(agent: Callable, seed: int = None) -> Callable:
+    """
+    Get the agent to play a game with: a new instance if the agent is a class, given the seed of the game if it takes
+    a seed argument (see RandomAgent), so that games played with a random agent can be reproduced from their seeds.
+    """
+    if not isinstance(agent, type):
+        return agent
+    if "seed" in inspect.signature(agent).parameters:
+        return agent(seed=seed)
+    return agent()
+
+
+def play_game(agent: Callable, seed: int, size: Tuple[int, int] = (1150, 760), max_ticks: int = 100_000) -> Tuple[int, int, str]:
+    """
+    Play a headless game with an agent, under the same rules as the real game.
+    The snake starts moving straight away, as it does in a restarted game, so the agent may keep going from its first call.
+
+    Returns:
+        Tuple[int, int, str]: The score, the number of ticks survived and the reason the game ended
+                              (see GameOver.check_game_over), or TICK_LIMIT_REASON if it lasted max_ticks.
+    """
+    agent = build_agent(agent, seed)
+    simulation = Simulation(size=size, seed=seed)
+    simulation.snake.start()
+    while simulation.ticks < max_ticks:
+        _, game_over = simulation.step(agent(simulation))
+        if game_over:
+            return (simulation.score, simulation.ticks, simulation.gameover_handler.reason)
+    return (simulation.score, simulation.ticks, TICK_LIMIT_REASON)
+
+
+def _play_games(task: Tuple[str, List[int], Tuple[int, int], int]) -> List[Tuple[int, int, str]]:
+    """Play a game for every seed with the agent of the spec. Runs in a worker process."""
+    spec, seeds, size, max_ticks = task
+    agent = load_agent(spec)
+    return [play_game(agent, seed, size, max_ticks) for seed in seeds]
+
+
+def summarize(results: List[Tuple[int, int, str]], elapsed: float) -> Dict:
+    """Aggregate the results of play_game() for one agent, played in elapsed seconds."""
+    scores = [score for score, _, _ in results]
+    ticks = [ticks for _, ticks, _ in results]
+    reasons: Dict[str, int] = {}
+    for _, _, reason in results:
+        reasons[reason] = reasons.get(reason, 0) + 1
+    return {
+        'games': len(results),
+        'mean_score': statistics.fmean(scores),
+        'median_score': statistics.median(scores),
+        'max_score': max(scores),
+        'mean_ticks': statistics.fmean(ticks),
+        'median_ticks': statistics.median(ticks),
+        'reasons': reasons,
+        'elapsed': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed else 0.0,
+    }
+
+
+def run_tournament(agent_specs: List[str],
+                   games: int,
+                   seed: int = 0,
+                   workers: int = None,
+                   size: Tuple[int, int] = (1150, 760),
+                   max_ticks: int = 100_000,
+                   chunk_size: int = None,
+                   ) -> Dict[str, Dict]:
+    """
+    Play games with every agent across a pool of worker processes and aggregate the results per agent.
+
+    - Every agent plays the same games: game i is seeded with seed + i, so all agents get the same fruit placements
+      as long as they play the same way.
+    - Agents are given as "module:name" specs (see load_agent), since the workers import them on their own.
+    - The agents are played one after another, each on the whole pool, so games_per_second is the throughput of that agent alone.
+
+    Parameters:
+        agent_specs (List[str]): The agents to play.
+        games (int): The number of games each agent plays.
+        seed (int): The seed of the first game. (default: 0)
+        workers (int): The number of worker processes. (default: the number of CPUs)
+        size (Tuple[int, int]): The size of the board. (default: (1150, 760))
+        max_ticks (int): Games still running after this many ticks are ended. (default: 100000)
+        chunk_size (int): The number of games handed to a worker at a time. (default: enough for about 4 chunks per worker)
+
+    Returns:
+        Dict[str, Dict]: The summary of each agent (see summarize()), keyed by its spec.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-games // (workers * 4)))
+    seeds = list(range(seed, seed + games))
+    chunks = [seeds[start:start + chunk_size] for start in range(0, games, chunk_size)]
+
+    for spec in agent_specs:
+        load_agent(spec) # Fail early on a bad spec, instead of in every worker
+
+    summaries: Dict[str, Dict] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for spec in agent_specs:
+            start = time.perf_counter()
+            results = []
+            for chunk_results in executor.map(_play_games, [(spec, chunk, size, max_ticks) for chunk in chunks]):
+                results.extend(chunk_results)
+            summaries[spec] = summarize(results, time.perf_counter() - start)
+    return summaries
@@ -1,4 +1,6 @@
-from typing import Tuple, List
+import pygame
+import functools
+from typing import Tuple, List, Union
 
 def center_of(coords: Tuple[int, int]) -> float:
     """
@@ -18,3 +20,24 @@ def center_of_rect(x_coords: Tuple[int, int], y_coords: Tuple[int, int]) -> List
         y_coords (Tuple[int, int]): The start_y, end_y of the rectangle.
     """
     return [center_of(x_coords), center_of(y_coords)]
+
+
+@functools.lru_cache(maxsize=128)
+def render_text(font: pygame.font.Font, 
+                text: str, 
+                antialias: bool, 
+                color: Union[str, Tuple[int, int, int]]
+                ) -> pygame.Surface:
+    """
+    Render text with a font, reusing the surface rendered last time for the same arguments.
+    
+    - Font rasterisation is expensive and most of the text in the game never changes, so the surfaces are kept in an LRU cache.
+    - The returned surface is shared between callers and must not be drawn on.
+    
+    Parameters:
+        font (pygame.font.Font): The font to render the text with.
+        text (str): The text to render.
+        antialias (bool): Whether the text is antialiased.
+        color (Union[str, Tuple[int, int, int]]): The color of the text. It must be hashable, so pygame.Color objects aren't accepted.
+    """
+    return font.render(text, antialias, color)
\ No newline at end of file
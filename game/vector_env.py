@@ -0,0 +1,253 @@
+import os
+import time
+import numpy as np
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+from .simulation import Simulation
+from .observation import Observation
+
+DIRECTIONS = "udlr"
+CLOSE = -1 # The command that tells a worker to exit
+SPINS = 200 # Polls of a counter in a tight loop, before waiting starts to yield the CPU between polls
+YIELDS = 2000 # Polls of a counter yielding the CPU in between, before waiting starts to sleep between polls
+SLEEP = 0.0001
+CACHE_LINE = 64 # Each worker's counters get a line of their own, so the workers don't slow each other down writing them
+
+_yield = getattr(os, "sched_yield", lambda: time.sleep(0))
+
+Layout = Dict[str, Tuple[int, Tuple[int, ...], np.dtype]]
+
+
+def _layout(num_envs: int, workers: int, board_shape: Tuple[int, int]) -> Tuple[int, Layout]:
+    """
+    Lay out the arrays of a VectorEnv in one shared memory block.
+
+    Returns:
+        Tuple[int, Layout]: The size of the block and the offset, shape and dtype of every array by name.
+    """
+    counter_shape = (workers, CACHE_LINE // 8)
+    fields = (
+        ('observations', (num_envs, *board_shape), np.dtype(np.uint8)),
+        ('rewards', (num_envs,), np.dtype(np.float32)),
+        ('dones', (num_envs,), np.dtype(bool)),
+        ('final_scores', (num_envs,), np.dtype(np.int32)),
+        ('actions', (num_envs,), np.dtype(np.int8)),
+        ('commands', counter_shape, np.dtype(np.int64)),
+        ('acks', counter_shape, np.dtype(np.int64)),
+    )
+    layout: Layout = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        offset = -(-offset // CACHE_LINE) * CACHE_LINE
+        layout[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return (offset, layout)
+
+
+def _arrays(shared_memory: SharedMemory, layout: Layout) -> Dict[str, np.ndarray]:
+    """Get the arrays of a layout as views of a shared memory block."""
+    return {name: np.ndarray(shape, dtype, buffer=shared_memory.buf, offset=offset) for name, (offset, shape, dtype) in layout.items()}
+
+
+def _wait(counter: np.ndarray, index: int, old: int, process: multiprocessing.process.BaseProcess = None) -> int:
+    """
+    Wait for a counter to change from old, polling it without locks, and return its new value.
+
+    Raises:
+        RuntimeError: If the process expected to change the counter exits first.
+    """
+    polls = 0
+    value = int(counter[index, 0])
+    while value == old:
+        polls += 1
+        if polls > SPINS:
+            # Yielding lets the other side run right away when it shares the core, which matters once there are more processes than cores.
+            if polls <= SPINS + YIELDS:
+                _yield()
+            else:
+                if process is not None and not process.is_alive():
+                    raise RuntimeError(f"{process.name} exited with code {process.exitcode}")
+                time.sleep(SLEEP)
+        value = int(counter[index, 0])
+    return value
+
+
+def _run_worker(name: str,
+                layout: Layout,
+                worker: int,
+                envs: List[int],
+                size: Tuple[int, int],
+                seed: int,
+                max_ticks: int,
+                ) -> None:
+    """Attach to the shared memory block and serve steps until the trainer closes it. Runs in a worker process."""
+    shared_memory = SharedMemory(name)
+    _serve(_arrays(shared_memory, layout), worker, envs, size, seed, max_ticks)
+    shared_memory.close() # Only once _serve() returned, since the block can't be closed while views of it exist
+
+
+def _serve(arrays: Dict[str, np.ndarray], worker: int, envs: List[int], size: Tuple[int, int], seed: int, max_ticks: int) -> None:
+    """Step the simulations of a range of environments whenever the trainer bumps this worker's command."""
+    observations, rewards, dones = arrays['observations'], arrays['rewards'], arrays['dones']
+    final_scores, actions = arrays['final_scores'], arrays['actions']
+    commands, acks = arrays['commands'], arrays['acks']
+
+    simulations = [Simulation(size=size, seed=seed + env) for env in envs]
+    trackers = [Observation(simulation, board=observations[env]) for env, simulation in zip(envs, simulations)]
+    parent = multiprocessing.parent_process()
+    acks[worker, 0] = 0 # Ready
+
+    command = 0
+    while True:
+        command = _wait(commands, worker, command, parent)
+        if command == CLOSE:
+            return
+        for env, simulation, tracker in zip(envs, simulations, trackers):
+            action = int(actions[env])
+            scored, game_over = simulation.step(DIRECTIONS[action] if 0 <= action < 4 else None)
+            rewards[env] = -1.0 if game_over else float(scored)
+            done = game_over or simulation.ticks >= max_ticks
+            dones[env] = done
+            if done:
+                final_scores[env] = simulation.score
+                if game_over:
+                    simulation.gameover_handler.reset()
+                else:
+                    simulation.restart()
+            tracker.update()
+        acks[worker, 0] = command # Written last, so the trainer sees the results before the ack
+
+
+class VectorEnv:
+    """
+    Runs many games in worker processes and exchanges observations, rewards and actions with them through
+    one shared memory block, so stepping the whole batch pickles nothing and copies nothing between processes.
+
+    - Every environment is a Simulation under the rules of the real game, observed through an Observation whose
+      board lives in the shared block. The trainer reads the boards of all environments as one (num_envs, rows, columns) array.
+    - Actions are indices into DIRECTIONS ('u', 'd', 'l', 'r'); anything else keeps going. A step rewards 1 for eating the fruit,
+      -1 for dying and 0 otherwise.
+    - Environments that end (by dying, or after max_ticks) are restarted right away: done is set, the final score is kept in
+      final_scores and the observation is already the first one of the next game.
+
+    #### Synchronization:
+    - The trainer writes the actions into a slot array, then bumps each worker's command counter. Each worker waits for its
+      counter to change, steps its environments, writes their results and then sets its ack counter to the command.
+      No locks, pipes or queues are involved: each counter has a single writer, and data is always written before the counter that publishes it.
+    - Waiting polls the counter, first in a tight loop and then with short sleeps, so idle workers don't keep a core busy.
+    - The arrays returned by reset() and step() are views of the shared block and are overwritten by the next step. Copy them to keep them.
+    """
+
+    def __init__(self,
+                 num_envs: int,
+                 workers: int = None,
+                 size: Tuple[int, int] = (1150, 760),
+                 seed: int = 0,
+                 max_ticks: int = 10_000,
+                 ) -> None:
+        """
+        Parameters:
+            num_envs (int): The number of games to run.
+            workers (int): The number of worker processes. (default: the number of CPUs, or num_envs if that's smaller)
+            size (Tuple[int, int]): The size of the board. (default: (1150, 760))
+            seed (int): Environment i is seeded with seed + i. Later games draw their seeds from the game before. (default: 0)
+            max_ticks (int): Games still running after this many ticks are ended. (default: 10000)
+        """
+        template = Simulation(size=size).collision_grid
+        self.num_envs = num_envs
+        self.workers = max(1, min(workers or os.cpu_count() or 1, num_envs))
+        self.board_shape: Tuple[int, int] = (template.rows, template.columns)
+
+        block_size, self._layout = _layout(num_envs, self.workers, self.board_shape)
+        self._shared_memory = SharedMemory(create=True, size=block_size)
+        arrays = _arrays(self._shared_memory, self._layout)
+        self.observations: np.ndarray = arrays['observations']
+        self.rewards: np.ndarray = arrays['rewards']
+        self.dones: np.ndarray = arrays['dones']
+        self.final_scores: np.ndarray = arrays['final_scores']
+        self.actions: np.ndarray = arrays['actions']
+        self._commands: np.ndarray = arrays['commands']
+        self._acks: np.ndarray = arrays['acks']
+        self._commands[:] = 0
+        self._acks[:] = CLOSE
+        self._command = 0
+        self._pending = False
+
+        self._processes: List[multiprocessing.Process] = []
+        for worker, envs in enumerate(np.array_split(np.arange(num_envs), self.workers)):
+            process = multiprocessing.Process(
+                target=_run_worker,
+                args=(self._shared_memory.name, self._layout, worker, envs.tolist(), size, seed, max_ticks),
+                name=f"VectorEnv-{worker}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        try:
+            self._wait_for_workers(0)
+        except RuntimeError:
+            self.close()
+            raise
+
+    def reset(self) -> np.ndarray:
+        """Get the observations of the games as they are, which is their first observation before the first step."""
+        if self._pending:
+            self.step_wait()
+        return self.observations
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Hand the actions to the workers and return right away, so the trainer can work while the games are stepped."""
+        if self._pending:
+            raise RuntimeError("step_async() was called again before step_wait()")
+        self.actions[:] = actions
+        self._command += 1
+        self._commands[:, 0] = self._command
+        self._pending = True
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Wait for the step started by step_async() to finish.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The observations, rewards and done flags of every game.
+        """
+        if not self._pending:
+            raise RuntimeError("step_wait() was called without step_async()")
+        self._wait_for_workers(self._command)
+        self._pending = False
+        return (self.observations, self.rewards, self.dones)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Step every game with its action (see step_async() and step_wait())."""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory block."""
+        if self._shared_memory is None:
+            return
+        self._commands[:, 0] = CLOSE
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        del self.observations, self.rewards, self.dones, self.final_scores, self.actions, self._commands, self._acks
+        try:
+            self._shared_memory.close()
+        except BufferError:
+            pass # Arrays returned by step() are still around, and the memory is released along with them
+        self._shared_memory.unlink()
+        self._shared_memory = None
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _wait_for_workers(self, command: int) -> None:
+        """Wait for every worker to acknowledge a command."""
+        for worker, process in enumerate(self._processes):
+            _wait(self._acks, worker, command - 1, process)
@@ -0,0 +1,123 @@
+import os
+import sys
+import asyncio
+import argparse
+import statistics
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game.multiplayer import MultiplayerServer, MultiplayerClient
+from game.tournament import load_agent
+
+FPS = 60
+
+
+def print_stats(server: MultiplayerServer) -> None:
+    """Print how long the server's ticks took and how the players kept up."""
+    times = sorted(server.tick_times)
+    if times:
+        print(f"{len(times)} ticks: mean {statistics.fmean(times) * 1e6:.0f} us, "
+              f"99th percentile {times[int(len(times) * 0.99)] * 1e6:.0f} us, max {times[-1] * 1e6:.0f} us")
+    for player, name in enumerate(server.names):
+        print(f"    {name:<16} score {server.arena.scores[player]:>4}  missed {server.missed[player]:>5}  late {server.late[player]:>5}")
+
+
+async def run_server(args: argparse.Namespace) -> None:
+    server = MultiplayerServer(args.players, host=args.host, port=args.port, tick_rate=args.tick_rate,
+                               input_delay=args.input_delay, rounds=args.rounds, seed=args.seed)
+    await server.start()
+    print(f"waiting for {args.players} players on {args.host}:{server.port}")
+    await server.run()
+    print_stats(server)
+
+
+async def run_bots(args: argparse.Namespace) -> None:
+    agent = load_agent(args.agent)
+    clients = [MultiplayerClient(f"bot {number}", agent() if isinstance(agent, type) else agent) for number in range(args.count)]
+    await asyncio.gather(*(client.play(args.host, args.port) for client in clients))
+    for client in clients:
+        print(f"{client.name}: {client.desyncs} desyncs")
+
+
+async def run_local(args: argparse.Namespace) -> None:
+    """Run a server and bots for every player over localhost, in this process."""
+    server = MultiplayerServer(args.players, port=0, tick_rate=args.tick_rate, input_delay=args.input_delay,
+                               rounds=args.rounds, round_pause=0.2, seed=args.seed)
+    await server.start()
+    agent = load_agent(args.agent)
+    clients = [MultiplayerClient(f"bot {number}", agent() if isinstance(agent, type) else agent) for number in range(args.players)]
+    await asyncio.gather(server.run(), *(client.play("127.0.0.1", server.port) for client in clients))
+    print_stats(server)
+    print(f"desyncs: {sum(client.desyncs for client in clients)}")
+
+
+async def run_player(args: argparse.Namespace) -> None:
+    """Join a server with a window, steering with the arrow keys."""
+    pygame.display.init()
+    display = pygame.display.set_mode((1150, 760))
+    pygame.display.set_caption("Snake game by Dhyanesh! (multiplayer)")
+    client = MultiplayerClient(args.name, display=display)
+    keys = {pygame.K_UP: 'u', pygame.K_DOWN: 'd', pygame.K_LEFT: 'l', pygame.K_RIGHT: 'r'}
+
+    def render(*_) -> None:
+        display.fill("black")
+        client.arena.render()
+        pygame.display.flip()
+    client.on_start = render
+    client.on_tick = render
+
+    game = asyncio.ensure_future(client.play(args.host, args.port))
+    while not game.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                game.cancel()
+            elif event.type == pygame.KEYDOWN and event.key in keys:
+                client.steer(keys[event.key])
+        await asyncio.sleep(1 / FPS)
+    pygame.quit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Play the snake game with several players over the network.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server = commands.add_parser("server", help="Host a game.")
+    server.add_argument("--players", type=int, default=2, help="The number of players to wait for. (default: 2)")
+    server.add_argument("--host", default="0.0.0.0", help="The address to listen on. (default: every interface)")
+    server.add_argument("--port", type=int, default=5555)
+    server.add_argument("--rounds", type=int, default=None, help="Stop after this many rounds. (default: no limit)")
+
+    play = commands.add_parser("play", help="Join a game with a window and the arrow keys.")
+    play.add_argument("--host", default="127.0.0.1")
+    play.add_argument("--port", type=int, default=5555)
+    play.add_argument("--name", default=os.environ.get("USER", "player"))
+
+    bots = commands.add_parser("bots", help="Join a game with bots.")
+    bots.add_argument("count", type=int, help="The number of bots.")
+    bots.add_argument("--host", default="127.0.0.1")
+    bots.add_argument("--port", type=int, default=5555)
+
+    local = commands.add_parser("local", help="Play bots against each other over localhost and report the server's tick times.")
+    local.add_argument("--players", type=int, default=8, help="The number of bots. (default: 8)")
+    local.add_argument("--rounds", type=int, default=3, help="The number of rounds. (default: 3)")
+
+    for command in (server, local):
+        command.add_argument("--tick-rate", type=float, default=30, help="Ticks per second. (default: 30)")
+        command.add_argument("--input-delay", type=int, default=2, help="Ticks between receiving a tick and the tick the answer is for. (default: 2)")
+        command.add_argument("--seed", type=int, default=None)
+    for command in (bots, local):
+        command.add_argument("--agent", default="game.agents:greedy_agent", help="The agent the bots play with, as module:name.")
+    args = parser.parse_args()
+
+    runners = {'server': run_server, 'play': run_player, 'bots': run_bots, 'local': run_local}
+    try:
+        asyncio.run(runners[args.command](args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import pygame
+import sys
+import argparse
+
+from game import Game, Simulation, FixedTimestep, Replay, ReplayPlayer
+
+TICK_RATE = 30 # The game speed replays were recorded at, in logic ticks per second
+FPS = 60
+
+parser = argparse.ArgumentParser(description="Play back a recorded game.")
+parser.add_argument("replay", help="The replay file to play.")
+parser.add_argument("--speed", type=float, default=1.0, help="The speed multiple to play at. (default: 1)")
+parser.add_argument("--headless", action="store_true", help="Simulate the replay as fast as possible without rendering and print the outcome.")
+args = parser.parse_args()
+
+replay = Replay.load(args.replay)
+
+if args.headless:
+    player = ReplayPlayer(replay)
+    valid = player.verify()
+    simulation = player.simulation
+    print(f"score {simulation.score}, {simulation.ticks} ticks, {'game over' if simulation.game_over else 'quit'}")
+    if replay.end is None:
+        print("the replay has no end record, so the outcome can't be verified")
+    else:
+        print("matches the recording" if valid else "DOES NOT match the recording")
+    sys.exit(0 if valid else 1)
+
+pygame.init()
+
+display = pygame.display.set_mode(replay.size)
+clock = pygame.time.Clock()
+timestep = FixedTimestep(TICK_RATE * args.speed, max_ticks_per_frame=max(5, int(5 * args.speed)))
+
+player = ReplayPlayer(replay, Simulation(size=replay.size, seed=replay.seed, display=display))
+game = Game(display, simulation=player.simulation)
+
+pygame.display.set_caption(f"Replay: {args.replay}")
+
+while True:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        elif event.type == pygame.VIDEOEXPOSE:
+            game.handle_event(event)
+
+    for _ in range(timestep.advance()):
+        player.apply_turns()
+        if not player.finished:
+            game.update()
+    updated_rects = game.render(timestep.alpha if not player.finished else 1.0)
+
+    pygame.display.update(updated_rects)
+    clock.tick(FPS)
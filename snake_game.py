@@ -1,39 +1,115 @@
+import time
+STARTED = time.perf_counter() # Before anything else is imported, to measure the time to the first frame
+
+import os
 import pygame
 import sys
-import ctypes
-
-from game import Game
+import argparse
 
-ctypes.windll.shcore.SetProcessDpiAwareness(1)
-
-pygame.init()
+from game import Game, FixedTimestep, FrameProfiler, Leaderboard, AssetBundle, FrameRecorder
 
 SCREENWIDTH = 1150
 SCREENHEIGHT = 760
-FPS = 30
+TICK_RATE = 30 # Game speed, in logic ticks per second
+FPS = 60 # Render rate, which doesn't change the game speed
+MAX_TICKS_PER_FRAME = 5 # Ticks beyond this after a stalled frame are dropped instead of caught up on
+DIRTY_RENDERING = False # Redraw only the parts of the screen that changed, for slow hardware
+REPLAY_DIR = "replays" # Every game is recorded here, to be played back with play_replay.py
+LEADERBOARD_PATH = "leaderboard.db" # Every finished game is recorded on this leaderboard
+PROFILING = False # Time every frame; F3 toggles the timing overlay and F4 exports a Chrome trace
+CAPTURE_DIR = "captures" # F9 starts and stops recording the screen here, to be exported with export_capture.py
+WORLD_SIZE = None # A playing area larger than the window, such as (4000, 3000), scrolls with the snake
+DPI_AWARE = True # On Windows, keep the window from being scaled up (and blurred) on high DPI displays
+
+
+def enable_dpi_awareness() -> None:
+    """Tell Windows the game handles high DPI displays itself. Does nothing anywhere else, or on Windows versions without the API."""
+    if sys.platform != "win32":
+        return
+    import ctypes
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+    except (AttributeError, OSError):
+        pass
+
+
+def toggle_recording(recorder: FrameRecorder) -> FrameRecorder:
+    """Start recording the display to a new file in CAPTURE_DIR, or stop the recording in progress."""
+    if recorder is not None:
+        recorder.close()
+        print(f"saved {recorder.path}: {recorder.frames} frames, {recorder.dropped} dropped")
+        return None
+    os.makedirs(CAPTURE_DIR, exist_ok=True)
+    path = os.path.join(CAPTURE_DIR, time.strftime("capture_%Y%m%d_%H%M%S.snkv"))
+    return FrameRecorder(path, display, fps=FPS)
+
+
+parser = argparse.ArgumentParser(description="Play the snake game.")
+parser.add_argument("--first-frame", action="store_true", help="Quit right after the first frame is shown and print how long it took to get there.")
+args = parser.parse_args()
+
+if DPI_AWARE:
+    enable_dpi_awareness()
+
+# The game has no sound, so only the modules it uses are started. The mixer is often the slowest one to start.
+pygame.display.init()
+pygame.font.init()
 
 display = pygame.display.set_mode((SCREENWIDTH, SCREENHEIGHT))
 clock = pygame.time.Clock()
+timestep = FixedTimestep(TICK_RATE, MAX_TICKS_PER_FRAME)
+profiler = FrameProfiler(enabled=PROFILING)
+assets = AssetBundle()
 
-game = Game(display)
+game = Game(
+    display,
+    dirty_rendering=DIRTY_RENDERING,
+    profiler=profiler if PROFILING else None,
+    replay_dir=REPLAY_DIR,
+    leaderboard=Leaderboard(LEADERBOARD_PATH),
+    assets=assets,
+    world_size=WORLD_SIZE,
+)
 
 pygame.display.set_caption("Snake game by Dhyanesh!")
+pygame.display.set_icon(assets.image('icon'))
 
-icon = pygame.image.load("assets/icon.png").convert_alpha()
-pygame.display.set_icon(icon)
-
+recorder = None
+first_frame = True
 while True:
-    display.fill((0, 0, 0))
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+    profiler.begin_frame()
+    with profiler.phase("events"):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                if recorder is not None:
+                    recorder.close()
+                game.close()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                recorder = toggle_recording(recorder)
+            elif PROFILING and profiler.handle_event(event):
+                game.request_full_redraw()
+            else:
+                game.handle_event(event)
+
+    for _ in range(timestep.advance()):
+        game.update()
+    updated_rects = game.render(timestep.alpha)
+    updated_rects.append(profiler.render_overlay(display))
+
+    with profiler.phase("display update"):
+        pygame.display.update(updated_rects)
+    if recorder is not None:
+        with profiler.phase("capture"):
+            recorder.capture()
+
+    if first_frame:
+        first_frame = False
+        if args.first_frame or PROFILING:
+            print(f"time to first frame: {(time.perf_counter() - STARTED) * 1000:.1f} ms")
+        if args.first_frame:
+            game.close()
             pygame.quit()
             sys.exit()
-        else:
-            game.handle_event(event)
-            
-    game.render()
-            
-    pygame.display.update()
     clock.tick(FPS)
-    
\ No newline at end of file
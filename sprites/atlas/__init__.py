@@ -0,0 +1,3 @@
+from .sprite_atlas import SpriteAtlas
+
+__all__ = ["SpriteAtlas"]
\ No newline at end of file
@@ -0,0 +1,119 @@
+import pygame
+from typing import Dict, List, Tuple
+
+from sprites.snake import Snake
+from sprites.snake.snake_head import SnakeHead
+from sprites.snake.snake_piece import SnakePiece
+from sprites.fruit import Fruit
+
+class SpriteAtlas:
+    """
+    Holds every variant of the snake and fruit sprites pre-rendered once on a single surface.
+
+    - The variants are the body piece in both orientations, the head facing each direction (eyes included) and the fruit.
+    - They are drawn with the sprites' own render() methods, so they look exactly like the sprites drawn directly.
+    - Drawing the snake then takes a single blit per piece, all batched through one Surface.blits() call.
+    """
+
+    def __init__(self, snake: Snake, fruit: Fruit) -> None:
+        """
+        Parameters:
+            snake (Snake): The snake whose body pieces and head are pre-rendered.
+            fruit (Fruit): The fruit to pre-render.
+        """
+        head = snake.head
+        body = snake.body
+
+        self.areas: Dict[str, pygame.Rect] = {}
+
+        # Throwaway sprites with the same looks as the real ones, laid out side by side
+        sprites: List[Tuple[str, object]] = []
+        for orient, direction in (("h", "r"), ("v", "u")):
+            sprites.append((f"piece_{orient}", SnakePiece(
+                display=None,
+                x=0,
+                y=0,
+                width=body.piece_width,
+                height=body.piece_height,
+                color=body.color,
+                outline_color=body.outline_color,
+                outline_width=body.outline_width,
+                initial_direction=direction
+            )))
+        for direction in "udlr":
+            sprites.append((f"head_{direction}", SnakeHead(
+                display=None,
+                x=0,
+                y=0,
+                velocity=head.velocity,
+                width=head.rect.width,
+                height=head.rect.height,
+                outline_width=head.outline_width,
+                color=head.color,
+                outline_color=head.outline_color,
+                eye_color=head.eye_color,
+                eye_width=head.eye_width,
+                eye_height=head.eye_height,
+                eye_front_distance=head.eye_front_distance,
+                eye_side_distance=head.eye_side_distance,
+                initial_direction=direction
+            )))
+        sprites.append(("fruit", Fruit(
+            display=None,
+            x=0,
+            y=0,
+            width=fruit.width,
+            height=fruit.height,
+            outline_width=fruit.outline_width,
+            color=fruit.color,
+            outline_color=fruit.outline_color
+        )))
+
+        x = 0
+        for name, sprite in sprites:
+            if isinstance(sprite, Fruit):
+                sprite.set_pos_to((x, 0))
+            else:
+                sprite.rect.topleft = (x, 0)
+            self.areas[name] = sprite.rect.copy()
+            x += sprite.rect.width
+
+        height = max(area.height for area in self.areas.values())
+        self.surface: pygame.Surface = pygame.Surface((x, height), pygame.SRCALPHA)
+        for name, sprite in sprites:
+            sprite.display = self.surface
+            sprite.render()
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def snake_blits(self, 
+                    snake: Snake, 
+                    head_dest: Tuple[int, int] = None
+                    ) -> List[Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]]:
+        """
+        Get the (source, dest, area) sequence that draws the body and then the head of the snake, for Surface.blits().
+        
+        Parameters:
+            snake (Snake): The snake to draw.
+            head_dest (Tuple[int, int]): Where to draw the head instead of its current position, if given. (default: None)
+        """
+        surface, areas = self.surface, self.areas
+        piece_h, piece_v = areas["piece_h"], areas["piece_v"]
+        blits = [(surface, piece.rect.topleft, piece_h if piece.orient == "h" else piece_v) for piece in snake.body.pieces]
+        blits.append(self.piece_blit(snake.head, head_dest))
+        return blits
+
+    def piece_blit(self, 
+                   piece: SnakePiece, 
+                   dest: Tuple[int, int] = None
+                   ) -> Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]:
+        """Get the (source, dest, area) that draws a single body piece or head, at dest if given or else at its position."""
+        if isinstance(piece, SnakeHead):
+            area = self.areas[f"head_{piece.direction}"]
+        else:
+            area = self.areas[f"piece_{piece.orient}"]
+        return (self.surface, dest if dest is not None else piece.rect.topleft, area)
+
+    def fruit_blit(self, fruit: Fruit) -> Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]:
+        """Get the (source, dest, area) that draws the fruit."""
+        return (self.surface, fruit.rect.topleft, self.areas["fruit"])
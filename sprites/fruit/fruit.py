@@ -15,8 +15,22 @@ class Fruit:
                  outline_width: int = 3,
                  color: Union[str, Tuple[int, int, int]] = "red",
                  outline_color: Union[str, Tuple[int, int, int]] = "white",
+                 rng: random.Random = None,
                  ) -> None:
+        """
+        Parameters:
+            display (pygame.Surface): The display surface to render the fruit on. Can be None when nothing is rendered.
+            x (int): The x-coordinate of the fruit's top-left corner.
+            y (int): The y-coordinate of the fruit's top-left corner.
+            width (int): The width of the fruit. (default: 32)
+            height (int): The height of the fruit. (default: 32)
+            outline_width (int): The width of the outline. (default: 3)
+            color (Union[str, Tuple[int, int, int]]): The color of the fruit. (default: "red")
+            outline_color (Union[str, Tuple[int, int, int]]): The color of the outline. (default: "white")
+            rng (random.Random): The random number generator used to place the fruit. (default: the random module)
+        """
         self.display = display
+        self.rng = rng if rng is not None else random
         
         self.width = width
         self.height = height
@@ -34,6 +48,7 @@ class Fruit:
     def set_pos_to(self, coords: Tuple) -> None:
         """Set the position of the fruit to the specified coordinates."""
         self.x, self.y = coords
+        self.update_rect()
         
     def set_random_pos(self, 
                        x_range: Union[Tuple[int, int], List[int]] = None,
@@ -46,8 +61,8 @@ class Fruit:
         x_range[1] -= self.width
         y_range[1] -= self.height
         
-        self.x = random.randint(*x_range)
-        self.y = random.randint(*y_range)
+        self.x = self.rng.randint(*x_range)
+        self.y = self.rng.randint(*y_range)
         self.update_rect()
         
     def update_rect(self) -> None:
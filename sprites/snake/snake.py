@@ -47,7 +47,7 @@ class Snake:
                  ) -> None:
         """
         Parameters:
-            - display (pygame.Surface): The display surface to render the snake on.
+            - display (pygame.Surface): The display surface to render the snake on. Can be None when nothing is rendered.
             - x (int): The x-coordinate of the snake's top-left corner.
             - y (int): The y-coordinate of the snake's top-left corner.
             - body_color (str): The color of the snake's body. (default: "green")
@@ -155,12 +155,7 @@ class Snake:
         self.body.move()
         
     def render(self) -> None:
-        """Draws the snake onto the screen."""
-        self.head.move()
+        """Draws the snake onto the screen. Movement is handled separately by move()."""
         self.body.render()
-        
-        head_moving = self.head.moving
-        self.head.stop()
         self.head.render()
-        if head_moving: self.head.start()
         
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pygame
-from typing import List, Tuple, Union
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Tuple, Union
 
 from .snake_head import SnakeHead
 from .snake_piece import SnakePiece
@@ -7,6 +8,13 @@ from .snake_piece import SnakePiece
 class SnakeBody:
     """
     Represents the body of a snake in the snake game.
+
+    The pieces are kept in a deque, ordered from the piece right behind the head to the tail.
+    Moving the body only pops the tail piece and pushes it back right behind the head, 
+    so a tick costs the same no matter how long the snake is.
+
+    The on_piece_added and on_piece_removed callbacks are called with a piece whenever it starts or stops
+    covering a position, which lets collision checks keep track of the body incrementally.
     """
     
     def __init__(self, 
@@ -21,7 +29,7 @@ class SnakeBody:
                  ) -> None:
         """
         Parameters:
-            - display (pygame.Surface): The display surface to render the body on.
+            - display (pygame.Surface): The display surface to render the body on. Can be None when nothing is rendered.
             - snake_head (SnakeHead): The snake head object.
             - piece_width (int): The width of each snake piece. (default: 16)
             - piece_height (int): The height of each snake piece. (default: 32)
@@ -43,9 +51,12 @@ class SnakeBody:
 
         self.extend_by = extend_by
         
-        self.pieces: List[SnakePiece] = []
+        self.pieces: Deque[SnakePiece] = deque()
         self.no_pieces: int = 0
         
+        self.on_piece_added: Callable[[SnakePiece], None] = None
+        self.on_piece_removed: Callable[[SnakePiece], None] = None
+        
         self.__moving: bool = False
         
     def start(self) -> None:
@@ -58,6 +69,9 @@ class SnakeBody:
         
     def reset(self) -> None:
         """Delete all the pieces of the snake body."""
+        if self.on_piece_removed is not None:
+            for piece in self.pieces:
+                self.on_piece_removed(piece)
         self.pieces.clear()
         self.no_pieces = 0
         
@@ -70,25 +84,49 @@ class SnakeBody:
         """Check if the body is colliding with another Rect object."""
         return any(piece.colliding_with(other_rect) for piece in self.pieces)
     
+    def _create_piece(self, direction: str) -> SnakePiece:
+        """Create a SnakePiece that looks like the rest of the body, facing the given direction."""
+        return SnakePiece(display=self.display, 
+                          x=0, 
+                          y=0, 
+                          width=self.piece_width, 
+                          height=self.piece_height,
+                          color=self.color,
+                          outline_color=self.outline_color,
+                          outline_width=self.outline_width,
+                          initial_direction=direction)
+    
     def add_piece(self) -> None:
         """Add a new SnakePiece to the body right behind the tail of the snake, making it the new tail."""
         previous_piece: SnakePiece = self.pieces[-1] if self.pieces else self.head
-        new_piece = SnakePiece(display=self.display, 
-                               x=0, 
-                               y=0, 
-                               width=self.piece_width, 
-                               height=self.piece_height,
-                               color=self.color,
-                               outline_color=self.outline_color,
-                               outline_width=self.outline_width,
-                               initial_direction=previous_piece.direction)
+        new_piece = self._create_piece(previous_piece.direction)
         new_piece.rect.topleft = previous_piece.behind(new_piece.rect.width, new_piece.rect.height)
         self.pieces.append(new_piece)
+        if self.on_piece_added is not None:
+            self.on_piece_added(new_piece)
         return new_piece
         
+    def restore(self, pieces: Iterable[Tuple[int, int, str]]) -> None:
+        """
+        Replace the pieces with ones at the given positions and directions, ordered from the piece right behind the head to the tail.
+
+        The existing SnakePiece objects are reused where possible. on_piece_added and on_piece_removed are not called,
+        this is meant for restoring a snapshot, which restores whatever tracks the pieces as well.
+        """
+        old_pieces = self.pieces
+        self.pieces = deque()
+        for x, y, direction in pieces:
+            if old_pieces:
+                piece = old_pieces.popleft()
+                piece.direction = direction
+            else:
+                piece = self._create_piece(direction)
+            piece.rect.topleft = (x, y)
+            self.pieces.append(piece)
+        
     def extend(self) -> None:
         """Increase the number of pieces the body has."""
-        self.no_pieces += 3
+        self.no_pieces += self.extend_by
         
     def __len__(self) -> int:
         """Get the number of pieces in the body."""
@@ -97,23 +135,27 @@ class SnakeBody:
     length = __len__
 
     def move(self) -> None:
-        """Handles movement of the snake body."""
+        """
+        Handles growth and movement of the snake body.
+
+        Each piece moves to the previous position of the piece in front of it. Instead of copying 
+        every position one slot back, the tail piece is recycled as the new first piece, which 
+        leaves the rest of the body exactly where the shift would have put it.
+        """
+        if len(self.pieces) < self.no_pieces: # Change 'if' to 'while' to add all pieces in one tick.
+            self.add_piece()
         if not (self.pieces and self.__moving): return
-        reversed_pieces = list(reversed(self.pieces))
-        for idx, piece in enumerate(reversed_pieces[:-1]):
-            piece.direction = reversed_pieces[idx+1].direction
-            piece.rect.x = reversed_pieces[idx+1].rect.x
-            piece.rect.y = reversed_pieces[idx+1].rect.y
-        self.pieces[0].direction = self.head.direction
-        x, y = self.head.behind(self.pieces[0].rect.width, self.pieces[0].rect.height)
-        self.pieces[0].rect.x = x
-        self.pieces[0].rect.y = y
+        piece = self.pieces.pop()
+        if self.on_piece_removed is not None:
+            self.on_piece_removed(piece)
+        piece.direction = self.head.direction
+        piece.rect.topleft = self.head.behind(piece.rect.width, piece.rect.height)
+        self.pieces.appendleft(piece)
+        if self.on_piece_added is not None:
+            self.on_piece_added(piece)
         
     def render(self) -> None:
         """Draw the snake body on the screen."""
-        if len(self.pieces) < self.no_pieces: # Change 'if' to 'while' to add all pieces in one frame.
-            self.add_piece()
-        self.move()
         for piece in self.pieces:
             piece.render()
             
\ No newline at end of file
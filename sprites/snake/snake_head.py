@@ -30,7 +30,7 @@ class SnakeHead(SnakePiece):
         Initialize the SnakeHead instance.
 
         Parameters:
-            - display: The pygame.Surface object representing the display surface.
+            - display: The pygame.Surface object representing the display surface. Can be None when nothing is rendered.
             - x: The x-coordinate of the head's initial position.
             - y: The y-coordinate of the head's initial position.
             - velocity: The velocity of the head, determines the speed of movement.
@@ -169,7 +169,6 @@ class SnakeHead(SnakePiece):
 
     def render(self) -> None:
         """Draw the head on the screen."""
-        self.move()
         pygame.draw.rect(self.display, self.color, self.rect)
         pygame.draw.rect(self.display, self.outline_color, self.rect, width=self.outline_width)
         self.draw_eye()
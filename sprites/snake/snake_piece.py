@@ -20,7 +20,7 @@ class SnakePiece:
     ) -> None:
         """
         Parameters:
-        - display (pygame.Surface): The display surface to render the piece on.
+        - display (pygame.Surface): The display surface to render the piece on. Can be None when nothing is rendered.
         - x (int): The x-coordinate of the piece's top-left corner.
         - y (int): The y-coordinate of the piece's top-left corner.
         - width (int): The width of the piece. (default: 16)
@@ -0,0 +1,21 @@
+from game import Simulation
+from game.autopilot import Autopilot
+
+
+def test_incremental_distances_match_a_full_recompute():
+    simulation = Simulation(seed=0)
+    autopilot = Autopilot(simulation)
+    # The reference recomputes everything with reset(), so the grid's hook is handed back to the autopilot under test.
+    reference = Autopilot(simulation)
+    simulation.collision_grid.on_cell_changed = autopilot.changed_cells.add
+
+    updates = 0
+    while not simulation.game_over and simulation.ticks < 600:
+        fruit_moved = simulation.collision_grid.fruit_rect != autopilot.fruit_rect
+        direction = autopilot(simulation)
+        updates += not fruit_moved
+        reference.reset()
+        assert autopilot.open == reference.open, simulation.ticks
+        assert autopilot.distances == reference.distances, simulation.ticks
+        simulation.step(direction)
+    assert updates > 400 # Most ticks went through the incremental update rather than a reset
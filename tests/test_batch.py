@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+
+from game import Simulation
+from game.batch import BatchSimulation
+
+
+def test_batch_plays_like_the_simulation():
+    # The batch places its own fruit, so the simulation is given the same fruit and both are played with the same turns.
+    batch = BatchSimulation(1, seed=5)
+    simulation = Simulation(seed=1)
+    grid = simulation.collision_grid
+
+    def cell(pos) -> int:
+        return ((pos[1] - grid.y) // grid.cell_size) * grid.columns + (pos[0] - grid.x) // grid.cell_size
+
+    def copy_fruit() -> None:
+        row, col = divmod(int(batch.fruits[0]), batch.columns)
+        simulation.fruit.set_pos_to((grid.x + col * grid.cell_size, grid.y + row * grid.cell_size))
+        grid.set_fruit(simulation.fruit.rect)
+
+    copy_fruit()
+    simulation.snake.start()
+    rng = random.Random(2)
+    games = 0
+    for tick in range(20_000):
+        head_row, head_col = divmod(int(batch.heads[0]), batch.columns)
+        fruit_row, fruit_col = divmod(int(batch.fruits[0]), batch.columns)
+        action = -1
+        if rng.random() < 0.5:
+            if abs(fruit_col - head_col) > abs(fruit_row - head_row):
+                action = 3 if fruit_col > head_col else 2
+            else:
+                action = 1 if fruit_row > head_row else 0
+        if rng.random() < 0.05:
+            action = rng.randrange(4)
+        if action >= 0:
+            simulation.turn('udlr'[action])
+
+        scored, over = simulation.step()
+        batch_scored, batch_over = batch.step(np.array([action]))
+        assert (bool(batch_scored[0]), bool(batch_over[0])) == (scored, over), tick
+        if over:
+            games += 1
+            assert batch.final_scores[0] == simulation.score
+            assert BatchSimulation.REASONS[batch.reasons[0]] == simulation.gameover_handler.reason
+            simulation.gameover_handler.reset()
+            copy_fruit()
+            continue
+
+        assert cell(simulation.snake.head.rect.topleft) == batch.heads[0], tick
+        start, length = int(batch.starts[0]), int(batch.lengths[0])
+        batch_pieces = [(int(batch.positions[0, (start + i) % batch.capacity]),
+                         'udlr'[batch.piece_directions[0, (start + i) % batch.capacity]]) for i in range(length)]
+        assert [(cell(piece.rect.topleft), piece.direction) for piece in simulation.snake.body.pieces] == batch_pieces, tick
+        if scored:
+            copy_fruit()
+    assert games > 0
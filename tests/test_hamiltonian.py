@@ -0,0 +1,15 @@
+from game import Simulation
+from game.hamiltonian import HamiltonianAutopilot
+
+
+def test_odd_board_fills_up_and_ends():
+    # 200 x 200 leaves 5 x 5 blocks inside the walls, which no cycle covers in full.
+    simulation = Simulation(size=(200, 200), seed=0)
+    autopilot = HamiltonianAutopilot(simulation)
+    assert len(autopilot.cycle) == 10
+    while not simulation.game_over and simulation.ticks < 10_000:
+        simulation.step(autopilot(simulation))
+
+    assert simulation.game_over
+    assert simulation.fruit.rect.x < 0 # Moved off the board once there was nowhere left to put it
+    assert len(simulation.snake.body) >= (len(autopilot.cycle) - 1) * autopilot.pieces_per_block
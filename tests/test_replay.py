@@ -0,0 +1,47 @@
+import os
+
+from game import Simulation, Replay, ReplayRecorder, ReplayPlayer
+from game.agents import greedy_agent
+
+
+def play_session(simulation: Simulation, games: int, seed: int = None) -> None:
+    """Play games one after the other on the same simulation, restarting with the given seed, or a drawn one."""
+    for game in range(games):
+        while not simulation.game_over:
+            simulation.step(greedy_agent(simulation))
+        simulation.gameover_handler.reset()
+        if seed is not None:
+            simulation.restart(seed)
+
+
+def recorded_replays(directory) -> list:
+    return [Replay.load(os.path.join(directory, name)) for name in sorted(os.listdir(directory))]
+
+
+def test_every_game_of_a_session_verifies(tmp_path):
+    simulation = Simulation(seed=42)
+    recorder = ReplayRecorder(simulation, directory=str(tmp_path))
+    simulation.snake.start()
+    play_session(simulation, games=3)
+    recorder.close()
+
+    replays = recorded_replays(tmp_path)
+    assert len(replays) == 3 # The game started last is never played, so its replay is dropped
+    for replay in replays:
+        assert ReplayPlayer(replay).verify()
+
+
+def test_same_seed_places_the_same_fruit_in_every_game(tmp_path):
+    simulation = Simulation(seed=42)
+    first_fruit = simulation.fruit.rect.topleft
+    recorder = ReplayRecorder(simulation, directory=str(tmp_path))
+    simulation.snake.start()
+    play_session(simulation, games=3, seed=42)
+    recorder.close()
+
+    assert simulation.fruit.rect.topleft == first_fruit
+    replays = [replay for replay in recorded_replays(tmp_path) if replay.end is not None and replay.end[2]]
+    assert len(replays) == 3
+    for replay in replays:
+        assert replay.seed == 42
+        assert ReplayPlayer(replay).verify()
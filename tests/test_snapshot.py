@@ -0,0 +1,55 @@
+import random
+
+from game import Simulation
+
+
+def state(simulation: Simulation) -> tuple:
+    """Everything a snapshot is meant to bring back."""
+    snake = simulation.snake
+    return (tuple(snake.head.rect), snake.direction, snake.head.moving,
+            [(tuple(piece.rect), piece.direction) for piece in snake.body.pieces], snake.body.no_pieces,
+            tuple(simulation.fruit.rect), simulation.score, simulation.ticks, simulation.game_over,
+            simulation.gameover_handler.reason, simulation.seed, simulation.rng.getstate())
+
+
+def grid_state(simulation: Simulation) -> tuple:
+    """The collision grid, which is rebuilt from the snake on restore."""
+    grid = simulation.collision_grid
+    return (bytes(grid.counts), bytes(grid.blocked), sorted(grid.free_spots.cells))
+
+
+def play(simulation: Simulation, turns: random.Random, ticks: int) -> list:
+    """Play with turns towards the fruit half of the time, restarting after every game over, and record the state of every tick."""
+    states = []
+    for _ in range(ticks):
+        head, fruit = simulation.snake.head.rect.topleft, simulation.fruit.rect.topleft
+        direction = None
+        if turns.random() < 0.5:
+            if abs(fruit[0] - head[0]) > abs(fruit[1] - head[1]):
+                direction = 'r' if fruit[0] > head[0] else 'l'
+            else:
+                direction = 'd' if fruit[1] > head[1] else 'u'
+        simulation.step(direction)
+        states.append(state(simulation))
+        if simulation.game_over:
+            simulation.gameover_handler.reset()
+    return states
+
+
+def test_restored_game_plays_out_the_same():
+    simulation = Simulation(seed=5)
+    simulation.turn('d')
+    turns = random.Random(1)
+    play(simulation, turns, 3000)
+    snapshot, turns_state = simulation.snapshot(), turns.getstate()
+    expected = play(simulation, turns, 3000)
+    expected_grid = grid_state(simulation)
+
+    # Restored both over a game that went elsewhere, and over the game it was taken from.
+    other = Simulation(seed=99)
+    play(other, random.Random(4), 700)
+    for target in (other, simulation):
+        target.restore(snapshot)
+        turns.setstate(turns_state)
+        assert play(target, turns, 3000) == expected
+        assert grid_state(target) == expected_grid
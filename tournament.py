@@ -0,0 +1,38 @@
+import os
+import sys
+import json
+import argparse
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.tournament import run_tournament
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rank bot agents by playing many headless games with each of them on every CPU core.")
+    parser.add_argument("agents", nargs="+", help="The agents to play, as module:name (e.g. game.agents:greedy_agent).")
+    parser.add_argument("--games", type=int, default=1000, help="The number of games each agent plays. (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the first game; game i uses seed + i. (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="The number of worker processes. (default: the number of CPUs)")
+    parser.add_argument("--max-ticks", type=int, default=100_000, help="End games that last longer than this. (default: 100000)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results to a JSON file.")
+    args = parser.parse_args()
+
+    summaries = run_tournament(args.agents, args.games, seed=args.seed, workers=args.workers, max_ticks=args.max_ticks)
+
+    ranked = sorted(summaries.items(), key=lambda item: item[1]['mean_score'], reverse=True)
+    print(f"{'agent':<36} {'mean':>8} {'median':>8} {'max':>6} {'ticks':>9} {'games/s':>9}")
+    for spec, summary in ranked:
+        print(f"{spec:<36} {summary['mean_score']:>8.2f} {summary['median_score']:>8.1f} {summary['max_score']:>6} "
+              f"{summary['mean_ticks']:>9.1f} {summary['games_per_second']:>9.1f}")
+        for reason, count in sorted(summary['reasons'].items(), key=lambda item: -item[1]):
+            print(f"    {count / summary['games']:>6.1%}  {reason}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())